@@ -0,0 +1,52 @@
+"""batched lookups: one search per key vs a single contains_many sweep
+
+usage:
+    python -m benchmarks.bench_batch -n 1000000 -b 500
+"""
+import argparse
+import random
+import time
+
+from datality import AVL, RBTree, SkipList
+
+
+def one_by_one(structure, batch):
+    """the old way, a descent from the root per key and a KeyError per miss"""
+    res = []
+    for key in batch:
+        try:
+            structure.search(key)
+            res.append(True)
+        except KeyError:
+            res.append(False)
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=10 ** 6, help="number of keys in the structure")
+    parser.add_argument("-b", type=int, default=500, help="number of keys per batch")
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # even keys in the structure, odd keys miss
+    keys = list(range(0, 2 * args.n, 2))
+    batches = [[rng.randrange(2 * args.n) for _ in range(args.b)] for _ in range(args.batches)]
+    lookups = args.b * args.batches
+    print(f"{'structure':<10}{'search/s':>14}{'batched/s':>14}{'speedup':>10}")
+    for structure in (AVL.from_sorted(keys), RBTree.from_sorted(keys), SkipList(keys, seed=args.seed)):
+        start = time.perf_counter()
+        expected = [one_by_one(structure, batch) for batch in batches]
+        single = lookups / (time.perf_counter() - start)
+        start = time.perf_counter()
+        res = [structure.contains_many(batch) for batch in batches]
+        batched = lookups / (time.perf_counter() - start)
+        assert res == expected
+        name = type(structure).__name__
+        print(f"{name:<10}{single:>14,.0f}{batched:>14,.0f}{batched / single:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""mixed insert/delete churn on the balanced trees, checking their invariants along the way
+
+the height must stay under the bound of each tree:
+    AVL:    1.44*log2(n+2)
+    RBTree: 2*log2(n+1)
+
+usage:
+    python -m benchmarks.bench_churn -n 1000000
+"""
+import argparse
+import math
+import random
+import time
+
+from datality import AVL, RBTree
+
+
+def check_rb(tree):
+    """assert the red-black invariants of the whole tree, iterative
+
+    Returns:
+        int: the height of the tree
+    """
+    assert not tree.root or tree.root.color == "b", "red root"
+    res = 0
+    # (node, depth, black nodes on the path so far)
+    stack, black_height = [(tree.root, 1, 0)], None
+    while stack:
+        node, depth, blacks = stack.pop()
+        if not node:
+            # every path to a null leaf has the same number of black nodes
+            if black_height is None:
+                black_height = blacks
+            assert blacks == black_height, "black height"
+            res = max(res, depth - 1)
+            continue
+        if node.color == "r":
+            assert tree.is_black(node.left) and tree.is_black(node.right), "red red"
+        blacks += node.color == "b"
+        stack.append((node.left, depth + 1, blacks))
+        stack.append((node.right, depth + 1, blacks))
+    return res
+
+
+def check_avl(tree):
+    """assert the avl invariants of the whole tree, iterative
+
+    Returns:
+        int: the height of the tree
+    """
+    res = 0
+    stack = [tree.root] if tree.root else []
+    while stack:
+        node = stack.pop()
+        left, right = tree.compute_weight(node.left), tree.compute_weight(node.right)
+        assert node.weight == max(left, right) + 1, "weight"
+        assert abs(right - left) <= 1, "balance factor"
+        res = max(res, node.weight)
+        stack.extend(child for child in (node.left, node.right) if child)
+    return res
+
+
+TREES = {
+    "avl": (AVL, check_avl, lambda n: 1.44 * math.log2(n + 2)),
+    "rb": (RBTree, check_rb, lambda n: 2 * math.log2(n + 1)),
+}
+
+
+def churn(cls, check, bound, args):
+    """run the churn on a fresh tree, checking every `args.check_every` operations
+
+    Returns:
+        Tuple[float, float]: ops/s, and the worst height/bound ratio
+    """
+    rng = random.Random(args.seed)
+    tree = cls()
+    elapsed, worst = 0.0, 0.0
+    done = 0
+    while done < args.n:
+        batch = min(args.check_every, args.n - done)
+        # half inserts, half deletes of random keys
+        ops = [(rng.random() < 0.5, rng.randrange(args.k)) for _ in range(batch)]
+        start = time.perf_counter()
+        for insert, key in ops:
+            if insert:
+                tree.insert(key)
+            else:
+                try:
+                    tree.delete(key)
+                except KeyError:
+                    pass
+        elapsed += time.perf_counter() - start
+        done += batch
+        height, limit = check(tree), bound(len(tree))
+        assert height <= limit, f"height {height} over {limit:.1f}"
+        worst = max(worst, height / limit)
+        print(f"{cls.__name__:<8}{done:>10,} ops  size {len(tree):>8,}  height {height:>3}  bound {limit:>5.1f}")
+    return (args.n / elapsed, worst)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=10 ** 6, help="number of operations")
+    parser.add_argument("-k", type=int, default=10 ** 5, help="range of the keys")
+    parser.add_argument("--check-every", type=int, default=10 ** 5, help="operations between full checks")
+    parser.add_argument("--tree", choices=sorted(TREES), action="append", help="defaults to all of them")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    res = [(name, churn(*TREES[name], args)) for name in args.tree or sorted(TREES)]
+    for name, (throughput, worst) in res:
+        print(f"{TREES[name][0].__name__:<8}{throughput:>12,.0f} ops/s, worst height/bound {worst:.2f}")
+
+
+if __name__ == "__main__":
+    main()
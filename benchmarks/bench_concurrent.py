@@ -0,0 +1,95 @@
+"""multi-threaded throughput of the shared structures, read-heavy mix
+
+every thread runs `-n` operations, `--reads` of them are searches and the rest are
+inserts or deletes of random keys. the sequential structures are wrapped once with the
+readers-writer lock and once with a single global lock (every call exclusive), the
+concurrent skip list is shared as it is: lookups without locks, writers lock a few nodes
+
+under the GIL the pure python readers still take turns, the readers-writer lock only
+pays off where the reads can overlap: free-threaded builds, or readers that wait on I/O
+
+usage:
+    python -m benchmarks.bench_concurrent -n 100000 --threads 1 2 4 8
+"""
+import argparse
+import random
+import threading
+import time
+
+from datality import ConcurrentSkipList, RBTree, SkipList
+from datality.concurrent import RWLock, Synchronized
+
+
+class GlobalLock(RWLock):
+    """a single mutex behind the `RWLock` interface, the readers are serialized too"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquire_read = self.acquire_write = self._lock.acquire
+        self.release_read = self.release_write = self._lock.release
+
+
+# name: [(label, build from keys)]
+STRUCTURES = {
+    "rb": [
+        ("rwlock", lambda keys: Synchronized(RBTree(keys), lock=RWLock())),
+        ("global lock", lambda keys: Synchronized(RBTree(keys), lock=GlobalLock())),
+    ],
+    "skip_list": [
+        ("rwlock", lambda keys: Synchronized(SkipList(keys), lock=RWLock())),
+        ("global lock", lambda keys: Synchronized(SkipList(keys), lock=GlobalLock())),
+    ],
+    "concurrent_skip_list": [("lazy", ConcurrentSkipList)],
+}
+
+
+def worker(shared, ops, barrier):
+    """run the given `ops` against the `shared` structure, once every thread is ready"""
+    barrier.wait()
+    for read, key in ops:
+        if read:
+            key in shared
+        elif key & 1:
+            shared[key] = None
+        else:
+            try:
+                shared.delete(key ^ 1)
+            except KeyError:
+                pass
+
+
+def bench(build, threads, args):
+    """returns the ops/s of `threads` threads sharing the structure made by `build`"""
+    rng = random.Random(args.seed)
+    keys = [rng.randrange(args.k) for _ in range(args.k // 2)]
+    shared = build(keys)
+    work = [[(rng.random() < args.reads, rng.randrange(args.k)) for _ in range(args.n)] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(shared, ops, barrier)) for ops in work]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return threads * args.n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=10 ** 5, help="number of operations per thread")
+    parser.add_argument("-k", type=int, default=10 ** 5, help="range of the keys")
+    parser.add_argument("--reads", type=float, default=0.95, help="fraction of reads")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--structure", choices=sorted(STRUCTURES), action="append", help="defaults to all of them")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name in args.structure or sorted(STRUCTURES):
+        for threads in args.threads:
+            res = [f"{label} {bench(build, threads, args):>10,.0f} ops/s" for label, build in STRUCTURES[name]]
+            print(f"{name:<22}{threads:>3} threads  " + "  ".join(res))
+
+
+if __name__ == "__main__":
+    main()
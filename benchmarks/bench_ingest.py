@@ -0,0 +1,56 @@
+"""sorted batch ingest into an existing skip list: one insert per key vs update_sorted
+
+both ways allocate the same nodes, on a big list the cyclic garbage collector
+takes a good part of the time of both: --no-gc pauses it while timing
+
+usage:
+    python -m benchmarks.bench_ingest -n 1000000 -b 100000
+"""
+import argparse
+import gc
+import random
+import time
+
+from datality import IndexableSkipList, SkipList
+
+
+def one_by_one(structure, batch):
+    """the old way, a search from the top level per key"""
+    for key in batch:
+        structure.insert(key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=10 ** 6, help="number of keys already in the list")
+    parser.add_argument("-b", type=int, default=10 ** 5, help="number of keys per batch")
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-gc", action="store_true", help="pause the garbage collector while timing")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(4 * args.n), args.n)
+    batches = [sorted(rng.sample(range(4 * args.n), args.b)) for _ in range(args.batches)]
+    inserts = args.b * args.batches
+    print(f"{'structure':<20}{'insert/s':>14}{'update_sorted/s':>18}{'speedup':>10}")
+    for cls in (SkipList, IndexableSkipList):
+        res = []
+        for ingest in (one_by_one, cls.update_sorted):
+            # same seed, same levels... same list
+            structure = cls(keys, seed=args.seed)
+            if args.no_gc:
+                gc.disable()
+            start = time.perf_counter()
+            for batch in batches:
+                ingest(structure, batch)
+            elapsed = time.perf_counter() - start
+            gc.enable()
+            res.append((inserts / elapsed, list(structure)))
+        (single, expected), (merged, values) = res
+        assert values == expected
+        print(f"{cls.__name__:<20}{single:>14,.0f}{merged:>18,.0f}{merged / single:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
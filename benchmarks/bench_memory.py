@@ -0,0 +1,72 @@
+"""memory footprint of each structure: bytes per element
+
+usage:
+    python -m benchmarks.bench_memory -n 100000
+"""
+import argparse
+import random
+import tracemalloc
+
+from datality import (
+    AVL,
+    ArrayAVL,
+    ArrayRBTree,
+    BST,
+    Deque,
+    DoubleLinkedList,
+    IndexableSkipList,
+    LinkedList,
+    RadixTree,
+    RBTree,
+    SegmentTree,
+    SkipList,
+    SplayTree,
+    Treap,
+    Trie,
+)
+
+
+def footprint(build, values):
+    """bytes allocated by `build(values)` that are still alive at the end"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build(values)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return (after - before) / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=10 ** 5, help="number of elements")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    keys = list(range(args.n))
+    random.Random(args.seed).shuffle(keys)
+    words = [f"{key:x}" for key in keys]
+    structures = [
+        (BST, keys),
+        (AVL, keys),
+        (RBTree, keys),
+        (ArrayAVL, keys),
+        (ArrayRBTree, keys),
+        (SplayTree, keys),
+        (Treap, keys),
+        (SkipList, keys),
+        (IndexableSkipList, keys),
+        (LinkedList, keys),
+        (DoubleLinkedList, keys),
+        (Deque, keys),
+        (SegmentTree, keys),
+        (Trie, words),
+        (RadixTree, words),
+    ]
+    print(f"{'structure':<18}{'bytes/element':>14}")
+    for cls, values in structures:
+        print(f"{cls.__name__:<18}{footprint(cls, values):>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""throughput of the ordered trees: insert, search and delete ops/sec
+
+usage:
+    python -m benchmarks.bench_trees -n 1000000
+"""
+import argparse
+import random
+import time
+
+from datality import AVL, BST, RBTree, SplayTree, Treap
+
+
+def bench(tree, keys, deletes):
+    """time insert and search of all the `keys` in a fresh `tree`, then delete a sample of them"""
+    res = []
+    for op, sample in ((tree.insert, keys), (tree.search, keys), (tree.delete, keys[:deletes])):
+        start = time.perf_counter()
+        for key in sample:
+            op(key)
+        res.append(len(sample) / (time.perf_counter() - start))
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=10 ** 6, help="number of keys")
+    parser.add_argument("-d", type=int, default=10 ** 4, help="number of keys to delete")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sorted", action="store_true", help="use sorted keys (degenerate bst)")
+    args = parser.parse_args()
+
+    keys = list(range(args.n))
+    if not args.sorted:
+        random.Random(args.seed).shuffle(keys)
+    print(f"{'tree':<10}{'insert/s':>14}{'search/s':>14}{'delete/s':>14}")
+    for cls in (BST, AVL, RBTree, SplayTree, Treap):
+        if args.sorted and cls in (BST, SplayTree, Treap) and args.n > 10 ** 4:
+            # quadratic on sorted input... not worth the wait
+            continue
+        # seeded treaps, reproducible shapes
+        tree = cls(seed=args.seed) if cls is Treap else cls()
+        insert, search, delete = bench(tree, keys, args.d)
+        print(f"{cls.__name__:<10}{insert:>14,.0f}{search:>14,.0f}{delete:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,21 @@
 __version__ = "0.1.0"
+from datality.array_tree import ArrayAVL, ArrayRBTree
 from datality.avl import AVL
 from datality.bit_mask import BitMask
 from datality.bst import BST
+from datality.concurrent import ConcurrentSkipList, Synchronized
 from datality.deque import Deque
 from datality.disjoint_set import DJS
 from datality.double_linked_list import DoubleLinkedList
 from datality.fenwick_tree import FenwickTree
+from datality.implicit_treap import ImplicitTreap
 from datality.linked_list import LinkedList
 from datality.min_heap import Heap
+from datality.persistent import PersistentAVL, PersistentTreap
 from datality.radix_trie import RadixTree
 from datality.rb_tree import RBTree
 from datality.segment_tree import SegmentTree
-from datality.skip_list import SkipList
+from datality.skip_list import IndexableSkipList, SkipList
 from datality.splay_tree import SplayTree
 from datality.treap import Treap
 from datality.trie import Trie
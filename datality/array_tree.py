@@ -0,0 +1,663 @@
+from array import array
+from typing import Any, Iterable, Iterator, List, Tuple
+
+from datality.sorted_map import _missing
+
+
+class ArrayBST:
+    """binary search tree stored in parallel columns, the nodes are just integers
+
+    instead of an object per node, every field lives in its own column:
+    `keys` and `data` are lists, the links `left`, `right` and `parent` are
+    arrays of C ints... a node is the index of its slot in all of them.
+    the slot 0 is the null node, so `if node:` reads as usual,
+    and the slots of the deleted nodes are recycled through a free list
+
+    much less memory than the object trees, and the garbage collector
+    only sees a few containers instead of one object per node
+
+    this base class has the shared engine: descent, rotations, splicing and
+    iteration, the subclasses add their own column and keep their invariants
+    """
+
+    def __init__(self, values: Iterable[Any] = []):
+        # the slot 0 is the null node
+        self.keys: List[Any] = [None]
+        self.data: List[Any] = [None]
+        self.left = array("i", [0])
+        self.right = array("i", [0])
+        self.parent = array("i", [0])
+        self.root: int = 0
+        # head of the free list, chained through the left column
+        self._free: int = 0
+        self._length: int = 0
+        for value in values:
+            self.insert(value)
+
+    def _new_slot(self, value: Any, data: Any = None) -> int:
+        """get a slot for a new node, a recycled one if any
+
+        Args:
+            value (Any): value of the new node
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            int: the slot of the new node
+        """
+        slot = self._free
+        if slot:
+            self._free = self.left[slot]
+            self.keys[slot], self.data[slot] = value, data
+            self.left[slot] = self.right[slot] = self.parent[slot] = 0
+        else:
+            slot = len(self.keys)
+            self.keys.append(value)
+            self.data.append(data)
+            self.left.append(0)
+            self.right.append(0)
+            self.parent.append(0)
+        return slot
+
+    def _free_slot(self, slot: int) -> None:
+        """push the slot of a deleted node to the free list
+
+        Args:
+            slot (int): slot to recycle
+        """
+        # drop the references, the values can be collected
+        self.keys[slot] = self.data[slot] = None
+        self.left[slot], self._free = self._free, slot
+
+    def _locate(self, value: Any) -> int:
+        """iterative descent looking for the given `value`
+
+        Args:
+            value (Any): value to look for
+
+        Returns:
+            int: the node containing the `value`, or the parent
+            where the `value` would be attached (0 on an empty tree)
+        """
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while node:
+            key = keys[node]
+            if value == key:
+                return node
+            child = left[node] if value < key else right[node]
+            if not child:
+                return node
+            node = child
+        return node
+
+    def search(self, value: Any) -> int:
+        """searches the node with the given `value`
+
+        Args:
+            value (Any): value to look for
+
+        Raises:
+            KeyError: raised when the value is not found
+
+        Returns:
+            int: the node (slot) containing the given `value`
+        """
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while node:
+            key = keys[node]
+            if value == key:
+                return node
+            node = left[node] if value < key else right[node]
+        raise KeyError(f"{value} not found")
+
+    def _insert_fixup(self, node: int) -> None:
+        """hook to repair the invariants after an insertion, a plain bst has none
+
+        Args:
+            node (int): the new node
+        """
+
+    def insert(self, value: Any, data: Any = None) -> int:
+        """inserts a new node with the given `value`
+
+        Args:
+            value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            int: the node (slot) containing the `value`, the existing one is left untouched
+        """
+        parent = self._locate(value)
+        # special case: empty tree
+        if not parent:
+            self.root = node = self._new_slot(value, data)
+        elif self.keys[parent] == value:
+            # value already in the tree, do nothing
+            return parent
+        else:
+            # standard bst insertion
+            node = self._new_slot(value, data)
+            self.parent[node] = parent
+            if value < self.keys[parent]:
+                self.left[parent] = node
+            else:
+                self.right[parent] = node
+        # update length
+        self._length += 1
+        self._insert_fixup(node)
+        return node
+
+    def _replace(self, node: int, child: int) -> None:
+        """put `child` in the place of `node` below its parent (or as the root)
+
+        Args:
+            node (int): node to be replaced
+            child (int): the replacement, can be null
+        """
+        parent = self.parent[node]
+        if child:
+            self.parent[child] = parent
+        if not parent:
+            self.root = child
+        elif self.left[parent] == node:
+            self.left[parent] = child
+        else:
+            self.right[parent] = child
+
+    def rotate_right(self, node: int) -> None:
+        """right rotation, on a given `node`
+
+        Args:
+            node (int): pivot of the rotation
+        """
+        left, parent = self.left, self.parent
+        child = left[node]
+        # rotate...
+        grandchild = self.right[child]
+        left[node] = grandchild
+        if grandchild:
+            parent[grandchild] = node
+        self._replace(node, child)
+        self.right[child], parent[node] = node, child
+
+    def rotate_left(self, node: int) -> None:
+        """left rotation, on a given `node`
+
+        Args:
+            node (int): pivot of the rotation
+        """
+        right, parent = self.right, self.parent
+        child = right[node]
+        # rotate...
+        grandchild = self.left[child]
+        right[node] = grandchild
+        if grandchild:
+            parent[grandchild] = node
+        self._replace(node, child)
+        self.left[child], parent[node] = node, child
+
+    def _splice(self, node: int) -> Tuple[int, int, int]:
+        """unlink the `node`, its successor takes its place when it has 2 children
+
+        Args:
+            node (int): node to be removed
+
+        Returns:
+            Tuple[int, int, int]: the child that took the place of the unlinked
+            position, its parent, and the node that left that position
+        """
+        left, right, parent = self.left, self.right, self.parent
+        if not (left[node] and right[node]):
+            # at most one child, it takes the place of the node
+            child = left[node] or right[node]
+            above = parent[node]
+            self._replace(node, child)
+            return (child, above, node)
+        # the successor has no left child, it takes the place of the node
+        successor = right[node]
+        while left[successor]:
+            successor = left[successor]
+        child = right[successor]
+        if parent[successor] == node:
+            above = successor
+        else:
+            above = parent[successor]
+            self._replace(successor, child)
+            right[successor] = right[node]
+            parent[right[successor]] = successor
+        self._replace(node, successor)
+        left[successor] = left[node]
+        parent[left[successor]] = successor
+        return (child, above, successor)
+
+    def _remove(self, node: int) -> None:
+        """unlink the `node` and recycle its slot, the subclasses repair their invariants
+
+        Args:
+            node (int): node to be removed
+        """
+        self._splice(node)
+        self._free_slot(node)
+        # update length
+        self._length -= 1
+
+    def delete(self, value: Any) -> None:
+        """deletes the node containing the given `value`
+
+        Args:
+            value (Any): value of the node to look for
+
+        Raises:
+            KeyError: raised when the value is not found
+        """
+        self._remove(self.search(value))
+
+    def _next(self, node: int) -> int:
+        """in-order successor of a `node` following the parent column
+
+        Args:
+            node (int): current node
+
+        Returns:
+            int: the next node, 0 at the end
+        """
+        left, right, parent = self.left, self.right, self.parent
+        if right[node]:
+            # go all the way left in the right subtree
+            node = right[node]
+            while left[node]:
+                node = left[node]
+            return node
+        # climb until we come from a left child
+        while parent[node] and right[parent[node]] == node:
+            node = parent[node]
+        return parent[node]
+
+    def _prev(self, node: int) -> int:
+        """in-order predecessor of a `node`, mirror of `_next`
+
+        Args:
+            node (int): current node
+
+        Returns:
+            int: the previous node, 0 at the beginning
+        """
+        left, right, parent = self.left, self.right, self.parent
+        if left[node]:
+            # go all the way right in the left subtree
+            node = left[node]
+            while right[node]:
+                node = right[node]
+            return node
+        # climb until we come from a right child
+        while parent[node] and left[parent[node]] == node:
+            node = parent[node]
+        return parent[node]
+
+    def range(self, lo: Any = None, hi: Any = None, reverse: bool = False) -> Iterator[Any]:
+        """lazy in-order scan of the values in the half-open range [lo, hi)
+
+        Args:
+            lo (Any, optional): lower bound, included. Defaults to None (unbounded).
+            hi (Any, optional): upper bound, excluded. Defaults to None (unbounded).
+            reverse (bool, optional): from `hi` down to `lo`. Defaults to False.
+
+        Yields:
+            Iterator[Any]: the values in the range
+        """
+        keys, left, right = self.keys, self.left, self.right
+        node, res = self.root, 0
+        if not reverse:
+            # first node inside the range
+            while node:
+                if lo is not None and keys[node] < lo:
+                    node = right[node]
+                else:
+                    res, node = node, left[node]
+            while res and (hi is None or keys[res] < hi):
+                yield keys[res]
+                res = self._next(res)
+        else:
+            # last node inside the range
+            while node:
+                if hi is None or keys[node] < hi:
+                    res, node = node, right[node]
+                else:
+                    node = left[node]
+            while res and (lo is None or not keys[res] < lo):
+                yield keys[res]
+                res = self._prev(res)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.data[self.search(key)]
+
+    def __setitem__(self, key: Any, data: Any) -> None:
+        self.data[self.insert(key)] = data
+
+    def __delitem__(self, key: Any) -> None:
+        self.delete(key)
+
+    def __contains__(self, key: Any) -> bool:
+        node = self._locate(key)
+        return bool(node) and self.keys[node] == key
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """get the data of the given `key`, or the `default` when not found
+
+        Args:
+            key (Any): key to look for
+            default (Any, optional): returned on a miss. Defaults to None.
+
+        Returns:
+            Any: the data of the `key`
+        """
+        node = self._locate(key)
+        if node and self.keys[node] == key:
+            return self.data[node]
+        return default
+
+    def pop(self, key: Any, default: Any = _missing) -> Any:
+        """delete the given `key` and return its data
+
+        Args:
+            key (Any): key to delete
+            default (Any, optional): returned on a miss. Defaults to raising.
+
+        Raises:
+            KeyError: raised when the key is not found and there is no `default`
+
+        Returns:
+            Any: the data of the deleted `key`
+        """
+        try:
+            node = self.search(key)
+        except KeyError:
+            if default is _missing:
+                raise
+            return default
+        data = self.data[node]
+        self._remove(node)
+        return data
+
+    def __repr__(self):
+        res = []
+        # modified in-order traversal (right first), iterative
+        stack, node, level = [], self.root, 0
+        while stack or node:
+            # go all the way right
+            while node:
+                stack.append((node, level))
+                node, level = self.right[node], level + 1
+            node, level = stack.pop()
+            res.append("\t" * level + f"-->({self.keys[node]})")
+            node, level = self.left[node], level + 1
+        return "\n".join(res)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.range()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.range(reverse=True)
+
+    def __len__(self):
+        return self._length
+
+
+class ArrayAVL(ArrayBST):
+    """AVL on the column storage, the heights live in an array of C chars
+
+    https://en.wikipedia.org/wiki/AVL_tree
+    """
+
+    def __init__(self, values: Iterable[Any] = []):
+        # the null node has height 0
+        self.height = array("b", [0])
+        super().__init__(values)
+
+    def _new_slot(self, value: Any, data: Any = None) -> int:
+        """new nodes are leaves, height 1"""
+        slot = super()._new_slot(value, data)
+        if slot == len(self.height):
+            self.height.append(1)
+        else:
+            self.height[slot] = 1
+        return slot
+
+    def update_height(self, node: int) -> None:
+        """method to update the height of a node given the heights of its children
+
+        Args:
+            node (int): node to update the height
+        """
+        height = self.height
+        height[node] = max(height[self.left[node]], height[self.right[node]]) + 1
+
+    def rotate_left(self, node: int) -> None:
+        """left rotation, relinks the columns and updates the heights
+
+        Args:
+            node (int): pivot of the rotation
+        """
+        super().rotate_left(node)
+        # the pivot is now the left child
+        self.update_height(node)
+        self.update_height(self.parent[node])
+
+    def rotate_right(self, node: int) -> None:
+        """right rotation, relinks the columns and updates the heights
+
+        Args:
+            node (int): pivot of the rotation
+        """
+        super().rotate_right(node)
+        # the pivot is now the right child
+        self.update_height(node)
+        self.update_height(self.parent[node])
+
+    def _rebalance(self, node: int) -> int:
+        """update the height of `node` and repair its balance factor if violated
+
+        Args:
+            node (int): node to rebalance
+
+        Returns:
+            int: the root of the subtree, `node` itself or the one rotated in its place
+        """
+        height, left, right = self.height, self.left, self.right
+        self.update_height(node)
+        balance_factor = height[right[node]] - height[left[node]]
+        # repair violations
+        if balance_factor < -1:
+            child = left[node]
+            if height[right[child]] > height[left[child]]:
+                # left - right
+                self.rotate_left(child)
+            self.rotate_right(node)
+            return self.parent[node]
+        if balance_factor > 1:
+            child = right[node]
+            if height[left[child]] > height[right[child]]:
+                # right - left
+                self.rotate_right(child)
+            self.rotate_left(node)
+            return self.parent[node]
+        return node
+
+    def _retrace(self, node: int) -> None:
+        """rebalance bottom-up from `node`, until the height of a subtree does not change
+
+        Args:
+            node (int): lowest node whose subtree changed
+        """
+        height, parent = self.height, self.parent
+        while node:
+            before = height[node]
+            node = self._rebalance(node)
+            # same height as before? the ancestors are not affected
+            if before == height[node]:
+                return
+            node = parent[node]
+
+    def _insert_fixup(self, node: int) -> None:
+        """retrace the insertion path bottom-up
+
+        Args:
+            node (int): the new node
+        """
+        self._retrace(self.parent[node])
+
+    def _remove(self, node: int) -> None:
+        """splice the node out, then retrace from the unlinked position
+
+        Args:
+            node (int): node to be removed
+        """
+        _, parent, moved = self._splice(node)
+        # the successor takes the place, and the height, of the node
+        self.height[moved] = self.height[node]
+        self._retrace(parent)
+        self._free_slot(node)
+        # update length
+        self._length -= 1
+
+
+class ArrayRBTree(ArrayBST):
+    """red and black tree on the column storage, the colors live in an array of C chars
+
+    1 is red, 0 is black... the null node is black
+
+    https://en.wikipedia.org/wiki/Red%E2%80%93black_tree
+    """
+
+    def __init__(self, values: Iterable[Any] = []):
+        # the null node is black
+        self.color = array("b", [0])
+        super().__init__(values)
+
+    def _new_slot(self, value: Any, data: Any = None) -> int:
+        """new nodes are always red"""
+        slot = super()._new_slot(value, data)
+        if slot == len(self.color):
+            self.color.append(1)
+        else:
+            self.color[slot] = 1
+        return slot
+
+    def _insert_fixup(self, node: int) -> None:
+        """repair violations to rb_tree's invariants bottom-up, see `RBTree._insert_fixup`
+
+        Args:
+            node (int): the new node
+        """
+        color, left, right, parents = self.color, self.left, self.right, self.parent
+        parent = parents[node]
+        # black parent, no further violations...
+        while parent and color[parent]:
+            grandparent = parents[parent]
+            # a red root... just paint it black below
+            if not grandparent:
+                break
+            if left[grandparent] == parent:
+                uncle = right[grandparent]
+                # red uncle -> recolor, and keep going up
+                if color[uncle]:
+                    color[parent] = color[uncle] = 0
+                    color[grandparent] = 1
+                    node, parent = grandparent, parents[grandparent]
+                    continue
+                # black uncle -> rotate
+                if node == right[parent]:
+                    self.rotate_left(parent)
+                    parent = node
+                self.rotate_right(grandparent)
+            else:
+                uncle = left[grandparent]
+                # red uncle -> recolor, and keep going up
+                if color[uncle]:
+                    color[parent] = color[uncle] = 0
+                    color[grandparent] = 1
+                    node, parent = grandparent, parents[grandparent]
+                    continue
+                # black uncle -> rotate
+                if node == left[parent]:
+                    self.rotate_right(parent)
+                    parent = node
+                self.rotate_left(grandparent)
+            # switch colors parent <-> grandparent
+            color[parent], color[grandparent] = 0, 1
+            break
+        # the root remains black
+        color[self.root] = 0
+
+    def _remove(self, node: int) -> None:
+        """splice the node out, then repair the missing black, see `RBTree.delete`
+
+        Args:
+            node (int): node to be removed
+        """
+        color = self.color
+        child, parent, moved = self._splice(node)
+        # the color that left is the one of the unlinked position
+        removed_color = color[moved]
+        color[moved] = color[node]
+        if not removed_color:
+            self._delete_fixup(child, parent)
+        self._free_slot(node)
+        # update length
+        self._length -= 1
+
+    def _delete_fixup(self, node: int, parent: int) -> None:
+        """repair the missing black on the paths through `node`, see `RBTree._delete_fixup`
+
+        Args:
+            node (int): the node carrying the extra black, can be null
+            parent (int): parent of the `node`
+        """
+        color, left, right, parents = self.color, self.left, self.right, self.parent
+        while node != self.root and not color[node]:
+            # the brother can't be null, its side has one more black
+            if node == left[parent]:
+                bro = right[parent]
+                # red brother -> rotate, the new brother is black
+                if color[bro]:
+                    color[bro], color[parent] = 0, 1
+                    self.rotate_left(parent)
+                    bro = right[parent]
+                # black nephews -> recolor, and keep going up
+                if not color[left[bro]] and not color[right[bro]]:
+                    color[bro] = 1
+                    node, parent = parent, parents[parent]
+                    continue
+                # only the inner nephew is red -> rotate it outside
+                if not color[right[bro]]:
+                    color[left[bro]], color[bro] = 0, 1
+                    self.rotate_right(bro)
+                    bro = right[parent]
+                # red outer nephew -> rotate, done
+                color[bro], color[parent], color[right[bro]] = color[parent], 0, 0
+                self.rotate_left(parent)
+            else:
+                bro = left[parent]
+                # red brother -> rotate, the new brother is black
+                if color[bro]:
+                    color[bro], color[parent] = 0, 1
+                    self.rotate_right(parent)
+                    bro = left[parent]
+                # black nephews -> recolor, and keep going up
+                if not color[left[bro]] and not color[right[bro]]:
+                    color[bro] = 1
+                    node, parent = parent, parents[parent]
+                    continue
+                # only the inner nephew is red -> rotate it outside
+                if not color[left[bro]]:
+                    color[right[bro]], color[bro] = 0, 1
+                    self.rotate_left(bro)
+                    bro = left[parent]
+                # red outer nephew -> rotate, done
+                color[bro], color[parent], color[left[bro]] = color[parent], 0, 0
+                self.rotate_right(parent)
+            break
+        # a red node absorbs the extra black
+        if node:
+            color[node] = 0
@@ -1,19 +1,24 @@
 from typing import Any, Iterable, Optional
 
-from datality.bst import BST
+from datality.order_statistic import OrderStatisticBST
 
 
 class Node:
     """node chainable storage unit"""
 
-    def __init__(self, value: Any = None):
+    __slots__ = ("value", "data", "weight", "size", "left", "right", "parent")
+
+    def __init__(self, value: Any = None, data: Any = None):
         self.value = value
+        self.data = data
         self.weight: int = 1
+        self.size: int = 1
         self.left: Optional[Node] = None
         self.right: Optional[Node] = None
+        self.parent: Optional[Node] = None
 
 
-class AVL(BST):
+class AVL(OrderStatisticBST):
     """implementation of the AVL
 
     https://en.wikipedia.org/wiki/AVL_tree
@@ -26,38 +31,30 @@ class AVL(BST):
             self.insert(value)
 
     def rotate_left(self, pivot: Node) -> None:
-        """left rotation
+        """left rotation, relinks the pointers and updates the weights
 
         https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
 
         Args:
             pivot (Node): pivot of the rotation
         """
-        aux_node = Node(pivot.value)
-        aux_node.left, aux_node.right = pivot.left, pivot.right.left
-        # replace
-        pivot.value = pivot.right.value
-        pivot.left, pivot.right = aux_node, pivot.right.right
-        # update weights
-        self.update_weight(pivot.left)
+        super().rotate_left(pivot)
+        # update weights, the pivot is now the left child
         self.update_weight(pivot)
+        self.update_weight(pivot.parent)
 
     def rotate_right(self, pivot: Node) -> None:
-        """right rotation
+        """right rotation, relinks the pointers and updates the weights
 
         https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
 
         Args:
             pivot (Node): pivot of the rotation
         """
-        aux_node = Node(pivot.value)
-        aux_node.left, aux_node.right = pivot.left.right, pivot.right
-        # replace
-        pivot.value = pivot.left.value
-        pivot.left, pivot.right = pivot.left.left, aux_node
-        # update weights
-        self.update_weight(pivot.right)
+        super().rotate_right(pivot)
+        # update weights, the pivot is now the right child
         self.update_weight(pivot)
+        self.update_weight(pivot.parent)
 
     def compute_weight(self, node: Node) -> int:
         """method to compute the weight of a node
@@ -86,116 +83,95 @@ class AVL(BST):
             max(self.compute_weight(node.left), self.compute_weight(node.right)) + 1
         )
 
-    def insert(self, value: Any) -> None:
-        """insert a new node into the bst, and rebalance
+    def _new_node(self, value: Any, data: Any = None) -> Node:
+        """avl nodes carry their own weight"""
+        return Node(value, data)
+
+    def _bulk_fixup(self, node: Node, depth: int, height: int) -> None:
+        """the weights and sizes are computed bottom-up while building"""
+        super()._bulk_fixup(node, depth, height)
+        self.update_weight(node)
+
+    def _rebalance(self, node: Node) -> Node:
+        """update the weight of `node` and repair its balance factor if violated
 
         Args:
-            value (Any): must be comparable
+            node (Node): node to rebalance
+
+        Returns:
+            Node: the root of the subtree, `node` itself or the one rotated in its place
         """
-        # special case: empty bst
-        if not self.root:
-            self.root = Node(value)
-            # update length
-            self._length += 1
-            return
-
-        def r(current_node: Node, value: Any):
-            """modified bst insertion"""
-            if current_node.value == value:
-                # if value already in the tree do nothing
-                self._length -= 1
-                return
-            if value < current_node.value:
-                if current_node.left:
-                    r(current_node.left, value)
-                else:
-                    current_node.left = Node(value)
-            else:
-                if current_node.right:
-                    r(current_node.right, value)
-                else:
-                    current_node.right = Node(value)
-            # update the weights of each visited node
-            self.update_weight(current_node)
-            # compute balance_factor
-            w_right = self.compute_weight(current_node.right)
-            w_left = self.compute_weight(current_node.left)
-            balance_factor = w_right - w_left
-            # repair violations
-            if balance_factor < -1:
-                # rotate right
-                if value > current_node.left.value:
-                    # left - right
-                    self.rotate_left(current_node.left)
-                self.rotate_right(current_node)
-                return
-            if balance_factor > 1:
-                # rotate left
-                if value < current_node.right.value:
-                    # right - left
-                    self.rotate_right(current_node.right)
-                self.rotate_left(current_node)
+        # update the weight of the visited node
+        self.update_weight(node)
+        # compute balance_factor
+        balance_factor = self.compute_weight(node.right) - self.compute_weight(node.left)
+        # repair violations
+        if balance_factor < -1:
+            # rotate right
+            if self.compute_weight(node.left.right) > self.compute_weight(node.left.left):
+                # left - right
+                self.rotate_left(node.left)
+            self.rotate_right(node)
+            return node.parent
+        if balance_factor > 1:
+            # rotate left
+            if self.compute_weight(node.right.left) > self.compute_weight(node.right.right):
+                # right - left
+                self.rotate_right(node.right)
+            self.rotate_left(node)
+            return node.parent
+        return node
+
+    def _insert_fixup(self, node: Node) -> None:
+        """retrace the insertion path bottom-up, updating weights and rebalancing
+
+        Args:
+            node (Node): the new node
+        """
+        # one more descendant for every ancestor
+        super()._insert_fixup(node)
+        node = node.parent
+        while node:
+            weight = node.weight
+            node = self._rebalance(node)
+            # same weight as before? the ancestors are not affected
+            if weight == node.weight:
                 return
+            node = node.parent
 
-        r(self.root, value)
-        # update length
-        self._length += 1
+    def delete(self, value: Any) -> Node:
+        """deletes the node with the given `value`, O(log(n))
+
+        the node is spliced out, a node with 2 children is replaced by its successor
+        (see `_splice`)... then retrace the path bottom-up, updating weights and
+        rebalancing, until the weight of a subtree does not change
 
-    def delete(self, value: Any) -> None:
-        """search for value, and rotate until leaf, then delete
+        https://en.wikipedia.org/wiki/AVL_tree#Delete
 
         Args:
             value (Any): value to delete
 
         Raises:
             KeyError: raised when the value is not in the tree
+
+        Returns:
+            Node: the unlinked node
         """
         if value is None or not self.root:
             raise KeyError(f"{value} not found")
-
-        def fetch(node: Node, parent: Node):
-            """standard bst search but keeps track of the parents"""
-            if not node:
-                raise KeyError(f"{value} not found")
-            if node.value == value:
-                return (node, parent)
-            if value < node.value:
-                return fetch(node.left, node)
-            else:
-                return fetch(node.right, node)
-
-        node, parent = fetch(self.root, None)
-
-        def r(node: Node, parent: Node):
-            """when found, rotate the node until it becomes a leaf
-
-            once a leaf deletion is trivial
-            """
-            if not node.left and not node.right:
-                # special case: root
-                if not parent:
-                    self.root = None
-                    return
-                # actual deletion
-                if node == parent.right:
-                    parent.right = None
-                    return
-                else:
-                    parent.left = None
-                    return
-            # rotate until leaf...
-            child = node.left or node.right
-            if child == node.left:
-                self.rotate_right(node)
-                # our node switches place with the right child
-                r(node.right, node)
-            else:
-                self.rotate_left(node)
-                # our node switches place with the left child
-                r(node.left, node)
-            # do not forget to update the weights
-            self.update_weight(node)
-
-        r(node, parent)
+        node = self._fetch(value)
+        _, parent, moved = self._splice(node)
+        # the successor takes the place, and the weight, of the node
+        moved.weight = node.weight
+        # retrace
+        while parent:
+            weight = parent.weight
+            parent = self._rebalance(parent)
+            # same weight as before? the ancestors are not affected
+            if weight == parent.weight:
+                break
+            parent = parent.parent
+        node.left = node.right = node.parent = None
         # update length
         self._length -= 1
+        return node
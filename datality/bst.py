@@ -1,18 +1,106 @@
-from typing import Any, Iterable, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from datality.sorted_map import SortedMap
 
 
 class Node:
     """node chainable storage unit"""
 
-    def __init__(self, value: Optional[Any] = None):
+    __slots__ = ("value", "data", "left", "right", "parent")
+
+    def __init__(self, value: Optional[Any] = None, data: Any = None):
         self.value: Any = value
+        self.data: Any = data
         self.left: Optional[Node] = None
         self.right: Optional[Node] = None
+        self.parent: Optional[Node] = None
+
+
+class Cursor:
+    """a position in a tree, the finger: seeks start from here instead of the root
+
+    seek(value) climbs only until the subtree can contain the `value`: in a balanced tree,
+    a sweep of seeks in one direction costs O(log(d)) amortized each, where `d` is the
+    distance between the current position and the `value`... a single seek is still
+    O(log(n)) in the worst case, even for d = 1: crossing from the max of a subtree to
+    its parent climbs the whole way up (no level links here). next() and prev() are O(1)
+    amortized. the insertions keep the cursor valid, deleting its node invalidates it
+    """
+
+    __slots__ = ("tree", "node")
+
+    def __init__(self, tree: "BST", node: Optional[Node] = None):
+        self.tree = tree
+        self.node: Optional[Node] = node
+
+    @property
+    def value(self) -> Any:
+        """value at the cursor
+
+        Raises:
+            IndexError: raised when the cursor is out of the tree
+
+        Returns:
+            Any: the value
+        """
+        if not self.node:
+            raise IndexError("cursor out of range")
+        return self.node.value
+
+    def seek(self, value: Any) -> bool:
+        """move to the first node whose value is greater or equal than the given `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            bool: if the `value` itself was found
+        """
+        if not self.node:
+            # lost the finger... start from the root
+            self.node = self.tree.lower_bound(value)
+        else:
+            node = self.tree._finger(self.node, value)
+            # the parent where it would be attached is either its predecessor or its successor
+            self.node = self.tree._next(node) if node.value < value else node
+        return bool(self.node) and self.node.value == value
+
+    def next(self) -> Optional[Node]:
+        """move to the next node in order
+
+        Returns:
+            Optional[Node]: the new node, None past the end
+        """
+        if self.node:
+            self.node = self.tree._next(self.node)
+        return self.node
+
+    def prev(self) -> Optional[Node]:
+        """move to the previous node in order
+
+        Returns:
+            Optional[Node]: the new node, None before the beginning
+        """
+        if self.node:
+            self.node = self.tree._prev(self.node)
+        return self.node
+
+    def __bool__(self) -> bool:
+        return self.node is not None
 
 
-class BST:
+class BST(SortedMap):
     """custom implementation of a binary search tree
 
+    all the operations are iterative, no recursion and no closures per call,
+    the subclasses reuse the same descent engine (`_locate`, `_fetch`, `_replace`)
+    and only override the hooks `_new_node` and `_insert_fixup` to keep their invariants
+
+    every node knows its parent, so the rotations just relink pointers:
+    they never allocate and the nodes returned by `search` remain valid
+
+    the values are keys too: `tree[key] = data` keeps the data in the node of the key
+
     https://en.wikipedia.org/wiki/Binary_search_tree
     """
 
@@ -22,39 +110,194 @@ class BST:
         for value in values:
             self.insert(value)
 
-    def insert(self, value: Any) -> None:
+    @classmethod
+    def from_sorted(cls, values: Iterable[Any], **kwargs: Any) -> "BST":
+        """bulk-load: build a perfectly balanced tree in O(n)
+
+        the middle value becomes the root, recursively... no insertions, no rotations.
+        the input is sorted first, which is linear for pre-sorted values (timsort),
+        repeated values are kept once
+
+        Args:
+            values (Iterable[Any]): comparable values, ideally sorted
+            **kwargs (Any): passed to the constructor, e.g. the `seed` of a Treap
+
+        Returns:
+            BST: a new tree containing the given `values`
+        """
+        values = sorted(values)
+        # drop repetitions
+        unique = values[:1]
+        for value in values[1:]:
+            if value != unique[-1]:
+                unique.append(value)
+        tree = cls(**kwargs)
+        tree._build(unique)
+        return tree
+
+    def _build(self, values: List[Any]) -> None:
+        """replace the content of the tree by a balanced tree of the sorted `values`
+
+        Args:
+            values (List[Any]): sorted values, without repetitions
+        """
+        # all the levels are full except the deepest one
+        height = len(values).bit_length()
+
+        def r(lo: int, hi: int, parent: Optional[Node], depth: int) -> Optional[Node]:
+            """build the subtree of values[lo:hi], the middle goes on top"""
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = self._new_node(values[mid])
+            node.parent = parent
+            node.left = r(lo, mid, node, depth + 1)
+            node.right = r(mid + 1, hi, node, depth + 1)
+            self._bulk_fixup(node, depth, height)
+            return node
+
+        self.root = r(0, len(values), None, 0)
+        self._length = len(values)
+
+    def _bulk_fixup(self, node: Node, depth: int, height: int) -> None:
+        """hook to set up the invariants of a node built by `from_sorted`, bottom-up
+
+        Args:
+            node (Node): node whose subtrees are already built
+            depth (int): depth of the node, 0 for the root
+            height (int): number of levels of the whole tree
+        """
+
+    def _new_node(self, value: Any, data: Any = None) -> Node:
+        """node factory, each subclass builds its own kind of node
+
+        Args:
+            value (Any): value of the new node
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: brand new node
+        """
+        return Node(value, data)
+
+    def _locate(self, value: Any, node: Optional[Node] = None) -> Optional[Node]:
+        """iterative descent looking for the given `value`
+
+        Args:
+            value (Any): value to look for
+            node (Optional[Node], optional): start of the descent. Defaults to None (the root).
+
+        Returns:
+            Optional[Node]: the node containing the `value`, or the parent
+            where the `value` would be attached (None on an empty tree)
+        """
+        node = node or self.root
+        while node:
+            if value == node.value:
+                return node
+            child = node.left if value < node.value else node.right
+            if not child:
+                return node
+            node = child
+        return node
+
+    def _finger(self, node: Node, value: Any) -> Node:
+        """finger search: look for the `value` starting from a known `node`
+
+        climbs only until the subtree can contain the `value`, then descends. in a balanced
+        tree, O(log(d)) amortized over a monotone sweep, where `d` is the distance between
+        both values, O(log(n)) worst case: neighbours across a high ancestor climb up to it
+
+        Args:
+            node (Node): the finger, any node of the tree
+            value (Any): value to look for
+
+        Returns:
+            Node: the node containing the `value`, or the parent where it would be attached
+        """
+        if node.value < value:
+            # climb until an ancestor on our right is bigger than the `value`
+            while node.parent and not (node.parent.left is node and value < node.parent.value):
+                node = node.parent
+        elif value < node.value:
+            # climb until an ancestor on our left is smaller than the `value`
+            while node.parent and not (node.parent.right is node and node.parent.value < value):
+                node = node.parent
+        return self._locate(value, node)
+
+    def _fetch(self, value: Any) -> Node:
+        """iterative descent from the root, exact match
+
+        Args:
+            value (Any): value to look for
+
+        Raises:
+            KeyError: raised when the value is not found
+
+        Returns:
+            Node: the node containing `value`
+        """
+        node = self.root
+        while node:
+            if value == node.value:
+                return node
+            node = node.left if value < node.value else node.right
+        raise KeyError(f"{value} not found")
+
+    def _replace(self, node: Node, child: Optional[Node]) -> None:
+        """put `child` in the place of `node` below its parent (or as the root)
+
+        Args:
+            node (Node): node to be replaced
+            child (Optional[Node]): the replacement
+        """
+        parent = node.parent
+        if child:
+            child.parent = parent
+        if not parent:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+
+    def _insert_fixup(self, node: Node) -> None:
+        """hook to repair the invariants after an insertion, a plain bst has none
+
+        Args:
+            node (Node): the new node
+        """
+
+    def insert(self, value: Any, data: Any = None) -> Node:
         """inserts a new node with the given `value`
 
 
         Args:
             value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: the node containing the `value`, the existing one is left untouched
         """
+        parent = self._locate(value)
         # special case: empty tree
-        if not self.root:
-            self.root = Node(value)
-            self._length += 1
-            return
-
-        def r(node: Node, value: Any):
-            """standard bst insertion"""
-            if node.value == value:
-                # value already in the tree, do nothing
-                self._length -= 1
-                return
-            if value < node.value:
-                if node.left:
-                    r(node.left, value)
-                else:
-                    node.left = Node(value)
+        if not parent:
+            self.root = node = self._new_node(value, data)
+        elif parent.value == value:
+            # value already in the tree, do nothing
+            return parent
+        else:
+            # standard bst insertion
+            node = self._new_node(value, data)
+            node.parent = parent
+            if value < parent.value:
+                parent.left = node
             else:
-                if node.right:
-                    r(node.right, value)
-                else:
-                    node.right = Node(value)
-
-        r(self.root, value)
+                parent.right = node
         # update length
         self._length += 1
+        self._insert_fixup(node)
+        return node
 
     def search(self, value: Any) -> Node:
         """searches the node with the given `value`
@@ -70,22 +313,48 @@ class BST:
         Returns:
             Node: Node containing the given `value`
         """
-        # special case: empty tree
-        if not self.root:
-            raise KeyError(f"{value} not found")
+        return self._fetch(value)
 
-        def r(node: Node):
-            if not node:
-                raise KeyError(f"{value} not found")
-            if value == node.value:
-                return node
-            # keep looking
-            if value < node.value:
-                return r(node.left)
-            else:
-                return r(node.right)
+    def __contains__(self, value: Any) -> bool:
+        # a single descent, no exceptions on a miss
+        node = self._locate(value)
+        return node is not None and node.value == value
+
+    def search_many(self, values: Iterable[Any]) -> Dict[Any, Node]:
+        """batched lookup, the `values` are sorted once and answered in a single sweep
+
+        each lookup is a finger search from the previous one instead of a
+        descent from the root, O(log(n) + m*log(n/m)) for m values in a balanced tree,
+        and the misses do not raise
+
+        Args:
+            values (Iterable[Any]): values to look for, must be hashable
+
+        Returns:
+            Dict[Any, Node]: the found values with their nodes, the misses are left out
+        """
+        res = {}
+        node = self.root
+        if not node:
+            return res
+        for value in sorted(values):
+            node = self._finger(node, value)
+            if node.value == value:
+                res[value] = node
+        return res
 
-        return r(self.root)
+    def contains_many(self, values: Iterable[Any]) -> List[bool]:
+        """batched membership test, see `search_many`
+
+        Args:
+            values (Iterable[Any]): values to look for, must be hashable
+
+        Returns:
+            List[bool]: for each value, in the same order, if it is in the tree
+        """
+        values = list(values)
+        found = self.search_many(values)
+        return [value in found for value in values]
 
     def successor(self, value: Any) -> Node:
         """get the next in-order successor of a node with the given `value`
@@ -99,23 +368,15 @@ class BST:
         Returns:
             Node: node containing the value of the successor
         """
-        if not self.root:
-            raise KeyError(f"successor of {value} not found")
-
-        def r(node: Node, next_ancestor: Node):
-            """find the node recursively, keep track of the anscestors"""
-            if not node:
-                raise KeyError(f"successor of {value} not found")
-            if node.value == value:
-                # found
-                return (node, next_ancestor)
-            # keep looking
+        # find the node, keep track of the last ancestor where we went left
+        node, next_ancestor = self.root, None
+        while node and node.value != value:
             if value < node.value:
-                return r(node.left, node)
+                next_ancestor, node = node, node.left
             else:
-                return r(node.right, next_ancestor)
-
-        node, next_ancestor = r(self.root, None)
+                node = node.right
+        if not node:
+            raise KeyError(f"successor of {value} not found")
         # no right subtree, return the previous bigger ancestor
         if not node.right:
             if not next_ancestor:
@@ -127,35 +388,272 @@ class BST:
             node = node.left
         return node
 
+    def cursor(self, value: Any = None) -> Cursor:
+        """get a cursor at the first node whose value is greater or equal than `value`
+
+        Args:
+            value (Any, optional): must be comparable. Defaults to None (the min).
+
+        Returns:
+            Cursor: the new cursor, empty when every value is smaller
+        """
+        if value is not None:
+            return Cursor(self, self.lower_bound(value))
+        node = self.root
+        while node and node.left:
+            node = node.left
+        return Cursor(self, node)
+
+    def _next(self, node: Node) -> Optional[Node]:
+        """in-order successor of a `node` following the parent pointers, O(1) amortized
+
+        Args:
+            node (Node): current node
+
+        Returns:
+            Optional[Node]: the next node, None at the end
+        """
+        if node.right:
+            # go all the way left in the right subtree
+            node = node.right
+            while node.left:
+                node = node.left
+            return node
+        # climb until we come from a left child
+        while node.parent and node.parent.right is node:
+            node = node.parent
+        return node.parent
+
+    def _prev(self, node: Node) -> Optional[Node]:
+        """in-order predecessor of a `node`, mirror of `_next`
+
+        Args:
+            node (Node): current node
+
+        Returns:
+            Optional[Node]: the previous node, None at the beginning
+        """
+        if node.left:
+            # go all the way right in the left subtree
+            node = node.left
+            while node.right:
+                node = node.right
+            return node
+        # climb until we come from a right child
+        while node.parent and node.parent.left is node:
+            node = node.parent
+        return node.parent
+
+    def lower_bound(self, value: Any) -> Optional[Node]:
+        """first node whose value is greater or equal than the given `value`
+
+        the `value` does not need to be in the tree, no exceptions on a miss
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is smaller
+        """
+        node, res = self.root, None
+        while node:
+            if node.value < value:
+                node = node.right
+            else:
+                res, node = node, node.left
+        return res
+
+    def upper_bound(self, value: Any) -> Optional[Node]:
+        """first node whose value is strictly greater than the given `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is smaller or equal
+        """
+        node, res = self.root, None
+        while node:
+            if value < node.value:
+                res, node = node, node.left
+            else:
+                node = node.right
+        return res
+
+    def predecessor(self, value: Any) -> Optional[Node]:
+        """last node whose value is strictly smaller than the given `value`
+
+        unlike `successor`, the `value` does not need to be in the tree
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is greater or equal
+        """
+        node, res = self.root, None
+        while node:
+            if node.value < value:
+                res, node = node, node.right
+            else:
+                node = node.left
+        return res
+
+    def floor(self, value: Any) -> Optional[Node]:
+        """last node whose value is smaller or equal than the given `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is greater
+        """
+        node, res = self.root, None
+        while node:
+            if value < node.value:
+                node = node.left
+            else:
+                res, node = node, node.right
+        return res
+
+    def ceiling(self, value: Any) -> Optional[Node]:
+        """first node whose value is greater or equal than the given `value`, see `lower_bound`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is smaller
+        """
+        return self.lower_bound(value)
+
+    def range(self, lo: Any = None, hi: Any = None, reverse: bool = False) -> Iterator[Any]:
+        """lazy in-order scan of the values in the half-open range [lo, hi)
+
+        a single descent finds the first node, then the scan walks the
+        parent pointers, with constant extra memory
+
+        Args:
+            lo (Any, optional): lower bound, included. Defaults to None (unbounded).
+            hi (Any, optional): upper bound, excluded. Defaults to None (unbounded).
+            reverse (bool, optional): from `hi` down to `lo`. Defaults to False.
+
+        Yields:
+            Iterator[Any]: the values in the range
+        """
+        if not reverse:
+            if lo is None:
+                node = self.root
+                while node and node.left:
+                    node = node.left
+            else:
+                node = self.lower_bound(lo)
+            while node and (hi is None or node.value < hi):
+                yield node.value
+                node = self._next(node)
+        else:
+            if hi is None:
+                node = self.root
+                while node and node.right:
+                    node = node.right
+            else:
+                node = self.predecessor(hi)
+            while node and (lo is None or not node.value < lo):
+                yield node.value
+                node = self._prev(node)
+
     def rotate_right(self, node: Node) -> None:
         """right rotation, on a given `node`
 
+        the left child takes the place of `node`, which becomes its right child
+
         https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
 
         Args:
             node (Node): pivot of the rotation
         """
-        _ = Node(node.value)
-        _.left, _.right = node.left.right, node.right
+        child = node.left
         # rotate...
-        node.value = node.left.value
-        node.left, node.right = node.left.left, _
+        node.left = child.right
+        if child.right:
+            child.right.parent = node
+        self._replace(node, child)
+        child.right, node.parent = node, child
 
-    def rotate_left(self, node):
+    def rotate_left(self, node: Node) -> None:
         """left rotation, on a given `node`
 
+        the right child takes the place of `node`, which becomes its left child
+
         https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
 
         Args:
             node (Node): pivot of the rotation
         """
-        _ = Node(node.value)
-        _.left, _.right = node.left, node.right.left
+        child = node.right
         # rotate...
-        node.value = node.right.value
-        node.left, node.right = _, node.right.right
+        node.right = child.left
+        if child.left:
+            child.left.parent = node
+        self._replace(node, child)
+        child.left, node.parent = node, child
+
+    def _rotate_to_leaf(self, node: Node) -> None:
+        """rotate the `node` down until it becomes a leaf, then unlink it
+
+        Args:
+            node (Node): node to be removed
+        """
+        while node.left or node.right:
+            if node.left:
+                # our node switches place with the left child
+                self.rotate_right(node)
+            else:
+                # our node switches place with the right child
+                self.rotate_left(node)
+        # once a leaf deletion is trivial
+        self._replace(node, None)
+
+    def _splice(self, node: Node) -> Tuple[Optional[Node], Optional[Node], Node]:
+        """unlink the `node`, the classic way
+
+        with at most one child, the child takes its place... with two children,
+        its successor (which has no left child) is unlinked and moved to its place:
+        the node itself moves, not its value, so the nodes returned by `search` remain valid
+
+        Args:
+            node (Node): node to be removed
 
-    def delete(self, value: Any) -> None:
+        Returns:
+            Tuple[Optional[Node], Optional[Node], Node]: the child that took the place
+            of the unlinked position, its parent, and the node that left that position
+            (the successor, or `node` itself)
+        """
+        if not (node.left and node.right):
+            # at most one child, it takes the place of the node
+            child = node.left or node.right
+            parent = node.parent
+            self._replace(node, child)
+            return (child, parent, node)
+        # the successor has no left child, it takes the place of the node
+        successor = node.right
+        while successor.left:
+            successor = successor.left
+        # the child of the successor takes the place of the successor
+        child = successor.right
+        if successor.parent is node:
+            parent = successor
+        else:
+            parent = successor.parent
+            self._replace(successor, child)
+            successor.right = node.right
+            successor.right.parent = successor
+        self._replace(node, successor)
+        successor.left = node.left
+        successor.left.parent = successor
+        return (child, parent, successor)
+
+    def delete(self, value: Any) -> Node:
         """deletes the node containinf the given `value`
 
         this is my favorite way of deletion is also optimal O(ln(n))
@@ -165,68 +663,36 @@ class BST:
 
         Raises:
             KeyError: raised when the value is not found
-        """
-
-        def fetch(node, parent):
-            """recursively find the node to delete and his parent"""
-            if not node:
-                raise KeyError(f"{value} not found")
-            if node.value == value:
-                # found
-                return (node, parent)
-            # keep looking
-            if value < node.value:
-                return fetch(node.left, node)
-            else:
-                return fetch(node.right, node)
-
-        node, parent = fetch(self.root, None)
-
-        def r(node: Node, parent: Node):
-            """when found, rotate the node until it becomes a leaf
-
-            once a leaf deletion is trivial
-            """
-            if not node.left and not node.right:
-                # special case: root
-                if not parent:
-                    self.root = None
-                    return
-                # actual deletion
-                if node == parent.right:
-                    parent.right = None
-                    return
-                else:
-                    parent.left = None
-                    return
-            # rotate until leaf...
-            child = node.left or node.right
-            if child == node.left:
-                self.rotate_right(node)
-                # our node switches place with the right child
-                r(node.right, node)
-            else:
-                self.rotate_left(node)
-                # our node switches place with the left child
-                r(node.left, node)
 
-        r(node, parent)
+        Returns:
+            Node: the unlinked node
+        """
+        node = self._fetch(value)
+        # when found, rotate the node until it becomes a leaf
+        self._rotate_to_leaf(node)
         # update length
         self._length -= 1
+        return node
 
     def __repr__(self):
         res = []
-
-        def r(node: Node, level: int = 0):
-            """modified in-order traversal"""
-            if not node:
-                return
-            r(node.right, level + 1)
+        # modified in-order traversal (right first), iterative
+        stack, node, level = [], self.root, 0
+        while stack or node:
+            # go all the way right
+            while node:
+                stack.append((node, level))
+                node, level = node.right, level + 1
+            node, level = stack.pop()
             res.append("\t" * level + f"-->({node.value})")
-            r(node.left, level + 1)
-
-        r(self.root)
+            node, level = node.left, level + 1
         return "\n".join(res)
 
+    def __iter__(self) -> Iterator[Any]:
+        return self.range()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.range(reverse=True)
+
     def __len__(self):
         return self._length
@@ -0,0 +1,478 @@
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from random import Random
+from typing import Any, Iterable, Iterator, List, Optional, Sized
+
+from datality.implicit_treap import ImplicitTreap
+from datality.skip_list import SkipList
+from datality.sorted_map import SortedMap
+from datality.splay_tree import SplayTree
+
+# methods that never modify the structure, they only need a shared lock
+READS = frozenset(
+    (
+        "ceiling",
+        "contains_many",
+        "count_range",
+        "floor",
+        "get",
+        "index",
+        "islice",
+        "lower_bound",
+        "predecessor",
+        "range",
+        "rank",
+        "search",
+        "search_many",
+        "select",
+        "successor",
+        "upper_bound",
+    )
+)
+
+# structures that restructure themselves on reads, every call is a write for them
+SELF_ADJUSTING = (SplayTree, ImplicitTreap)
+
+
+class RWLock:
+    """readers-writer lock, many readers at once or a single writer
+
+    writers have preference: once a writer waits, new readers wait behind it,
+    so a steady stream of readers cannot starve the writers
+
+    https://en.wikipedia.org/wiki/Readers%E2%80%93writer_lock
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writer = False
+
+    def acquire_read(self) -> None:
+        """shared access, waits while a writer holds or waits for the lock"""
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """end of a shared access, the last reader out wakes the writers"""
+        with self._condition:
+            self._readers -= 1
+            # the last reader out lets the writers in
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """exclusive access, waits until the writer and every reader are out"""
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        """end of the exclusive access, wakes everyone waiting"""
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """shared access, for the duration of the `with` block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """exclusive access, for the duration of the `with` block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class Synchronized:
+    """thread-safe wrapper of any of the data structures
+
+    the methods in `reads` run under a shared lock, many threads at once, the
+    rest of them run under an exclusive lock... lazy scans (`range`, iteration)
+    are consumed under the lock and returned as a snapshot, so an abandoned
+    generator never keeps the lock
+
+    the nodes and cursors returned by the structure are not protected, read
+    them while no one writes, or use `lock` directly for compound operations:
+
+        with sync.lock.write():
+            if key not in sync.structure:
+                sync.structure.insert(key)
+    """
+
+    def __init__(self, structure: Any, reads: Optional[Iterable[str]] = None, lock: Optional[RWLock] = None):
+        """constructor
+
+        Args:
+            structure (Any): the data structure to share
+            reads (Optional[Iterable[str]], optional): names of the methods that do not modify
+            the structure. Defaults to None (READS, none for self-adjusting structures).
+            lock (Optional[RWLock], optional): lock to use, anything with the interface
+            of RWLock. Defaults to None (a new RWLock).
+        """
+        if reads is None:
+            reads = () if isinstance(structure, SELF_ADJUSTING) else READS
+        self.structure = structure
+        self.reads = frozenset(reads)
+        self.lock = lock or RWLock()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.structure, name)
+        if not callable(attribute):
+            return attribute
+        if name in self.reads:
+            acquire, release = self.lock.acquire_read, self.lock.release_read
+        else:
+            acquire, release = self.lock.acquire_write, self.lock.release_write
+        # lazy scans are consumed while holding the lock
+        eager = inspect.isgeneratorfunction(attribute)
+
+        def locked(*args, **kwargs):
+            acquire()
+            try:
+                res = attribute(*args, **kwargs)
+                return list(res) if eager else res
+            finally:
+                release()
+
+        locked.__name__ = name
+        locked.__doc__ = attribute.__doc__
+        # cached, the next lookups do not reach __getattr__
+        setattr(self, name, locked)
+        return locked
+
+    def _shared(self):
+        """the lock of the dunder reads, they are shared only when `search` is"""
+        return self.lock.read() if "search" in self.reads else self.lock.write()
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            self.search(value)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._shared():
+            return self.structure[key]
+
+    def __setitem__(self, key: Any, data: Any) -> None:
+        with self.lock.write():
+            self.structure[key] = data
+
+    def __delitem__(self, key: Any) -> None:
+        with self.lock.write():
+            del self.structure[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        with self._shared():
+            return iter(list(self.structure))
+
+    def __reversed__(self) -> Iterator[Any]:
+        with self._shared():
+            return iter(list(reversed(self.structure)))
+
+    def __repr__(self):
+        with self._shared():
+            return repr(self.structure)
+
+    def __len__(self):
+        with self._shared():
+            return len(self.structure)
+
+
+class Node:
+    """Node basic chainable storage unit, with its own lock"""
+
+    __slots__ = ("value", "data", "next", "lock", "marked", "fully_linked")
+
+    def __init__(self, value: Any = None, data: Any = None, level: int = 1):
+        self.value = value
+        self.data = data
+        # next[i] is the following node on the level i, the bottom one is 0
+        self.next: List[Optional["Node"]] = [None] * level
+        self.lock = threading.Lock()
+        # logically deleted, the unlinking may still be on its way
+        self.marked = False
+        # linked on all its levels, only then it is in the list
+        self.fully_linked = False
+
+
+class ConcurrentSkipList(SortedMap):
+    """skip list safe for many threads at once, the lazy skip list
+
+    the lookups take no locks at all, they just skip the nodes that are half
+    linked or marked as deleted. the writers lock only the nodes they relink,
+    the predecessors of the value on every level, validate that nothing changed
+    in between, and retry otherwise... writers on different parts of the list
+    never wait for each other
+
+    the locks are always taken from right to left (the deleted node first, then
+    its predecessors from the bottom level up), so there are no deadlocks
+
+    every operation is linearizable: insert at the moment the new node is fully
+    linked, delete at the moment the node is marked. the iteration is weakly
+    consistent: it sees every value present for the whole scan, maybe some more
+
+    asyncio code can share it as it is, no method awaits
+
+    https://people.csail.mit.edu/shanir/publications/LazySkipList.pdf
+    """
+
+    # same coins and caps as the sequential skip list
+    _max_level = SkipList._max_level
+    _promotions = SkipList._promotions
+
+    def __init__(
+        self,
+        values: Iterable[Any] = [],
+        probability: float = 0.5,
+        seed: Optional[int] = None,
+        max_level: Optional[int] = None,
+    ):
+        """constructor
+
+        Args:
+            values (Iterable[Any], optional): from list of values. Defaults to [].
+            probability (float, optional): promotions probability. Defaults to .5.
+            seed (Optional[int], optional): seed of the coin flips. Defaults to None (random).
+            max_level (Optional[int], optional): cap of the levels. Defaults to None
+            (derived from the size of `values`).
+        """
+        self.probability: float = probability
+        if max_level is None:
+            max_level = self._max_level(len(values) if isinstance(values, Sized) else 0)
+        self.max_level: int = max_level
+        self.root = Node(-float("inf"), level=max_level)
+        self.root.fully_linked = True
+        # highest level ever used, the searches start there... it only grows
+        self.level: int = 1
+        self._random = Random(seed)
+        self._length: int = 0
+        # the level and the counter are the only shared state besides the links
+        self._state_lock = threading.Lock()
+        for value in values:
+            self.insert(value)
+
+    def _find(self, value: Any, preds: List[Node], succs: List[Optional[Node]]) -> int:
+        """skip search filling the predecessors and successors of the `value` on every level
+
+        Args:
+            value (Any): must be comparable
+            preds (List[Node]): filled with the last node before the value on every level
+            succs (List[Optional[Node]]): filled with the next node on every level
+
+        Returns:
+            int: highest level where the value was found, -1 when not found
+        """
+        found, node = -1, self.root
+        for level in range(self.level - 1, -1, -1):
+            # go right until we can't
+            next_node = node.next[level]
+            while next_node and next_node.value < value:
+                node, next_node = next_node, next_node.next[level]
+            if found == -1 and next_node and next_node.value == value:
+                found = level
+            preds[level], succs[level] = node, next_node
+        return found
+
+    def _lock(self, preds: List[Node], valid, top: int) -> Optional[List[Node]]:
+        """lock the predecessors from the bottom level up and validate them
+
+        Args:
+            preds (List[Node]): predecessors of every level
+            valid (Callable[[int, Node], bool]): validation of the predecessor of a level
+            top (int): number of levels to lock
+
+        Returns:
+            Optional[List[Node]]: the locked nodes, None when the validation failed
+            (and nothing remains locked)
+        """
+        locked: List[Node] = []
+        for level in range(top):
+            pred = preds[level]
+            # a node can be the predecessor on many levels, lock it once
+            if not locked or locked[-1] is not pred:
+                pred.lock.acquire()
+                locked.append(pred)
+            if not valid(level, pred):
+                self._unlock(locked)
+                return None
+        return locked
+
+    def _unlock(self, locked: List[Node]) -> None:
+        """release the nodes locked by `_lock`"""
+        for node in locked:
+            node.lock.release()
+
+    def insert(self, value: Any, data: Any = None) -> Node:
+        """insert a new node in the skip list
+
+        Args:
+            value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: the node containing the `value`, the existing one is left untouched
+        """
+        top = min(self._promotions() + 1, self.max_level)
+        # raise the level before linking, no node is ever above it
+        if top > self.level:
+            with self._state_lock:
+                self.level = max(self.level, top)
+        preds: List[Node] = [self.root] * self.max_level
+        succs: List[Optional[Node]] = [None] * self.max_level
+        while True:
+            found = self._find(value, preds, succs)
+            if found != -1:
+                node = succs[found]
+                if not node.marked:
+                    # special case: someone else is inserting it, wait until it is in
+                    while not node.fully_linked:
+                        time.sleep(0)
+                    return node
+                # special case: it is on its way out, try again
+                continue
+            # nothing changed between the search and the locks?
+            locked = self._lock(
+                preds,
+                lambda level, pred: not pred.marked
+                and (succs[level] is None or not succs[level].marked)
+                and pred.next[level] is succs[level],
+                top,
+            )
+            if locked is None:
+                continue
+            # resembles the linked list insertion, on every level at once
+            new_node = Node(value, data, top)
+            new_node.next[:] = succs[:top]
+            for level in range(top):
+                preds[level].next[level] = new_node
+            new_node.fully_linked = True
+            self._unlock(locked)
+            with self._state_lock:
+                self._length += 1
+            return new_node
+
+    def delete(self, value: Any) -> Node:
+        """delete the node with the given `value`
+
+        Args:
+            value (Any): value to delete
+
+        Raises:
+            KeyError: raised when not found
+
+        Returns:
+            Node: the unlinked node
+        """
+        preds: List[Node] = [self.root] * self.max_level
+        succs: List[Optional[Node]] = [None] * self.max_level
+        victim: Optional[Node] = None
+        while True:
+            found = self._find(value, preds, succs)
+            if not victim:
+                # only a fully linked node found on its top level can be deleted
+                node = succs[found] if found != -1 else None
+                if not node or node.marked or not node.fully_linked or len(node.next) - 1 != found:
+                    raise KeyError(f"{value} not found")
+                node.lock.acquire()
+                # special case: someone else deleted it first
+                if node.marked:
+                    node.lock.release()
+                    raise KeyError(f"{value} not found")
+                # the delete takes effect here, the unlinking can wait
+                node.marked, victim = True, node
+            # nothing changed between the search and the locks?
+            locked = self._lock(
+                preds, lambda level, pred: not pred.marked and pred.next[level] is victim, len(victim.next)
+            )
+            if locked is None:
+                continue
+            # resembles the linked list deletion, from the top level down
+            for level in range(len(victim.next) - 1, -1, -1):
+                preds[level].next[level] = victim.next[level]
+            victim.lock.release()
+            self._unlock(locked)
+            with self._state_lock:
+                self._length -= 1
+            return victim
+
+    def search(self, value: Any) -> Node:
+        """search for the node cointaining the given `value`, without locks
+
+        Args:
+            value (Any): `value` to look for
+
+        Raises:
+            KeyError: raised when not found
+
+        Returns:
+            Node: node containing the given `value`
+        """
+        node = self.root
+        for level in range(self.level - 1, -1, -1):
+            # go right until we can't
+            next_node = node.next[level]
+            while next_node and next_node.value < value:
+                node, next_node = next_node, next_node.next[level]
+            # special case: found on an upper level, no need to go down
+            if next_node and next_node.value == value:
+                if next_node.fully_linked and not next_node.marked:
+                    return next_node
+                break
+        raise KeyError(f"{value} not found")
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            self.search(value)
+        except KeyError:
+            return False
+        return True
+
+    def range(self, lo: Any = None, hi: Any = None) -> Iterator[Any]:
+        """lazy scan of the values in the half-open range [lo, hi), weakly consistent
+
+        Args:
+            lo (Any, optional): lower bound, included. Defaults to None (unbounded).
+            hi (Any, optional): upper bound, excluded. Defaults to None (unbounded).
+
+        Yields:
+            Iterator[Any]: the values in the range
+        """
+        node = self.root
+        if lo is not None:
+            for level in range(self.level - 1, -1, -1):
+                next_node = node.next[level]
+                while next_node and next_node.value < lo:
+                    node, next_node = next_node, next_node.next[level]
+        node = node.next[0]
+        while node and (hi is None or node.value < hi):
+            if node.fully_linked and not node.marked:
+                yield node.value
+            node = node.next[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.range()
+
+    def __repr__(self):
+        return " -> ".join(f"{value}" for value in self)
+
+    def __len__(self):
+        return self._length
@@ -6,9 +6,12 @@ from datality.double_linked_list import DoubleLinkedList
 class Node:
     """node chainable storage unit"""
 
+    __slots__ = ("value", "next", "prev")
+
     def __init__(self, value: Any = None):
         self.value: Any = value
         self.next: Optional[Node] = None
+        self.prev: Optional[Node] = None
 
 
 class Deque(DoubleLinkedList):
@@ -0,0 +1,405 @@
+from random import Random
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+class Node:
+    """Node basic chainable storage unit"""
+
+    __slots__ = ("value", "priority", "size", "reverse", "left", "right")
+
+    def __init__(self, value: Any = None, priority: float = 0.0):
+        self.value = value
+        self.priority = priority
+        self.size = 1
+        # lazy flag: the children of this subtree are still to be swapped
+        self.reverse = False
+        self.left = None
+        self.right = None
+
+
+class ImplicitTreap:
+    """implementation of the implicit Treap, a list with O(log(n)) edits anywhere
+
+    the nodes are not ordered by their values but by their positions, which are
+    never stored: the position of a node is the size of everything on its left.
+    every operation is a split by position and a join... insert, delete, get,
+    split, concat and reverse any range cost O(log(n)) expected
+
+    the reversals are lazy, a flag on the root of the range that goes down
+    only when someone walks through it
+
+    https://en.wikipedia.org/wiki/Treap#Implicit_treap
+    """
+
+    def __init__(self, values: Iterable[Any] = [], seed: Optional[int] = None):
+        """constructor
+
+        Args:
+            values (Iterable[Any], optional): from list of values. Defaults to [].
+            seed (Optional[int], optional): seed of the priorities, for reproducible shapes.
+            Defaults to None (random).
+        """
+        self._random = Random(seed)
+        self.root: Optional[Node] = self._build(values)
+
+    def _build(self, values: Iterable[Any]) -> Optional[Node]:
+        """build the treap of the given `values`, in order, in O(n)
+
+        the classic cartesian tree construction: the right spine lives in a stack,
+        a new node takes as left child the nodes of the spine with lower priority
+
+        Args:
+            values (Iterable[Any]): the values, in order
+
+        Returns:
+            Optional[Node]: root of the new treap
+        """
+        spine: List[Node] = []
+        last = None
+        for value in values:
+            node = Node(value, self._random.random())
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                # a popped node is never touched again, its size is final
+                last = spine.pop()
+                self.update_size(last)
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        while spine:
+            last = spine.pop()
+            self.update_size(last)
+        return last
+
+    def compute_size(self, node: Optional[Node]) -> int:
+        """size of the subtree rooted at `node`, the null node is empty"""
+        return node.size if node else 0
+
+    def update_size(self, node: Node) -> None:
+        """method to update the size of a node given the sizes of its children"""
+        node.size = self.compute_size(node.left) + self.compute_size(node.right) + 1
+
+    def _push(self, node: Node) -> None:
+        """apply the pending reversal of the `node`, passing it down to its children
+
+        Args:
+            node (Node): node about to be walked through
+        """
+        if node.reverse:
+            node.left, node.right = node.right, node.left
+            for child in (node.left, node.right):
+                if child:
+                    child.reverse = not child.reverse
+            node.reverse = False
+
+    def _split(self, node: Optional[Node], k: int) -> Tuple[Optional[Node], Optional[Node]]:
+        """split the treap rooted at `node` in two: the first `k` values and the rest
+
+        walks down a single path, the nodes on the left hang from the right spine
+        of the first treap, the others from the left spine of the second
+
+        Args:
+            node (Optional[Node]): root of the treap to split
+            k (int): number of values for the first treap
+
+        Returns:
+            Tuple[Optional[Node], Optional[Node]]: roots of both treaps
+        """
+        left_spine, right_spine = [], []
+        while node:
+            self._push(node)
+            left = self.compute_size(node.left)
+            if left < k:
+                # node and its left subtree go first
+                if left_spine:
+                    left_spine[-1].right = node
+                left_spine.append(node)
+                k -= left + 1
+                node = node.right
+            else:
+                if right_spine:
+                    right_spine[-1].left = node
+                right_spine.append(node)
+                node = node.left
+        # close both spines
+        if left_spine:
+            left_spine[-1].right = None
+        if right_spine:
+            right_spine[-1].left = None
+        # the spines changed their descendants, bottom-up
+        for node in reversed(left_spine):
+            self.update_size(node)
+        for node in reversed(right_spine):
+            self.update_size(node)
+        return (left_spine[0] if left_spine else None, right_spine[0] if right_spine else None)
+
+    def _join(self, left: Optional[Node], right: Optional[Node]) -> Optional[Node]:
+        """join two treaps, all the values of `left` go first
+
+        zips the right spine of `left` with the left spine of `right` by priority
+
+        Args:
+            left (Optional[Node]): root of the first treap
+            right (Optional[Node]): root of the second treap
+
+        Returns:
+            Optional[Node]: root of the joined treap
+        """
+        root = parent = None
+        right_side = False
+        path = []
+        while left and right:
+            if left.priority > right.priority:
+                self._push(left)
+                # keeps its left subtree, its right one is still to be zipped
+                node, left, next_side = left, left.right, True
+            else:
+                self._push(right)
+                # keeps its right subtree, its left one is still to be zipped
+                node, right, next_side = right, right.left, False
+            if not parent:
+                root = node
+            elif right_side:
+                parent.right = node
+            else:
+                parent.left = node
+            parent, right_side = node, next_side
+            path.append(node)
+        # whatever remains hangs from the last winner
+        rest = left or right
+        if not parent:
+            return rest
+        if right_side:
+            parent.right = rest
+        else:
+            parent.left = rest
+        # the winners changed their descendants, bottom-up
+        for node in reversed(path):
+            self.update_size(node)
+        return root
+
+    def _index(self, index: int) -> int:
+        """handle negative indexes, and check the range
+
+        Args:
+            index (int): position, negative values count from the end
+
+        Raises:
+            IndexError: raised when the index is out of range
+
+        Returns:
+            int: the position, from the beginning
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"{index} out of range")
+        return index
+
+    def _node(self, index: int) -> Node:
+        """descent to the node at the given position, no restructuring
+
+        Args:
+            index (int): position, already checked
+
+        Returns:
+            Node: the node at the `index` position
+        """
+        node = self.root
+        while True:
+            self._push(node)
+            left = self.compute_size(node.left)
+            if index < left:
+                node = node.left
+            elif index == left:
+                return node
+            else:
+                index -= left + 1
+                node = node.right
+
+    def insert(self, value: Any, index: int) -> None:
+        """inserts the given `value` at the `index` position in O(log(n))
+
+        if the given index is out of range the value is inserted at the tail
+
+        Args:
+            value (Any): value to be inserted
+            index (int): position
+        """
+        # handle negative indexes
+        if index < 0:
+            index += len(self)
+        # sanitize
+        index = max(index, 0)
+        left, right = self._split(self.root, index)
+        node = Node(value, self._random.random())
+        self.root = self._join(self._join(left, node), right)
+
+    def append(self, value: Any) -> None:
+        """inserts the given `value` at the tail in O(log(n))
+
+        Args:
+            value (Any): value to be inserted
+        """
+        self.root = self._join(self.root, Node(value, self._random.random()))
+
+    def extend(self, values: Iterable[Any]) -> None:
+        """inserts all the given `values` at the tail, O(k + log(n))
+
+        Args:
+            values (Iterable[Any]): values to be inserted, in order
+        """
+        self.root = self._join(self.root, self._build(values))
+
+    def pop(self, index: int = -1) -> Any:
+        """deletes the value at the `index` position in O(log(n))
+
+        Args:
+            index (int, optional): position. Defaults to -1 (the tail).
+
+        Raises:
+            IndexError: raised when the index is out of range
+
+        Returns:
+            Any: the deleted value
+        """
+        index = self._index(index)
+        left, right = self._split(self.root, index)
+        node, right = self._split(right, 1)
+        self.root = self._join(left, right)
+        return node.value
+
+    def split(self, index: int) -> "ImplicitTreap":
+        """split the list in O(log(n)), the values from `index` on move out
+
+        Args:
+            index (int): position of the first value moving out
+
+        Returns:
+            ImplicitTreap: a new list with the values from `index` on,
+            this one keeps the previous ones
+        """
+        start, _, _ = slice(index, None).indices(len(self))
+        self.root, right = self._split(self.root, start)
+        other = type(self)()
+        # same generator, the halves keep drawing from the same sequence
+        other._random = self._random
+        other.root = right
+        return other
+
+    def concat(self, other: "ImplicitTreap") -> None:
+        """append all the values of `other` in O(log(n)), `other` is left empty
+
+        concatenating a list with itself appends a copy of its values, like `values += values`
+
+        Args:
+            other (ImplicitTreap): list to append
+        """
+        if other is self:
+            # special case: the nodes cannot be in both halves, copy them, O(n)
+            self.extend(list(self))
+            return
+        self.root = self._join(self.root, other.root)
+        other.root = None
+
+    def reverse(self, start: int = 0, stop: Optional[int] = None) -> None:
+        """reverse the values in the range [start, stop) in O(log(n)), lazily
+
+        Args:
+            start (int, optional): first position, included. Defaults to 0.
+            stop (Optional[int], optional): last position, excluded. Defaults to None (the end).
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if stop - start < 2:
+            return
+        left, right = self._split(self.root, start)
+        middle, right = self._split(right, stop - start)
+        middle.reverse = not middle.reverse
+        self.root = self._join(self._join(left, middle), right)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """gets the value at the given `index`, or a new list with a slice
+
+        Args:
+            index (Union[int, slice]): position, or slice of positions
+
+        Raises:
+            IndexError: raised when the index is out of range
+
+        Returns:
+            Any: the value, or a new ImplicitTreap with the values of the slice
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return type(self)(list(self)[index])
+            return type(self)(self.range(start, stop))
+        return self._node(self._index(index)).value
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        self._node(self._index(index)).value = value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if not isinstance(index, slice):
+            self.pop(index)
+            return
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            # every position apart, from the end so the others do not move
+            for position in sorted(range(start, stop, step), reverse=True):
+                self.pop(position)
+            return
+        if start < stop:
+            # cut the middle out
+            left, right = self._split(self.root, start)
+            _, right = self._split(right, stop - start)
+            self.root = self._join(left, right)
+
+    def range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Any]:
+        """lazy scan of the values in the positions [start, stop)
+
+        Args:
+            start (int, optional): first position, included. Defaults to 0.
+            stop (Optional[int], optional): last position, excluded. Defaults to None (the end).
+
+        Yields:
+            Iterator[Any]: the values in the range
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        count = stop - start
+        # descend to the first position, the ancestors on our right go to the stack
+        stack: List[Node] = []
+        node = self.root
+        while node and count > 0:
+            self._push(node)
+            left = self.compute_size(node.left)
+            if start < left:
+                stack.append(node)
+                node = node.left
+            elif start == left:
+                stack.append(node)
+                break
+            else:
+                start -= left + 1
+                node = node.right
+        while stack and count > 0:
+            node = stack.pop()
+            yield node.value
+            count -= 1
+            # go all the way left in the right subtree
+            node = node.right
+            while node:
+                self._push(node)
+                stack.append(node)
+                node = node.left
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.range()
+
+    def __repr__(self):
+        return " -> ".join(f"{value}" for value in self)
+
+    def __len__(self):
+        return self.compute_size(self.root)
@@ -4,6 +4,8 @@ from typing import Any, Iterable, Optional
 class Node:
     """node chainable storage unit"""
 
+    __slots__ = ("value", "next")
+
     def __init__(self, value: Any = None):
         self.value: Any = value
         self.next: Optional[Node] = None
@@ -0,0 +1,164 @@
+from typing import Any, Optional, Tuple
+
+from datality.bst import BST, Node
+
+
+class OrderStatisticBST(BST):
+    """binary search tree augmented with the size of every subtree
+
+    the nodes of the subclasses carry a `size` field, kept up to date through
+    insertions, deletions and rotations, which gives order statistics in O(log(n))
+
+    https://en.wikipedia.org/wiki/Order_statistic_tree
+    """
+
+    def compute_size(self, node: Optional[Node]) -> int:
+        """size of the subtree rooted at `node`, the null node is empty
+
+        Args:
+            node (Optional[Node]): root of the subtree
+
+        Returns:
+            int: number of nodes in the subtree
+        """
+        return node.size if node else 0
+
+    def update_size(self, node: Node) -> None:
+        """method to update the size of a node given the sizes of its children
+
+        Args:
+            node (Node): node to update the size
+        """
+        node.size = self.compute_size(node.left) + self.compute_size(node.right) + 1
+
+    def rotate_right(self, node: Node) -> None:
+        """right rotation, relinks the pointers and updates the sizes
+
+        Args:
+            node (Node): pivot of the rotation
+        """
+        super().rotate_right(node)
+        # the pivot is now the right child
+        self.update_size(node)
+        self.update_size(node.parent)
+
+    def rotate_left(self, node: Node) -> None:
+        """left rotation, relinks the pointers and updates the sizes
+
+        Args:
+            node (Node): pivot of the rotation
+        """
+        super().rotate_left(node)
+        # the pivot is now the left child
+        self.update_size(node)
+        self.update_size(node.parent)
+
+    def _bulk_fixup(self, node: Node, depth: int, height: int) -> None:
+        """the sizes are computed bottom-up while building"""
+        self.update_size(node)
+
+    def _insert_fixup(self, node: Node) -> None:
+        """every ancestor of the new node has one more descendant
+
+        Args:
+            node (Node): the new node
+        """
+        node = node.parent
+        while node:
+            node.size += 1
+            node = node.parent
+
+    def _rotate_to_leaf(self, node: Node) -> None:
+        """rotate the `node` down until it becomes a leaf, then unlink it
+
+        Args:
+            node (Node): node to be removed
+        """
+        super()._rotate_to_leaf(node)
+        # every ancestor of the removed leaf has one less descendant
+        node = node.parent
+        while node:
+            node.size -= 1
+            node = node.parent
+
+    def _splice(self, node: Node) -> Tuple[Optional[Node], Optional[Node], Node]:
+        """unlink the `node`, see `BST._splice`, and update the sizes
+
+        Args:
+            node (Node): node to be removed
+
+        Returns:
+            Tuple[Optional[Node], Optional[Node], Node]: the child, its parent, and the moved node
+        """
+        child, parent, moved = super()._splice(node)
+        # the successor takes the place, and the size, of the node
+        moved.size = node.size
+        # every ancestor of the unlinked position has one less descendant
+        ancestor = parent
+        while ancestor:
+            ancestor.size -= 1
+            ancestor = ancestor.parent
+        return (child, parent, moved)
+
+    def rank(self, value: Any) -> int:
+        """number of values in the tree strictly smaller than the given `value`
+
+        the `value` does not need to be in the tree
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            int: the rank of the `value`, its index in sorted order
+        """
+        res, node = 0, self.root
+        while node:
+            if value <= node.value:
+                node = node.left
+            else:
+                # everything on the left, and the node itself, is smaller
+                res += self.compute_size(node.left) + 1
+                node = node.right
+        return res
+
+    def select(self, k: int) -> Node:
+        """get the k-th smallest node, indexed from 0 as a list
+
+        Args:
+            k (int): position in sorted order, negative values count from the end
+
+        Raises:
+            IndexError: raised when `k` is out of range
+
+        Returns:
+            Node: node containing the k-th smallest value
+        """
+        # handle negative indexes
+        if k < 0:
+            k += self._length
+        if not 0 <= k < self._length:
+            raise IndexError(f"{k} out of range")
+        node = self.root
+        while True:
+            left = self.compute_size(node.left)
+            if k < left:
+                node = node.left
+            elif k == left:
+                return node
+            else:
+                k -= left + 1
+                node = node.right
+
+    def count_range(self, lo: Any, hi: Any) -> int:
+        """number of values in the half-open range [lo, hi)
+
+        Args:
+            lo (Any): lower bound, included
+            hi (Any): upper bound, excluded
+
+        Returns:
+            int: how many values fall in the range
+        """
+        if not lo < hi:
+            return 0
+        return self.rank(hi) - self.rank(lo)
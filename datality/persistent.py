@@ -0,0 +1,474 @@
+from copy import copy
+from random import Random
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from datality.sorted_map import SortedMap
+
+
+class Node:
+    """node immutable storage unit, shared between versions... never modify it"""
+
+    __slots__ = ("value", "data", "left", "right")
+
+    def __init__(
+        self, value: Any = None, data: Any = None, left: Optional["Node"] = None, right: Optional["Node"] = None
+    ):
+        self.value = value
+        self.data = data
+        self.left = left
+        self.right = right
+
+
+class AVLNode(Node):
+    """persistent avl nodes carry their own weight"""
+
+    __slots__ = ("weight",)
+
+
+class TreapNode(Node):
+    """persistent treap nodes carry their own priority"""
+
+    __slots__ = ("priority",)
+
+
+class PersistentBST(SortedMap):
+    """persistent binary search tree, by path copying
+
+    the nodes are never modified: an update copies the path from the root
+    to the changed node, O(log(n)) new nodes, the rest is shared with the
+    previous version... so a snapshot is just the current root, O(1),
+    and it remains valid and consistent whatever happens later
+
+    the tree itself is a handle to the latest version, `snapshot` gives
+    an independent handle to the current one
+
+    on its own it is a plain, unbalanced bst: the subclasses keep it balanced
+    by overriding the hooks `_new_node`, `_copy` and `_unlink`
+
+    https://en.wikipedia.org/wiki/Persistent_data_structure#Path_copying
+    """
+
+    def __init__(self, values: Iterable[Any] = []):
+        self.root: Optional[Node] = None
+        self._length: int = 0
+        for value in values:
+            self.insert(value)
+
+    def snapshot(self) -> "PersistentBST":
+        """freeze the current version in O(1)
+
+        Returns:
+            PersistentBST: a new handle to the current version,
+            the updates on any of both handles do not affect the other
+        """
+        return copy(self)
+
+    def _new_node(self, value: Any, data: Any = None) -> Node:
+        """factory of the leaves, each subclass builds its own kind of node
+
+        Args:
+            value (Any): value of the new node
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: brand new node
+        """
+        return Node(value, data)
+
+    def _copy(self, node: Node, left: Optional[Node], right: Optional[Node], data: Any) -> Node:
+        """copy of the `node` with new children and data, the subclasses keep their invariants
+
+        Args:
+            node (Node): original node, not modified
+            left (Optional[Node]): left child of the copy
+            right (Optional[Node]): right child of the copy
+            data (Any): payload of the copy
+
+        Returns:
+            Node: root of the new subtree
+        """
+        return Node(node.value, data, left, right)
+
+    def _unlink(self, node: Node) -> Optional[Node]:
+        """new subtree with the children of `node`, but without `node`
+
+        the successor takes the place of the node, copying the path to it
+
+        Args:
+            node (Node): node to remove, not modified
+
+        Returns:
+            Optional[Node]: root of the new subtree
+        """
+        if not node.left or not node.right:
+            return node.left or node.right
+        # detach the min of the right subtree
+        path = []
+        successor = node.right
+        while successor.left:
+            path.append((successor, True))
+            successor = successor.left
+        right = self._rebuild(path, successor.right)
+        return self._copy(successor, node.left, right, successor.data)
+
+    def _path(self, value: Any) -> Tuple[List[Tuple[Node, bool]], Optional[Node]]:
+        """iterative descent looking for the `value`, remembering the way
+
+        Args:
+            value (Any): value to look for
+
+        Returns:
+            Tuple[List[Tuple[Node, bool]], Optional[Node]]: the visited nodes, each with
+            if we went left from it, and the node containing the `value` (None if not found)
+        """
+        path = []
+        node = self.root
+        while node and node.value != value:
+            went_left = value < node.value
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        return (path, node)
+
+    def _rebuild(self, path: List[Tuple[Node, bool]], node: Optional[Node]) -> Optional[Node]:
+        """copy the `path` bottom-up, with `node` as the new bottom
+
+        Args:
+            path (List[Tuple[Node, bool]]): the path from the root, see `_path`
+            node (Optional[Node]): the new subtree at the end of the path
+
+        Returns:
+            Optional[Node]: the new root
+        """
+        for parent, went_left in reversed(path):
+            if went_left:
+                node = self._copy(parent, node, parent.right, parent.data)
+            else:
+                node = self._copy(parent, parent.left, node, parent.data)
+        return node
+
+    def search(self, value: Any) -> Node:
+        """searches the node with the given `value`
+
+        Args:
+            value (Any): value to look for
+
+        Raises:
+            KeyError: raised when the value is not found
+
+        Returns:
+            Node: node containing the given `value`, read only
+        """
+        node = self.root
+        while node:
+            if value == node.value:
+                return node
+            node = node.left if value < node.value else node.right
+        raise KeyError(f"{value} not found")
+
+    def __contains__(self, value: Any) -> bool:
+        node = self.root
+        while node:
+            if value == node.value:
+                return True
+            node = node.left if value < node.value else node.right
+        return False
+
+    def insert(self, value: Any, data: Any = None) -> Node:
+        """inserts a new node with the given `value`, copying its path
+
+        Args:
+            value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: the node containing the `value`, the existing one is left untouched
+        """
+        path, node = self._path(value)
+        if node:
+            # value already in the tree, do nothing
+            return node
+        node = self._new_node(value, data)
+        self.root = self._rebuild(path, node)
+        # update length
+        self._length += 1
+        return node
+
+    def __setitem__(self, key: Any, data: Any) -> None:
+        path, node = self._path(key)
+        if not node:
+            self.insert(key, data)
+            return
+        # the node is shared, copy it with the new data
+        self.root = self._rebuild(path, self._copy(node, node.left, node.right, data))
+
+    def delete(self, value: Any) -> Node:
+        """deletes the node containing the given `value`, copying its path
+
+        Args:
+            value (Any): value of the node to look for
+
+        Raises:
+            KeyError: raised when the value is not found
+
+        Returns:
+            Node: the removed node, still alive in the older versions
+        """
+        path, node = self._path(value)
+        if not node:
+            raise KeyError(f"{value} not found")
+        self.root = self._rebuild(path, self._unlink(node))
+        # update length
+        self._length -= 1
+        return node
+
+    def range(self, lo: Any = None, hi: Any = None, reverse: bool = False) -> Iterator[Any]:
+        """lazy in-order scan of the values in the half-open range [lo, hi)
+
+        no parent pointers here, the way back is a stack, O(log(n)) memory...
+        the scan is over the version of the moment it started, updates do not affect it
+
+        Args:
+            lo (Any, optional): lower bound, included. Defaults to None (unbounded).
+            hi (Any, optional): upper bound, excluded. Defaults to None (unbounded).
+            reverse (bool, optional): from `hi` down to `lo`. Defaults to False.
+
+        Yields:
+            Iterator[Any]: the values in the range
+        """
+        stack: List[Node] = []
+        node = self.root
+        if not reverse:
+            # the ancestors on our left are out of the range
+            while node:
+                if lo is not None and node.value < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            while stack:
+                node = stack.pop()
+                if hi is not None and not node.value < hi:
+                    return
+                yield node.value
+                node = node.right
+                while node:
+                    stack.append(node)
+                    node = node.left
+        else:
+            while node:
+                if hi is None or node.value < hi:
+                    stack.append(node)
+                    node = node.right
+                else:
+                    node = node.left
+            while stack:
+                node = stack.pop()
+                if lo is not None and node.value < lo:
+                    return
+                yield node.value
+                node = node.left
+                while node:
+                    stack.append(node)
+                    node = node.right
+
+    def __repr__(self):
+        res = []
+        # modified in-order traversal (right first), iterative
+        stack, node, level = [], self.root, 0
+        while stack or node:
+            # go all the way right
+            while node:
+                stack.append((node, level))
+                node, level = node.right, level + 1
+            node, level = stack.pop()
+            res.append("\t" * level + f"-->({node.value})")
+            node, level = node.left, level + 1
+        return "\n".join(res)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.range()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.range(reverse=True)
+
+    def __len__(self):
+        return self._length
+
+
+class PersistentAVL(PersistentBST):
+    """persistent AVL, the rebalancing rotations happen while copying the path
+
+    https://en.wikipedia.org/wiki/AVL_tree
+    """
+
+    def compute_weight(self, node: Optional[Node]) -> int:
+        """weight of a node, the null node is 0"""
+        return node.weight if node else 0
+
+    def _make(self, value: Any, data: Any, left: Optional[Node], right: Optional[Node]) -> AVLNode:
+        """brand new node, its weight given the weights of its children"""
+        node = AVLNode(value, data, left, right)
+        node.weight = max(self.compute_weight(left), self.compute_weight(right)) + 1
+        return node
+
+    def _new_node(self, value: Any, data: Any = None) -> AVLNode:
+        return self._make(value, data, None, None)
+
+    def _copy(self, node: Node, left: Optional[Node], right: Optional[Node], data: Any) -> AVLNode:
+        """copy the node, rebalancing if its new children violate the balance factor
+
+        the rotations build new nodes, the original ones may be shared
+        """
+        balance_factor = self.compute_weight(right) - self.compute_weight(left)
+        if balance_factor < -1:
+            # rotate right
+            if self.compute_weight(left.right) > self.compute_weight(left.left):
+                # left - right
+                pivot = left.right
+                return self._make(
+                    pivot.value,
+                    pivot.data,
+                    self._make(left.value, left.data, left.left, pivot.left),
+                    self._make(node.value, data, pivot.right, right),
+                )
+            return self._make(left.value, left.data, left.left, self._make(node.value, data, left.right, right))
+        if balance_factor > 1:
+            # rotate left
+            if self.compute_weight(right.left) > self.compute_weight(right.right):
+                # right - left
+                pivot = right.left
+                return self._make(
+                    pivot.value,
+                    pivot.data,
+                    self._make(node.value, data, left, pivot.left),
+                    self._make(right.value, right.data, pivot.right, right.right),
+                )
+            return self._make(right.value, right.data, self._make(node.value, data, left, right.left), right.right)
+        return self._make(node.value, data, left, right)
+
+    def insert(self, value: Any, data: Any = None) -> Node:
+        """inserts a new node with the given `value`, copying and rebalancing its path
+
+        Args:
+            value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: the node containing the `value` in the new version, the existing one is left untouched
+        """
+        length = len(self)
+        node = super().insert(value, data)
+        if len(self) == length:
+            return node
+        # the rotations may have copied the new leaf, look for it in this version
+        return self.search(value)
+
+
+class PersistentTreap(PersistentBST):
+    """persistent Treap, split and join copy only the nodes on their paths
+
+    https://en.wikipedia.org/wiki/Treap
+    """
+
+    def __init__(self, values: Iterable[Any] = [], seed: Optional[int] = None):
+        """constructor
+
+        Args:
+            values (Iterable[Any], optional): from list of values. Defaults to [].
+            seed (Optional[int], optional): seed of the priorities, for reproducible shapes.
+            Defaults to None (random).
+        """
+        # own generator, shared by the snapshots
+        self._random = Random(seed)
+        super().__init__(values)
+
+    def _new_node(self, value: Any, data: Any = None) -> TreapNode:
+        node = TreapNode(value, data)
+        node.priority = self._random.random()
+        return node
+
+    def _copy(self, node: Node, left: Optional[Node], right: Optional[Node], data: Any) -> TreapNode:
+        """same priority, the heap invariance holds"""
+        res = TreapNode(node.value, data, left, right)
+        res.priority = node.priority
+        return res
+
+    def _split(self, node: Optional[Node], value: Any) -> Tuple[Optional[Node], Optional[Node]]:
+        """split the subtree of `node` by a `value` not in it, copying the nodes on the way
+
+        Args:
+            node (Optional[Node]): root of the subtree
+            value (Any): must be comparable
+
+        Returns:
+            Tuple[Optional[Node], Optional[Node]]: the smaller and greater subtrees
+        """
+        smaller, greater = [], []
+        while node:
+            if node.value < value:
+                # node and its left subtree are smaller
+                smaller.append(node)
+                node = node.right
+            else:
+                greater.append(node)
+                node = node.left
+        # the smaller nodes chain on the right, the greater ones on the left
+        left = right = None
+        for node in reversed(smaller):
+            left = self._copy(node, node.left, left, node.data)
+        for node in reversed(greater):
+            right = self._copy(node, right, node.right, node.data)
+        return (left, right)
+
+    def _unlink(self, node: Node) -> Optional[Node]:
+        """join the children of the node, zipping their spines by priority"""
+        left, right = node.left, node.right
+        picks = []
+        while left and right:
+            if left.priority > right.priority:
+                # keeps its left subtree, its right one is still to be zipped
+                picks.append((left, True))
+                left = left.right
+            else:
+                # keeps its right subtree, its left one is still to be zipped
+                picks.append((right, False))
+                right = right.left
+        res = left or right
+        for pick, from_left in reversed(picks):
+            if from_left:
+                res = self._copy(pick, pick.left, res, pick.data)
+            else:
+                res = self._copy(pick, res, pick.right, pick.data)
+        return res
+
+    def insert(self, value: Any, data: Any = None) -> Node:
+        """inserts a new node with the given `value`
+
+        the new node goes down only while its priority is the lowest,
+        there the subtree is split by the `value` to become its children
+
+        Args:
+            value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: the node containing the `value`, the existing one is left untouched
+        """
+        node = self.root
+        while node and node.value != value:
+            node = node.left if value < node.value else node.right
+        if node:
+            # value already in the tree, do nothing
+            return node
+        new_node = self._new_node(value, data)
+        path = []
+        node = self.root
+        while node and node.priority > new_node.priority:
+            went_left = value < node.value
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        new_node.left, new_node.right = self._split(node, value)
+        self.root = self._rebuild(path, new_node)
+        # update length
+        self._length += 1
+        return new_node
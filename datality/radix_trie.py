@@ -4,6 +4,8 @@ from typing import Any, Dict, Iterable
 class Node:
     """node chainable storage unit"""
 
+    __slots__ = ("value", "children")
+
     def __init__(self, value: Any = None):
         self.value: Any = value
         self.children: Dict[Any, Any] = {}
@@ -1,19 +1,24 @@
 from typing import Any, Iterable, Optional
 
-from datality.bst import BST
+from datality.order_statistic import OrderStatisticBST
 
 
 class Node:
     """node basic chainable storage unit"""
 
-    def __init__(self, value: Any = None, color: str = "r"):
+    __slots__ = ("value", "data", "color", "size", "left", "right", "parent")
+
+    def __init__(self, value: Any = None, color: str = "r", data: Any = None):
         self.value = value
+        self.data = data
         self.color = color
+        self.size: int = 1
         self.left: Optional[Node] = None
         self.right: Optional[Node] = None
+        self.parent: Optional[Node] = None
 
 
-class RBTree(BST):
+class RBTree(OrderStatisticBST):
     """implementation of the red and black trees from Rudolf Bayer
 
     https://en.wikipedia.org/wiki/Red%E2%80%93black_tree
@@ -25,111 +30,174 @@ class RBTree(BST):
         for value in values:
             self.insert(value)
 
-    def insert(self, value: Any) -> None:
-        """insert a new node with the given `value` into the tree
+    def _new_node(self, value: Any, data: Any = None) -> Node:
+        """new nodes are always red"""
+        return Node(value, data=data)
+
+    def _bulk_fixup(self, node: Node, depth: int, height: int) -> None:
+        """every level is black except the deepest one, the only one that can be incomplete"""
+        super()._bulk_fixup(node, depth, height)
+        node.color = "r" if 0 < depth == height - 1 else "b"
+
+    def _insert_fixup(self, node: Node) -> None:
+        """repair violations to rb_tree's invariants bottom-up... 4 special cases
+
+        iterative, stops as soon as the invariants hold, and the missing uncles
+        are just null leaves: black, nothing is allocated
 
         Args:
-            value (Any): must be comparable
+            node (Node): the new node
         """
-        # special case: empty tree
-        if not self.root:
-            self.root = Node(value, color="b")
-            # update length
-            self._length += 1
-            return
-
-        def r(node: Node, parent: Node):
-            """modified bst insertion"""
-            if value == node.value:
-                # already in the tree? do nothing
-                self._length -= 1
-                return
-            if value < node.value:
-                if node.left:
-                    r(node.left, node)
-                else:
-                    node.left = Node(value)
-            else:
-                if node.right:
-                    r(node.right, node)
-                else:
-                    node.right = Node(value)
-            # repair violations to rb_tree's invariants... 4 special cases
-            # special case 1: just make sure root remains black...
-            if not parent:
-                node.color = "b"
-                return
-            # special case 2: no further violations...
-            elif node.color == "b":
-                return
-            # special case 3: uncle is red -> recolor
-            elif self.brother(node, parent).color == "r":
-                parent.color = "r"
-                node.color = self.brother(node, parent).color = "b"
-                return
-            # special case 4: uncle is black -> rotate
+        # one more descendant for every ancestor
+        super()._insert_fixup(node)
+        parent = node.parent
+        # special case 2: black parent, no further violations...
+        while parent and parent.color == "r":
+            grandparent = parent.parent
+            # a red root... just paint it black below
+            if not grandparent:
+                break
+            if grandparent.left is parent:
+                uncle = grandparent.right
+                # special case 3: uncle is red -> recolor, and keep going up
+                if uncle and uncle.color == "r":
+                    parent.color = uncle.color = "b"
+                    grandparent.color = "r"
+                    node, parent = grandparent, grandparent.parent
+                    continue
+                # special case 4: uncle is black -> rotate
+                if node is parent.right:
+                    # left -> right
+                    self.rotate_left(parent)
+                    parent = node
+                self.rotate_right(grandparent)
             else:
-                if parent.left == node:
-                    # rotate right
-                    if value > node.value:
-                        # left -> right
-                        self.rotate_left(node)
+                uncle = grandparent.left
+                # special case 3: uncle is red -> recolor, and keep going up
+                if uncle and uncle.color == "r":
+                    parent.color = uncle.color = "b"
+                    grandparent.color = "r"
+                    node, parent = grandparent, grandparent.parent
+                    continue
+                # special case 4: uncle is black -> rotate
+                if node is parent.left:
+                    # right -> left
                     self.rotate_right(parent)
+                    parent = node
+                self.rotate_left(grandparent)
+            # switch colors parent <-> grandparent
+            parent.color, grandparent.color = "b", "r"
+            break
+        # special case 1: just make sure root remains black...
+        self.root.color = "b"
 
-                else:
-                    # rotate left
-                    if value < node.value:
-                        # right -> left
-                        self.rotate_right(node)
-                    self.rotate_left(parent)
-                # switch colors parent <-> brother
-                bro = self.brother(node, parent)
-                parent.color, bro.color = bro.color, parent.color
-
-        r(self.root, None)
-        # update length
-        self._length += 1
-
-    def brother(self, node: Node, parent: Node) -> Node:
-        """aux funtion to fetch my brother
+    def is_black(self, node: Optional[Node]) -> bool:
+        """the null leaves are black
 
         Args:
-            node (Node): current node
-            parent (Node): parent of the current node
+            node (Optional[Node]): node to check
 
         Returns:
-            Node: the brother
+            bool: if the node is black
         """
-        # special case: root
-        if not parent:
-            return Node(color="b")
-        bro = parent.left if parent.right == node else parent.right
-        return bro or Node(color="b")
+        return not node or node.color == "b"
+
+    def delete(self, value: Any) -> Node:
+        """deletes the node with the given `value`, O(log(n)) with at most 3 rotations
 
-    def rotate_right(self, node: Node) -> None:
-        """right rotation, on a given `node`
+        the node is spliced out, a node with 2 children is replaced by its successor
+        (see `_splice`)... if a black node left its place, the missing black is pushed
+        up by recoloring until it can be absorbed with rotations
 
-        https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
+        https://en.wikipedia.org/wiki/Red%E2%80%93black_tree#Removal
 
         Args:
-            node (Node): pivot of the rotation
+            value (Any): value of the node to delete
+
+        Raises:
+            KeyError: raised when the value is not found
+
+        Returns:
+            Node: the unlinked node
         """
-        _ = Node(node.value)
-        _.left, _.right = node.left.right, node.right
-        # rotate...
-        node.value = node.left.value
-        node.left, node.right = node.left.left, _
+        node = self._fetch(value)
+        child, parent, moved = self._splice(node)
+        # the color that left is the one of the unlinked position
+        removed_color = moved.color
+        moved.color = node.color
+        # a black node left, the paths through `child` are missing one black
+        if removed_color == "b":
+            self._delete_fixup(child, parent)
+        node.left = node.right = node.parent = None
+        # update length
+        self._length -= 1
+        return node
 
-    def rotate_left(self, node):
-        """left rotation, on a given `node`
+    def _delete_fixup(self, node: Optional[Node], parent: Optional[Node]) -> None:
+        """repair the missing black on the paths through `node`, bottom-up... 4 special cases
 
-        https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
+        Args:
+            node (Optional[Node]): the node carrying the extra black, can be a null leaf
+            parent (Optional[Node]): parent of the `node`
+        """
+        while node is not self.root and self.is_black(node):
+            # the brother can't be a null leaf, its side has one more black
+            if node is parent.left:
+                bro = parent.right
+                # special case 1: red brother -> rotate, the new brother is black
+                if bro.color == "r":
+                    bro.color, parent.color = "b", "r"
+                    self.rotate_left(parent)
+                    bro = parent.right
+                # special case 2: black nephews -> recolor, and keep going up
+                if self.is_black(bro.left) and self.is_black(bro.right):
+                    bro.color = "r"
+                    node, parent = parent, parent.parent
+                    continue
+                # special case 3: only the inner nephew is red -> rotate it outside
+                if self.is_black(bro.right):
+                    bro.left.color, bro.color = "b", "r"
+                    self.rotate_right(bro)
+                    bro = parent.right
+                # special case 4: red outer nephew -> rotate, done
+                bro.color, parent.color, bro.right.color = parent.color, "b", "b"
+                self.rotate_left(parent)
+            else:
+                bro = parent.left
+                # special case 1: red brother -> rotate, the new brother is black
+                if bro.color == "r":
+                    bro.color, parent.color = "b", "r"
+                    self.rotate_right(parent)
+                    bro = parent.left
+                # special case 2: black nephews -> recolor, and keep going up
+                if self.is_black(bro.left) and self.is_black(bro.right):
+                    bro.color = "r"
+                    node, parent = parent, parent.parent
+                    continue
+                # special case 3: only the inner nephew is red -> rotate it outside
+                if self.is_black(bro.left):
+                    bro.right.color, bro.color = "b", "r"
+                    self.rotate_left(bro)
+                    bro = parent.left
+                # special case 4: red outer nephew -> rotate, done
+                bro.color, parent.color, bro.left.color = parent.color, "b", "b"
+                self.rotate_right(parent)
+            break
+        # a red node absorbs the extra black
+        if node:
+            node.color = "b"
+
+    def brother(self, node: Optional[Node], parent: Optional[Node]) -> Optional[Node]:
+        """aux funtion to fetch my brother
 
         Args:
-            node (Node): pivot of the rotation
+            node (Optional[Node]): current node
+            parent (Optional[Node]): parent of the current node
+
+        Returns:
+            Optional[Node]: the brother, None is a null leaf (black)
         """
-        _ = Node(node.value)
-        _.left, _.right = node.left, node.right.left
-        # rotate...
-        node.value = node.right.value
-        node.left, node.right = _, node.right.right
+        # special case: root
+        if not parent:
+            return None
+        return parent.left if parent.right is node else parent.right
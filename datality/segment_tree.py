@@ -4,6 +4,8 @@ from typing import List, Optional
 class Node:
     """node chainable storage unit"""
 
+    __slots__ = ("min", "max", "sum", "left", "right")
+
     def __init__(self, value: Optional[float] = None):
         self.min = self.max = self.sum = value
         self.left: Optional[Node] = None
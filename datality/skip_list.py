@@ -1,87 +1,262 @@
-from random import uniform
-from typing import Any, Iterable
+from math import ceil, log
+from random import Random
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sized
+
+from datality.sorted_map import SortedMap, _missing
 
 
 class Node:
-    """Node basic chainable storage unit"""
+    """Node basic chainable storage unit
+
+    a single node per value, with a forward pointer for each level it is in
+    """
+
+    __slots__ = ("value", "data", "next")
 
-    def __init__(self, value: Any = None):
+    def __init__(self, value: Any = None, data: Any = None, level: int = 1):
         self.value = value
-        self.next = None
-        self.down = None
+        self.data = data
+        # next[i] is the following node on the level i, the bottom one is 0
+        self.next: List[Optional["Node"]] = [None] * level
 
 
-class SkipList:
+class SkipList(SortedMap):
     """implementation of the skip list
 
     this is my second favorite data structure :D
 
+    the classic layout: one node per value holding an array of forward pointers,
+    a value promoted k times is still a single node with k + 1 links
+
+    the values are keys too: `skip_list[key] = data` keeps the data
+    in the node of the key
+
     https://en.wikipedia.org/wiki/Skip_list
     https://www.youtube.com/watch?v=2g9OSRKJuzM
     """
 
-    def __init__(self, values: Iterable[Any] = [], probability: float = 0.5):
+    def __init__(
+        self,
+        values: Iterable[Any] = [],
+        probability: float = 0.5,
+        seed: Optional[int] = None,
+        max_level: Optional[int] = None,
+    ):
         """constructor
 
         Args:
             values (Iterable[Any], optional): from list of values. Defaults to [].
             probability (float, optional): promotions probability. Defaults to .5.
+            seed (Optional[int], optional): seed of the coin flips, for reproducible levels.
+            Defaults to None (random).
+            max_level (Optional[int], optional): cap of the levels. Defaults to None
+            (derived from the size of `values`, see `_max_level`).
         """
-        self.root = Node(-float("inf"))
         self.probability: float = probability
+        if max_level is None:
+            max_level = self._max_level(len(values) if isinstance(values, Sized) else 0)
+        self.max_level: int = max_level
+        # the head (-inf) has every level from the start
+        self.root = self._new_node(-float("inf"), level=max_level)
+        # levels in use
+        self.level: int = 1
+        # last node before the value on every level, reused by insert and delete
+        self._update: List[Node] = [self.root] * max_level
+        # own generator, the global one is shared and slower to reach
+        self._random = Random(seed)
         self._length: int = 0
         for value in values:
             self.insert(value)
 
-    def insert(self, value: Any) -> None:
-        """insert a new node in the skip list
+    def _max_level(self, expected: int) -> int:
+        """levels needed for the expected number of values: log(n) in base 1/probability
 
-        in this implementation the promotions occurs with probability = .5
+        never less than the levels of 2^16 values, so small lists can still grow
+
+        Args:
+            expected (int): expected number of values
+
+        Returns:
+            int: cap of the levels
+        """
+        if not 0 < self.probability < 1:
+            return 1
+        return max(1, ceil(log(max(expected, 2 ** 16)) / log(1 / self.probability)))
+
+    def _promotions(self) -> int:
+        """flip coins until one is lost, all at once
+
+        with probability .5, every bit of a single random word is a coin flip,
+        the trailing ones are the flips won. otherwise, a single draw of the
+        geometric distribution: P(promotions >= k) = probability^k
+
+        Returns:
+            int: how many levels the new node is promoted
+        """
+        if self.probability == 0.5:
+            word = self._random.getrandbits(32)
+            # isolate the lowest zero, its position is the number of trailing ones
+            return (~word & (word + 1)).bit_length() - 1
+        if self.probability <= 0:
+            return 0
+        return int(log(1 - self._random.random()) / log(self.probability))
+
+    def _new_node(self, value: Any, data: Any = None, level: int = 1) -> Node:
+        """create a new node, the subclasses with richer nodes override it
+
+        Args:
+            value (Any): value of the node
+            data (Any, optional): payload of the node. Defaults to None.
+            level (int, optional): number of levels of the node. Defaults to 1.
+
+        Returns:
+            Node: the new node
+        """
+        return Node(value, data, level)
+
+    def _descend(self, value: Any) -> Node:
+        """skip search of the last node before the `value`, filling the update vector
 
         Args:
             value (Any): must be comparable
+
+        Returns:
+            Node: last node of the bottom level whose value is strictly smaller than `value`
         """
-        # reach the right level for the insertion
-        node, node_stack = self.root, []
-        while node.down:
+        update, node = self._update, self.root
+        for level in range(self.level - 1, -1, -1):
             # go right until we can't
-            while node.next and node.next.value < value:
-                node = node.next
-            # go down... keep track of the jumps we'll do backtracking
-            node_stack.append(node)
-            node = node.down
-        # this part resembles the search in a normal link list
-        while node.next and node.next.value <= value:
-            node = node.next
+            next_node = node.next[level]
+            while next_node and next_node.value < value:
+                node, next_node = next_node, next_node.next[level]
+            # go down... keep track of the jumps, they are the ones to relink
+            update[level] = node
+        return node
+
+    def insert(self, value: Any, data: Any = None) -> Node:
+        """insert a new node in the skip list
+
+        the promotions occur with the given probability, see `_promotions`,
+        up to `max_level` levels
+
+        Args:
+            value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: the node containing the `value`, the existing one is left untouched
+        """
+        node = self._descend(value).next[0]
         # special case: no repetitions allowed... do nothing
-        if node.value == value:
-            return
-        # resembles the linked list insertion...
-        _ = node.next
-        new_node = Node(value)
-        node.next = new_node
-        new_node.next = _
+        if node and node.value == value:
+            return node
+        # promote? flip the coins
+        new_node = self._new_node(value, data, min(self._promotions() + 1, self.max_level))
+        self._link(new_node)
         # update length
         self._length += 1
-        # promote? flip a coin
-        while uniform(0, 1) < self.probability:
-            if node_stack:
-                node = node_stack.pop()
-                # resembles linked list insertion, but one level up
-                _, node.next = node.next, Node(value)
-                # add the links to the new_node downwards
-                node.next.next, node.next.down = _, new_node
-                # in case we flip a coins again, update new node
-                new_node = node.next
+        return new_node
+
+    def _link(self, node: Node) -> None:
+        """link the new `node` right after the update vector, on every level of it
+
+        Args:
+            node (Node): the new node
+        """
+        level, update = len(node.next), self._update
+        # special case: new levels, they start at the head
+        if level > self.level:
+            for i in range(self.level, level):
+                update[i] = self.root
+            self.level = level
+        # resembles the linked list insertion, on every level at once
+        forward = node.next
+        for i in range(level):
+            links = update[i].next
+            forward[i], links[i] = links[i], node
+            # the new node is the last one before any greater value
+            update[i] = node
+
+    def _unlink(self, node: Node) -> None:
+        """unlink the `node` right after the update vector, from every level of it
+
+        Args:
+            node (Node): the node to remove
+        """
+        # resembles the linked list deletion, on every level of the node
+        update = self._update
+        for i, next_node in enumerate(node.next):
+            update[i].next[i] = next_node
+        # drop the empty levels on top
+        while self.level > 1 and not self.root.next[self.level - 1]:
+            self.level -= 1
+
+    def _finger(self, value: Any) -> Node:
+        """move the update vector forward to the `value`, from a smaller one
+
+        climbs only to the lowest level whose next link is past the value, then goes
+        right and down from there: finger search, O(log(d)) expected, d the distance
+
+        Args:
+            value (Any): must be comparable, not smaller than the last one searched
+
+        Returns:
+            Node: last node of the bottom level whose value is strictly smaller than `value`
+        """
+        update = self._update
+        # climb while the next link on this level is still before the value
+        level = 0
+        while level < self.level:
+            next_node = update[level].next[level]
+            if not next_node or not next_node.value < value:
+                break
+            level += 1
+        # all the levels above `level` are fine, fix the ones below
+        if level:
+            node = update[level - 1]
+            for level in range(level - 1, -1, -1):
+                # go right until we can't
+                next_node = node.next[level]
+                while next_node and next_node.value < value:
+                    node, next_node = next_node, next_node.next[level]
+                # go down...
+                update[level] = node
+        return update[0]
+
+    def update_sorted(self, values: Iterable[Any]) -> None:
+        """insert the given sorted `values` in a single pass from left to right
+
+        the update vector is kept from one value to the next, every search starts
+        where the previous value was linked (see `_finger`): O(m*log(n/m)) expected
+        for m values, instead of m full searches from the top
+
+        Args:
+            values (Iterable[Any]): values to insert, in ascending order, repetitions are skipped
+
+        Raises:
+            ValueError: raised when the values are not sorted, the previous ones are already in
+        """
+        previous = _missing
+        for value in values:
+            if previous is _missing:
+                # first value, a full search
+                node = self._descend(value)
+            elif value < previous:
+                raise ValueError(f"{value} after {previous}, not sorted")
+            elif not previous < value:
+                # special case: repeated in the batch
+                continue
             else:
-                # promote to new level
-                new_head = Node(-float("inf"))
-                new_head.next = Node(value)
-                new_head.next.down = new_node
-                # update the new root
-                new_head.down, self.root = self.root, new_head
-
-    def delete(self, value: Any) -> None:
+                node = self._finger(value)
+            previous = value
+            # special case: no repetitions allowed... do nothing
+            if node.next[0] and node.next[0].value == value:
+                continue
+            self._link(self._new_node(value, None, min(self._promotions() + 1, self.max_level)))
+            # update length
+            self._length += 1
+
+    def delete(self, value: Any) -> Node:
         """delete the node with the given `value`
 
         Args:
@@ -89,28 +264,17 @@ class SkipList:
 
         Raises:
             KeyError: raised when not found
+
+        Returns:
+            Node: the unlinked node
         """
-        # search
-        node = self.root
-        while node.down:
-            # go right until we can't
-            while node.next and node.next.value < value:
-                node = node.next
-            # special case: trivial erase
-            if node.next and node.next.value == value:
-                node.next = node.next.next
-            # go down...
-            node = node.down
-        # resembles the linked list search
-        while node.next and node.next.value < value:
-            node = node.next
-        # resembles the linked list deletion
-        if node.next and node.next.value == value:
-            node.next = node.next.next
-            # update length
-            self._length -= 1
-        else:
+        node = self._descend(value).next[0]
+        if not node or node.value != value:
             raise KeyError(f"{value} not found")
+        self._unlink(node)
+        # update length
+        self._length -= 1
+        return node
 
     def successor(self, value: Any) -> Node:
         """search for a successor of a node with the given value
@@ -119,31 +283,23 @@ class SkipList:
             value (Any): value of the predecessor
 
         Raises:
-            ValueError: raised when there is no successor
+            KeyError: raised when the value is not found, or there is no successor
 
         Returns:
             Node: node containing the successor
         """
-        # skip search
-        node = self.root
-        while node.down:
-            # go right
-            while node.next and node.next.value <= value:
-                node = node.next
-            # go down...
-            node = node.down
-        # standard linked list search
-        while node:
-            if node.value == value:
-                if not node.next:
-                    raise KeyError(f"{value} not found")
-                return node.next
-            node = node.next
-        raise KeyError(f"{value} not found")
+        # skip search, every level stops at the first value past the given one
+        node = self._floor(value)
+        if node is self.root or node.value != value or not node.next[0]:
+            raise KeyError(f"{value} not found")
+        return node.next[0]
 
     def search(self, value: Any) -> Node:
         """search for the node cointaining the given `value`
 
+        every level stops at the first value not smaller than the given one,
+        a miss costs the same O(log(n)) as a hit
+
         Args:
             value (Any): `value` to look for
 
@@ -155,35 +311,449 @@ class SkipList:
         """
         # search
         node = self.root
-        while node.down:
+        for level in range(self.level - 1, -1, -1):
             # go right until we can't
-            while node.next and node.next.value < value:
-                node = node.next
-            # go down...
-            node = node.down
-        # resembles linked list search
-        while node:
-            if node.value == value:
-                return node
-            node = node.next
+            next_node = node.next[level]
+            while next_node and next_node.value < value:
+                node, next_node = next_node, next_node.next[level]
+        # the value is the next one, or it is not in the list
+        if next_node and next_node.value == value:
+            return next_node
         raise KeyError(f"{value} not found")
 
+    def search_many(self, values: Iterable[Any]) -> Dict[Any, Node]:
+        """batched lookup, the `values` are sorted once and answered in a single sweep
+
+        keeps the last node visited on every level (the update vector), the next
+        search climbs only to the lowest level whose next link is past the value,
+        then goes right and down from there: finger search, O(log(d)) expected
+
+        Args:
+            values (Iterable[Any]): values to look for, must be hashable
+
+        Returns:
+            Dict[Any, Node]: the found values with their nodes, the misses are left out
+        """
+        res = {}
+        # own update vector, the shared one belongs to the writers
+        update: List[Node] = [self.root] * self.level
+        for value in sorted(values):
+            # climb while the next link on this level is still before the value
+            level = 0
+            while level < self.level and update[level].next[level] and update[level].next[level].value < value:
+                level += 1
+            # all the levels above `level` are fine, fix the ones below
+            if level:
+                node = update[level - 1]
+                for level in range(level - 1, -1, -1):
+                    # go right until we can't
+                    next_node = node.next[level]
+                    while next_node and next_node.value < value:
+                        node, next_node = next_node, next_node.next[level]
+                    # go down...
+                    update[level] = node
+            node = update[0].next[0]
+            if node and node.value == value:
+                res[value] = node
+        return res
+
+    def contains_many(self, values: Iterable[Any]) -> List[bool]:
+        """batched membership test, see `search_many`
+
+        Args:
+            values (Iterable[Any]): values to look for, must be hashable
+
+        Returns:
+            List[bool]: for each value, in the same order, if it is in the list
+        """
+        values = list(values)
+        found = self.search_many(values)
+        return [value in found for value in values]
+
+    def _before(self, value: Any) -> Node:
+        """last node whose value is strictly smaller than `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Node: the node, the head (-inf) when every value is greater or equal
+        """
+        node = self.root
+        for level in range(self.level - 1, -1, -1):
+            # go right until we can't
+            next_node = node.next[level]
+            while next_node and next_node.value < value:
+                node, next_node = next_node, next_node.next[level]
+        return node
+
+    def _floor(self, value: Any) -> Node:
+        """last node whose value is smaller or equal than `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Node: the node, the head (-inf) when every value is greater
+        """
+        node = self.root
+        for level in range(self.level - 1, -1, -1):
+            # go right until we can't
+            next_node = node.next[level]
+            while next_node and not value < next_node.value:
+                node, next_node = next_node, next_node.next[level]
+        return node
+
+    def _last(self) -> Node:
+        """last node of the list, the head (-inf) when empty"""
+        node = self.root
+        for level in range(self.level - 1, -1, -1):
+            while node.next[level]:
+                node = node.next[level]
+        return node
+
+    def lower_bound(self, value: Any) -> Optional[Node]:
+        """first node whose value is greater or equal than the given `value`
+
+        the `value` does not need to be in the list, no exceptions on a miss
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is smaller
+        """
+        return self._before(value).next[0]
+
+    def upper_bound(self, value: Any) -> Optional[Node]:
+        """first node whose value is strictly greater than the given `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is smaller or equal
+        """
+        return self._floor(value).next[0]
+
+    def predecessor(self, value: Any) -> Optional[Node]:
+        """last node whose value is strictly smaller than the given `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is greater or equal
+        """
+        node = self._before(value)
+        return None if node is self.root else node
+
+    def floor(self, value: Any) -> Optional[Node]:
+        """last node whose value is smaller or equal than the given `value`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is greater
+        """
+        node = self._floor(value)
+        return None if node is self.root else node
+
+    def ceiling(self, value: Any) -> Optional[Node]:
+        """first node whose value is greater or equal than the given `value`, see `lower_bound`
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Optional[Node]: the node, None when every value is smaller
+        """
+        return self._before(value).next[0]
+
+    def range(self, lo: Any = None, hi: Any = None, reverse: bool = False) -> Iterator[Any]:
+        """lazy scan of the values in the half-open range [lo, hi)
+
+        forwards, a single skip search finds the first node, then the scan follows
+        the bottom level links. backwards there are no back links, every step is
+        a new skip search for the predecessor, O(log(n)) with constant extra memory
+
+        Args:
+            lo (Any, optional): lower bound, included. Defaults to None (unbounded).
+            hi (Any, optional): upper bound, excluded. Defaults to None (unbounded).
+            reverse (bool, optional): from `hi` down to `lo`. Defaults to False.
+
+        Yields:
+            Iterator[Any]: the values in the range
+        """
+        if not reverse:
+            node: Optional[Node] = self._before(lo) if lo is not None else self.root
+            node = node.next[0]
+            while node and (hi is None or node.value < hi):
+                yield node.value
+                node = node.next[0]
+        else:
+            node = self._last() if hi is None else self._before(hi)
+            while node is not self.root and (lo is None or not node.value < lo):
+                yield node.value
+                node = self._before(node.value)
+
+    def __contains__(self, value: Any) -> bool:
+        # no exceptions on a miss, they are the common case of a filter
+        node = self._before(value).next[0]
+        return node is not None and node.value == value
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.range()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.range(reverse=True)
+
     def __repr__(self):
         res = []
-        current_head = self.root
-        level = 0
-        while current_head:
-            _ = [f"{level}: "]
-            node = current_head
+        # from the top level down
+        for level in range(self.level - 1, -1, -1):
+            _ = [f"{self.level - 1 - level}: "]
+            node = self.root
             while node:
                 # go all the way right
                 _.append(f"({node.value})->")
-                node = node.next
+                node = node.next[level]
             res.append("".join(_))
-            # next level
-            current_head = current_head.down
-            level += 1
         return "\n".join(res)
 
     def __len__(self):
         return self._length
+
+
+class IndexableNode(Node):
+    """Node with the width of every forward pointer"""
+
+    __slots__ = ("width",)
+
+    def __init__(self, value: Any = None, data: Any = None, level: int = 1):
+        super().__init__(value, data, level)
+        # width[i] is how many positions next[i] jumps, to the end when there is no next
+        self.width: List[int] = [1] * level
+
+
+class IndexableSkipList(SkipList):
+    """skip list augmented with the width of every link
+
+    every link knows how many positions it jumps, the sum of the widths along
+    a search is the position of the value: rank and select in O(log(n)) expected,
+    a sorted list with positional access (think rolling medians and percentiles)
+
+    the price: every insert and delete touches a width on every level
+
+    https://en.wikipedia.org/wiki/Skip_list#Indexable_skiplist
+    """
+
+    def __init__(
+        self,
+        values: Iterable[Any] = [],
+        probability: float = 0.5,
+        seed: Optional[int] = None,
+        max_level: Optional[int] = None,
+    ):
+        # positions of the nodes in the update vector, they grow with the levels
+        self._rank: List[int] = [0]
+        super().__init__(values, probability, seed, max_level)
+
+    def _new_node(self, value: Any, data: Any = None, level: int = 1) -> IndexableNode:
+        """indexable nodes, every link starts as a single jump"""
+        return IndexableNode(value, data, level)
+
+    def _descend(self, value: Any) -> IndexableNode:
+        """skip search of the last node before the `value`, filling the update vector
+        and the positions of its nodes, the head is 0 and the first value 1
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            IndexableNode: last node of the bottom level whose value is strictly smaller than `value`
+        """
+        update, rank, node = self._update, self._rank, self.root
+        position = 0
+        for level in range(self.level - 1, -1, -1):
+            # go right until we can't
+            next_node = node.next[level]
+            while next_node and next_node.value < value:
+                position += node.width[level]
+                node, next_node = next_node, next_node.next[level]
+            # go down... keep track of the jumps and where they are
+            update[level], rank[level] = node, position
+        return node
+
+    def _finger(self, value: Any) -> IndexableNode:
+        """finger search of the base class (see `SkipList._finger`), also moving the
+        positions of the update vector forward by the widths of the links taken"""
+        update, rank = self._update, self._rank
+        # climb while the next link on this level is still before the value
+        level = 0
+        while level < self.level:
+            next_node = update[level].next[level]
+            if not next_node or not next_node.value < value:
+                break
+            level += 1
+        # all the levels above `level` are fine, fix the ones below
+        if level:
+            node, position = update[level - 1], rank[level - 1]
+            for level in range(level - 1, -1, -1):
+                # go right until we can't, counting the jumps
+                next_node = node.next[level]
+                while next_node and next_node.value < value:
+                    position += node.width[level]
+                    node, next_node = next_node, next_node.next[level]
+                update[level], rank[level] = node, position
+        return update[0]
+
+    def _link(self, node: IndexableNode) -> None:
+        """link the `node` after the update vector, splitting the widths of the links it cuts
+        in two and adding one to the links over it, new levels jump from the head to the end"""
+        level, update, rank = len(node.next), self._update, self._rank
+        # special case: new levels, they start at the head and jump to the end
+        if level > self.level:
+            rank[self.level : level] = [0] * (level - self.level)
+            for i in range(self.level, level):
+                update[i] = self.root
+                self.root.width[i] = self._length + 1
+        # the links are cut in two at the new node
+        position, widths = rank[0] + 1, node.width
+        for i in range(level):
+            previous = update[i]
+            widths[i] = previous.width[i] - (position - rank[i]) + 1
+            previous.width[i] = position - rank[i]
+        # the links over the new node jump one more
+        for i in range(level, self.level):
+            update[i].width[i] += 1
+        super()._link(node)
+        # the update vector is on the new node now
+        for i in range(level):
+            rank[i] = position
+
+    def _unlink(self, node: IndexableNode) -> None:
+        """unlink the `node`, its links are merged into the ones before it,
+        and the links over it jump one less"""
+        update = self._update
+        # the links are joined again
+        for i, width in enumerate(node.width):
+            update[i].width[i] += width - 1
+        # the links over the node jump one less
+        for i in range(len(node.width), self.level):
+            update[i].width[i] -= 1
+        super()._unlink(node)
+
+    def rank(self, value: Any) -> int:
+        """number of values in the list strictly smaller than the given `value`
+
+        the `value` does not need to be in the list
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            int: the rank of the `value`, its index in sorted order
+        """
+        res, node = 0, self.root
+        for level in range(self.level - 1, -1, -1):
+            # go right until we can't, counting the jumps
+            next_node = node.next[level]
+            while next_node and next_node.value < value:
+                res += node.width[level]
+                node, next_node = next_node, next_node.next[level]
+        return res
+
+    def index(self, value: Any) -> int:
+        """position of the given `value` in sorted order, see `rank`
+
+        Args:
+            value (Any): value to look for
+
+        Raises:
+            KeyError: raised when not found
+
+        Returns:
+            int: index of the `value`, from 0
+        """
+        res = self.rank(value)
+        # the next node is the first one not smaller
+        if res == self._length or self.select(res).value != value:
+            raise KeyError(f"{value} not found")
+        return res
+
+    def select(self, k: int) -> Node:
+        """get the k-th smallest node, indexed from 0 as a list
+
+        Args:
+            k (int): position in sorted order, negative values count from the end
+
+        Raises:
+            IndexError: raised when `k` is out of range
+
+        Returns:
+            Node: node containing the k-th smallest value
+        """
+        # handle negative indexes
+        if k < 0:
+            k += self._length
+        if not 0 <= k < self._length:
+            raise IndexError(f"{k} out of range")
+        # positions count from the head, the first value is 1
+        k += 1
+        node = self.root
+        for level in range(self.level - 1, -1, -1):
+            # go right while the jump does not overshoot
+            while node.next[level] and node.width[level] <= k:
+                k -= node.width[level]
+                node = node.next[level]
+        return node
+
+    def delete_at(self, k: int) -> Node:
+        """delete the k-th smallest node, see `select`
+
+        Args:
+            k (int): position in sorted order, negative values count from the end
+
+        Raises:
+            IndexError: raised when `k` is out of range
+
+        Returns:
+            Node: the unlinked node
+        """
+        return self.delete(self.select(k).value)
+
+    def count_range(self, lo: Any, hi: Any) -> int:
+        """number of values in the half-open range [lo, hi)
+
+        Args:
+            lo (Any): lower bound, included
+            hi (Any): upper bound, excluded
+
+        Returns:
+            int: how many values fall in the range
+        """
+        if not lo < hi:
+            return 0
+        return self.rank(hi) - self.rank(lo)
+
+    def islice(self, start: Optional[int] = None, stop: Optional[int] = None) -> Iterator[Any]:
+        """lazy scan of the values in the positions [start, stop), as a list slice
+
+        a single `select` finds the first node, then the scan follows the bottom level
+
+        Args:
+            start (Optional[int], optional): first position, included. Defaults to None (the beginning).
+            stop (Optional[int], optional): last position, excluded. Defaults to None (the end).
+
+        Yields:
+            Iterator[Any]: the values in the positions
+        """
+        start, stop, _ = slice(start, stop).indices(self._length)
+        if start >= stop:
+            return
+        node = self.select(start)
+        for _ in range(stop - start):
+            yield node.value
+            node = node.next[0]
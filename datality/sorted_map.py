@@ -0,0 +1,68 @@
+from typing import Any
+
+# marks a missing default in `pop`, None is a valid default
+_missing = object()
+
+
+class SortedMap:
+    """sorted map interface: key -> data, on top of `insert`, `search` and `delete`
+
+    the data lives inline in the node of its key, so every operation is a single
+    descent that answers both where the key is and what it maps to.
+    the structures remain sets when used through `insert`, the data is just None
+
+    https://en.wikipedia.org/wiki/Associative_array
+    """
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.search(key).data
+
+    def __setitem__(self, key: Any, data: Any) -> None:
+        # insert returns the node of the key, new or not... overwrite its data
+        self.insert(key).data = data
+
+    def __delitem__(self, key: Any) -> None:
+        self.delete(key)
+
+    def __contains__(self, key: Any) -> bool:
+        # a single search, never the fallback scan of `__iter__`
+        try:
+            self.search(key)
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """get the data of the given `key`, or the `default` when not found
+
+        Args:
+            key (Any): key to look for
+            default (Any, optional): returned on a miss. Defaults to None.
+
+        Returns:
+            Any: the data of the `key`
+        """
+        try:
+            return self.search(key).data
+        except KeyError:
+            return default
+
+    def pop(self, key: Any, default: Any = _missing) -> Any:
+        """delete the given `key` and return its data
+
+        Args:
+            key (Any): key to delete
+            default (Any, optional): returned on a miss. Defaults to raising.
+
+        Raises:
+            KeyError: raised when the key is not found and there is no `default`
+
+        Returns:
+            Any: the data of the deleted `key`
+        """
+        try:
+            return self.delete(key).data
+        except KeyError:
+            if default is _missing:
+                raise
+            return default
@@ -1,23 +1,33 @@
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, List, Optional, Tuple
 
-from datality.bst import BST
+from datality.order_statistic import OrderStatisticBST
 
 
 class Node:
     """Node basic chainable storage unit"""
 
-    def __init__(self, value=None):
+    __slots__ = ("value", "data", "size", "left", "right", "parent")
+
+    def __init__(self, value=None, data=None):
         self.value = value
+        self.data = data
+        self.size = 1
         self.left = None
         self.right = None
+        self.parent = None
 
 
-class SplayTree(BST):
+class SplayTree(OrderStatisticBST):
     """implementation of Tarjan's Splay Tree
 
     this is my favorite data structure :D
     the mighty dinamically optimal tree...
 
+    splits and joins are a single splay away. the set operations cut the bigger
+    tree at the values of the smaller one, from left to right, and hang the pieces
+    back under a balanced tree of the nodes kept: O(m*log(n/m)) amortized, where
+    `m` is the size of the smaller tree, each splay only walks the values since the last cut
+
     https://en.wikipedia.org/wiki/Splay_tree
     """
 
@@ -27,51 +37,148 @@ class SplayTree(BST):
         for value in values:
             self.insert(value)
 
-    def insert(self, value: Any) -> None:
+    def _new_node(self, value: Any, data: Any = None) -> Node:
+        """splay nodes are plain bst nodes"""
+        return Node(value, data)
+
+    def _splay(self, value: Any, root: Optional[Node] = None) -> Node:
+        """top-down splay, the node with `value` (or the last one on its path) becomes the root
+
+        a single pass from the root: the nodes smaller than `value` are hung on the
+        right spine of a left tree, the greater ones on the left spine of a right tree,
+        with an extra rotation on every zig-zig... at the end both trees are
+        reassembled as the children of the splayed node. no recursion, no stack
+
+        https://en.wikipedia.org/wiki/Splay_tree#Top-down_splay_tree
+
+        Args:
+            value (Any): value to look for
+            root (Optional[Node], optional): subtree to splay. Defaults to None (the tree).
+
+        Returns:
+            Node: the new root of the (sub)tree
+        """
+        node = root or self.root
+        left_root = right_root = None
+        # last node of the spines, where the next nodes hang
+        left_max = right_min = None
+        left_spine, right_spine = [], []
+        while True:
+            if value < node.value:
+                if not node.left:
+                    break
+                if value < node.left.value:
+                    # zig-zig: rotate right
+                    child = node.left
+                    node.left = child.right
+                    if child.right:
+                        child.right.parent = node
+                    child.right, node.parent = node, child
+                    self.update_size(node)
+                    node = child
+                    if not node.left:
+                        break
+                # link right
+                if right_min:
+                    right_min.left = node
+                else:
+                    right_root = node
+                node.parent = right_min
+                right_min = node
+                right_spine.append(node)
+                node = node.left
+            elif node.value < value:
+                if not node.right:
+                    break
+                if node.right.value < value:
+                    # zag-zag: rotate left
+                    child = node.right
+                    node.right = child.left
+                    if child.left:
+                        child.left.parent = node
+                    child.left, node.parent = node, child
+                    self.update_size(node)
+                    node = child
+                    if not node.right:
+                        break
+                # link left
+                if left_max:
+                    left_max.right = node
+                else:
+                    left_root = node
+                node.parent = left_max
+                left_max = node
+                left_spine.append(node)
+                node = node.right
+            else:
+                break
+        # reassemble: the children of the splayed node close the spines
+        if left_max:
+            left_max.right = node.left
+            if node.left:
+                node.left.parent = left_max
+            node.left = left_root
+            left_root.parent = node
+        if right_min:
+            right_min.left = node.right
+            if node.right:
+                node.right.parent = right_min
+            node.right = right_root
+            right_root.parent = node
+        # the spines changed their descendants, bottom-up
+        for spine_node in reversed(left_spine):
+            self.update_size(spine_node)
+        for spine_node in reversed(right_spine):
+            self.update_size(spine_node)
+        self.update_size(node)
+        node.parent = None
+        if not root:
+            self.root = node
+        return node
+
+    def insert(self, value: Any, data: Any = None) -> Node:
         """insert a new node with the given `value` in the tree
 
-        standard bst insertion + rotate till root
+        splay the `value`, then the new node takes the root, splitting the old one
 
         Args:
             value (Any): must be comparable
+            data (Any, optional): payload of the new node. Defaults to None.
+
+        Returns:
+            Node: the node containing the `value`, now the root
         """
         if not self.root:
-            self.root = Node(value)
+            self.root = self._new_node(value, data)
             # update length
             self._length += 1
-            return
-
-        def r(node: Node):
-            """modified bst insertion
-            making the inserted node root
-            """
-            if value == node.value:
-                # already in the tree... do nothing
-                self._length -= 1
-                return
-            if value < node.value:
-                if node.left:
-                    r(node.left)
-                else:
-                    node.left = Node(value)
-                # went left? rotate back right :D
-                self.rotate_right(node)
-            else:
-                if node.right:
-                    r(node.right)
-                else:
-                    node.right = Node(value)
-                # went right? rotate back left
-                self.rotate_left(node)
-
-        r(self.root)
+            return self.root
+        root = self._splay(value)
+        if root.value == value:
+            # already in the tree... do nothing
+            return root
+        node = self._new_node(value, data)
+        if value < root.value:
+            node.left, root.left = root.left, None
+            node.right = root
+        else:
+            node.right, root.right = root.right, None
+            node.left = root
+        for child in (node.left, node.right):
+            if child:
+                child.parent = node
+        self.update_size(root)
+        self.update_size(node)
+        self.root = node
         # update length
         self._length += 1
+        return node
 
     def search(self, value: Any) -> Node:
         """standard binary search + rotations
 
         search also brings the searched node to root, part of the magic :D
+        a miss splays the last node on the path
 
         Args:
             value (Any): value to look fo in the tree
@@ -82,24 +189,332 @@ class SplayTree(BST):
         Returns:
             Node: node containing the given `value`
         """
-        if not self.root:
+        if not self.root or self._splay(value).value != value:
             raise KeyError(f"{value} not found")
+        # after the search the found node is the new root :O
+        return self.root
 
-        def r(node):
-            """bt + rotations"""
-            if not node:
-                raise KeyError(f"{value} not found")
-            if value == node.value:
-                return
-            if value < node.value:
-                r(node.left)
-                # went left? rotate back right :D
-                self.rotate_right(node)
+    def __contains__(self, value: Any) -> bool:
+        # a lookup is an access too, the node (or the last one on its path) is splayed
+        return self.root is not None and self._splay(value).value == value
+
+    def delete(self, value: Any) -> Node:
+        """delete the node with the given `value`
+
+        splay it to the root, then splay the max of its left subtree,
+        which has no right child, and hang the right subtree there
+
+        Args:
+            value (Any): value to delete
+
+        Raises:
+            KeyError: raised when the node is not found
+
+        Returns:
+            Node: the unlinked node
+        """
+        root = self.search(value)
+        left, right = root.left, root.right
+        if not left:
+            self.root = right
+        else:
+            # every value on the left is smaller, its max goes to the top
+            left.parent = None
+            left = self._splay(value, left)
+            left.right = right
+            if right:
+                right.parent = left
+            self.update_size(left)
+            self.root = left
+        if self.root:
+            self.root.parent = None
+        # update length
+        self._length -= 1
+        root.left = root.right = None
+        return root
+
+    def successor(self, value: Any) -> Node:
+        """get the next in-order successor of the node with the given `value`
+
+        both the node and its successor are splayed
+
+        Args:
+            value (Any): value of the predecesor
+
+        Raises:
+            KeyError: raised when the value or the successor are not found
+
+        Returns:
+            Node: node containing the value of the successor
+        """
+        if not self.root or self._splay(value).value != value:
+            raise KeyError(f"successor of {value} not found")
+        node = self.root.right
+        if not node:
+            raise KeyError(f"successor of {value} not found")
+        # the min of the right subtree, splayed to the root
+        while node.left:
+            node = node.left
+        return self._splay(node.value)
+
+    def min(self) -> Node:
+        """splay the min to the root
+
+        Raises:
+            IndexError: raised when the tree is empty
+
+        Returns:
+            Node: node containing the min value
+        """
+        if not self.root:
+            raise IndexError("empty tree")
+        node = self.root
+        while node.left:
+            node = node.left
+        return self._splay(node.value)
+
+    def max(self) -> Node:
+        """splay the max to the root
+
+        Raises:
+            IndexError: raised when the tree is empty
+
+        Returns:
+            Node: node containing the max value
+        """
+        if not self.root:
+            raise IndexError("empty tree")
+        node = self.root
+        while node.right:
+            node = node.right
+        return self._splay(node.value)
+
+    def split(self, value: Any) -> "SplayTree":
+        """split the tree, the values greater or equal than `value` move out
+
+        splay the `value`, then cut the root from one of its subtrees
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            SplayTree: a new tree with the values greater or equal than `value`,
+            this one keeps the smaller ones
+        """
+        other = type(self)()
+        if not self.root:
+            return other
+        root = self._splay(value)
+        if root.value < value:
+            # the root stays, the right subtree moves out
+            moved, root.right = root.right, None
+            kept = root
+        else:
+            # the root moves out, with its right subtree
+            kept, root.left = root.left, None
+            moved = root
+        for node in (kept, moved):
+            if node:
+                node.parent = None
+        self.update_size(root)
+        self.root, self._length = kept, self.compute_size(kept)
+        other.root, other._length = moved, self.compute_size(moved)
+        return other
+
+    def join(self, other: "SplayTree") -> None:
+        """join all the values of `other`, which must be greater than ours
+
+        our max is splayed to the root, then the other tree hangs on its right.
+        `other` is left empty
+
+        Args:
+            other (SplayTree): tree with greater values
+
+        Raises:
+            ValueError: raised when the values of both trees overlap
+        """
+        if not other.root:
+            return
+        if self.root:
+            root = self.max()
+            low = other.min()
+            if not root.value < low.value:
+                raise ValueError(f"cannot join, {root.value} is not smaller than {low.value}")
+            root.right, low.parent = low, root
+            self.update_size(root)
+        else:
+            self.root = other.root
+        self._length += other._length
+        other.root, other._length = None, 0
+
+    def _nodes(self) -> List[Node]:
+        """the nodes of the tree, in order"""
+        res: List[Node] = []
+        node = self.root
+        while node and node.left:
+            node = node.left
+        while node:
+            res.append(node)
+            node = self._next(node)
+        return res
+
+    def _cut(
+        self, root: Optional[Node], values: List[Any], misses: bool = True
+    ) -> Tuple[List[Optional[Node]], List[Optional[Node]]]:
+        """split the subtree of `root` at the sorted `values`, from left to right
+
+        every cut splays the next value in what is left of the tree, the previous cut
+        left us at its min, so each splay only walks the values in between
+
+        Args:
+            root (Optional[Node]): subtree to cut, it is taken apart
+            values (List[Any]): sorted values, without repetitions
+            misses (bool, optional): cut at the values not in the subtree too. Defaults to True.
+
+        Returns:
+            Tuple[List[Optional[Node]], List[Optional[Node]]]: the pieces between the values cut
+            (one more than the cuts), and the node of each value in the subtree (None when it is not)
+        """
+        pieces: List[Optional[Node]] = []
+        equal: List[Optional[Node]] = []
+        for value in values:
+            if not root:
+                if misses:
+                    pieces.append(None)
+                equal.append(None)
+                continue
+            root = self._splay(value, root)
+            node = None
+            if not misses and root.value != value:
+                # not here, nothing to cut
+                equal.append(None)
+                continue
+            if root.value < value:
+                # the root goes with the piece, its right subtree stays
+                piece, root, piece.right = root, root.right, None
+                self.update_size(piece)
+            elif value < root.value:
+                # the left subtree is the piece
+                piece, root.left = root.left, None
+                self.update_size(root)
             else:
-                r(node.right)
-                # went right? rotate back left
-                self.rotate_left(node)
+                # the value itself is cut out
+                node, piece, root = root, root.left, root.right
+                node.left = node.right = None
+                self.update_size(node)
+            for child in (piece, root):
+                if child:
+                    child.parent = None
+            pieces.append(piece)
+            equal.append(node)
+        pieces.append(root)
+        return pieces, equal
 
-        r(self.root)
-        # after the search the found node is the new root :O
-        return self.root
+    def _assemble(self, pieces: List[Optional[Node]], nodes: List[Optional[Node]]) -> None:
+        """take as the whole tree the sorted sequence pieces[0], nodes[0], pieces[1]... nodes[-1], pieces[-1]
+
+        the nodes are hung as a balanced tree and the pieces fill its empty links,
+        in order. where a node is missing, the min of the next piece takes its place
+
+        Args:
+            pieces (List[Optional[Node]]): roots of the subtrees between the nodes
+            nodes (List[Optional[Node]]): single nodes, one less than the pieces
+        """
+        kept_pieces, kept_nodes = [pieces[0]], []
+        for node, piece in zip(nodes, pieces[1:]):
+            if node:
+                kept_nodes.append(node)
+                kept_pieces.append(piece)
+            elif not piece:
+                continue
+            elif not kept_pieces[-1]:
+                kept_pieces[-1] = piece
+            else:
+                # special case: two pieces in a row, the min of the second one splits them
+                low = piece
+                while low.left:
+                    low = low.left
+                low = self._splay(low.value, piece)
+                rest, low.right = low.right, None
+                if rest:
+                    rest.parent = None
+                kept_nodes.append(low)
+                kept_pieces.append(rest)
+
+        def r(lo: int, hi: int) -> Optional[Node]:
+            """the tree of kept_nodes[lo:hi], the middle goes on top, kept_pieces[lo:hi + 1] below"""
+            if lo == hi:
+                return kept_pieces[lo]
+            mid = (lo + hi) // 2
+            node = kept_nodes[mid]
+            node.left, node.right, node.parent = r(lo, mid), r(mid + 1, hi), None
+            for child in (node.left, node.right):
+                if child:
+                    child.parent = node
+            self.update_size(node)
+            return node
+
+        self.root = r(0, len(kept_nodes))
+        self._length = self.compute_size(self.root)
+
+    def union(self, other: "SplayTree") -> None:
+        """add all the values of `other`, `other` is left empty
+
+        the bigger tree is cut at the values of the smaller one, the values in both keep our node
+
+        Args:
+            other (SplayTree): tree to merge into this one
+        """
+        if other is self:
+            return
+        if len(other) <= len(self):
+            theirs = other._nodes()
+            pieces, ours = self._cut(self.root, [node.value for node in theirs])
+            nodes = [mine or their for mine, their in zip(ours, theirs)]
+        else:
+            nodes = self._nodes()
+            pieces, _ = self._cut(other.root, [node.value for node in nodes])
+        self._assemble(pieces, nodes)
+        other.root, other._length = None, 0
+
+    def intersection(self, other: "SplayTree") -> None:
+        """keep only the values also in `other`, `other` is left empty
+
+        the bigger tree is cut at the values of the smaller one, only our nodes found on both sides stay
+
+        Args:
+            other (SplayTree): tree to intersect with this one
+        """
+        if other is self:
+            return
+        if len(other) <= len(self):
+            theirs = other._nodes()
+            _, ours = self._cut(self.root, [node.value for node in theirs])
+        else:
+            mine = self._nodes()
+            _, found = self._cut(other.root, [node.value for node in mine])
+            ours = [node if their else None for node, their in zip(mine, found)]
+        nodes = [node for node in ours if node]
+        self._assemble([None] * (len(nodes) + 1), nodes)
+        other.root, other._length = None, 0
+
+    def difference(self, other: "SplayTree") -> None:
+        """remove all the values in `other`, `other` is left empty
+
+        the bigger tree is cut at the values of the smaller one, the values in both are dropped
+
+        Args:
+            other (SplayTree): tree with the values to remove
+        """
+        if other is self:
+            self.root, self._length = None, 0
+            return
+        if len(other) <= len(self):
+            pieces, _ = self._cut(self.root, [node.value for node in other._nodes()], misses=False)
+            self._assemble(pieces, [None] * (len(pieces) - 1))
+        else:
+            mine = self._nodes()
+            _, found = self._cut(other.root, [node.value for node in mine])
+            nodes = [node for node, their in zip(mine, found) if not their]
+            self._assemble([None] * (len(nodes) + 1), nodes)
+        other.root, other._length = None, 0
@@ -1,148 +1,342 @@
-from random import uniform
-from typing import Any, Iterable, Optional
+from random import Random, random
+from typing import Any, Iterable, Optional, Tuple
 
-from datality.bst import BST
+from datality.order_statistic import OrderStatisticBST
 
 
 class Node:
     """Node basic chainable storage unit"""
 
-    def __init__(self, value=None):
+    __slots__ = ("value", "data", "priority", "size", "left", "right", "parent")
+
+    def __init__(self, value=None, data=None, priority=None):
         self.value = value
-        self.priority = uniform(0, 1)
+        self.data = data
+        self.priority = random() if priority is None else priority
+        self.size = 1
         self.left = None
         self.right = None
+        self.parent = None
 
 
-class Treap(BST):
+class Treap(OrderStatisticBST):
     """implementation of the Treap (bst + heap)
 
+    on top of the classic operations, treaps split and join in O(log(n)),
+    and the set operations built on them cost O(m*log(n/m)) expected,
+    where `m` is the size of the smaller treap
+
     https://en.wikipedia.org/wiki/Treap
     """
 
-    def __init__(self, values: Iterable[Any] = []):
+    def __init__(self, values: Iterable[Any] = [], seed: Optional[int] = None):
+        """constructor
+
+        Args:
+            values (Iterable[Any], optional): from list of values. Defaults to [].
+            seed (Optional[int], optional): seed of the priorities, for reproducible shapes.
+            Defaults to None (random).
+        """
         self.root: Optional[Node] = None
         self._length: int = 0
+        # own generator, the global one is shared and slower to reach
+        self._random = Random(seed)
         for value in values:
             self.insert(value)
 
-    def rotate_right(self, node: Node) -> None:
-        """right rotation
+    def _new_node(self, value: Any, data: Any = None) -> Node:
+        """treap nodes get their priority from the generator of the treap"""
+        return Node(value, data, self._random.random())
+
+    def _bulk_fixup(self, node: Node, depth: int, height: int) -> None:
+        """squeeze the random priority into a band per level, deeper levels get lower bands
+
+        this keeps the heap invariance without sorting the priorities
+        """
+        super()._bulk_fixup(node, depth, height)
+        node.priority = (height - depth - 1 + node.priority) / height
+
+    def _insert_fixup(self, node: Node) -> None:
+        """rotations to keep the mighty heap invariance
 
-        https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
+        Args:
+            node (Node): the new node
         """
-        _ = Node(node.value)
-        # dont forget the priority
-        _.priority = node.priority
-        _.left, _.right = node.left.right, node.right
-        # rotate...
-        node.value, node.priority = node.left.value, node.left.priority
-        node.left, node.right = node.left.left, _
-
-    def rotate_left(self, node: Node) -> None:
-        """left rotation
-
-        https://en.wikipedia.org/wiki/AVL_tree#Simple_rotation
+        # one more descendant for every ancestor
+        super()._insert_fixup(node)
+        # repair max_heap invariants...
+        while node.parent and node.priority > node.parent.priority:
+            if node.parent.right is node:
+                self.rotate_left(node.parent)
+            else:
+                self.rotate_right(node.parent)
+
+    def _rotate_to_leaf(self, node: Node) -> None:
+        """rotate the node to be deleted with the max child
+
+        until it becomes a leaf, then deletion is trivial...
+
+        Args:
+            node (Node): node to be removed
         """
-        _ = Node(node.value)
-        # dont forget the priority
-        _.priority = node.priority
-        _.left, _.right = node.left, node.right.left
-        # rotate...
-        node.value, node.priority = node.right.value, node.right.priority
-        node.left, node.right = _, node.right.right
+        # rotate with max_child, until no childs remain...
+        while node.left or node.right:
+            if node.right and (not node.left or node.right.priority > node.left.priority):
+                self.rotate_left(node)
+            else:
+                self.rotate_right(node)
+        # actual deletion
+        super()._rotate_to_leaf(node)
 
-    def insert(self, value: Any) -> None:
-        """insert a new node with the given `value` in the tree
+    def _split(self, node: Optional[Node], value: Any) -> Tuple[Optional[Node], Optional[Node], Optional[Node]]:
+        """split the treap rooted at `node` in three: smaller, equal and greater than `value`
 
-        standard bst insertion + rotations to keep the mighty heap invariance
+        walks down a single path, the nodes smaller than `value` hang from the
+        right spine of the left treap, the greater ones from the left spine of the right
 
         Args:
+            node (Optional[Node]): root of the treap to split
             value (Any): must be comparable
+
+        Returns:
+            Tuple[Optional[Node], Optional[Node], Optional[Node]]: roots of the smaller
+            and greater treaps, and the detached node containing `value` (if any)
         """
-        if not self.root:
-            self.root = Node(value)
-            # update length
-            self._length += 1
-            return
+        left = right = equal = None
+        left_spine, right_spine = [], []
+        while node:
+            if node.value < value:
+                # node and its left subtree are smaller
+                if left_spine:
+                    left_spine[-1].right = node
+                node.parent = left_spine[-1] if left_spine else None
+                left_spine.append(node)
+                node = node.right
+            elif value < node.value:
+                # node and its right subtree are greater
+                if right_spine:
+                    right_spine[-1].left = node
+                node.parent = right_spine[-1] if right_spine else None
+                right_spine.append(node)
+                node = node.left
+            else:
+                equal = node
+                break
+        # close both spines, with the subtrees of the equal node (if any)
+        smaller, greater = (equal.left, equal.right) if equal else (None, None)
+        if left_spine:
+            left_spine[-1].right = smaller
+            if smaller:
+                smaller.parent = left_spine[-1]
+            left = left_spine[0]
+        else:
+            left = smaller
+        if right_spine:
+            right_spine[-1].left = greater
+            if greater:
+                greater.parent = right_spine[-1]
+            right = right_spine[0]
+        else:
+            right = greater
+        for root in (left, right):
+            if root:
+                root.parent = None
+        if equal:
+            equal.left = equal.right = equal.parent = None
+            equal.size = 1
+        # the spines changed their descendants, bottom-up
+        for node in reversed(left_spine):
+            self.update_size(node)
+        for node in reversed(right_spine):
+            self.update_size(node)
+        return (left, right, equal)
+
+    def _join(self, left: Optional[Node], right: Optional[Node]) -> Optional[Node]:
+        """join two treaps, every value in `left` must be smaller than the ones in `right`
+
+        zips the right spine of `left` with the left spine of `right` by priority
 
-        def r(node):
-            """modified bst insertion"""
-            if value == node.value:
-                # already in the tree do nothing...
-                self._length -= 1
-                return
-            if value < node.value:
-                if node.left:
-                    r(node.left)
-                else:
-                    node.left = Node(value)
+        Args:
+            left (Optional[Node]): root of the smaller treap
+            right (Optional[Node]): root of the greater treap
+
+        Returns:
+            Optional[Node]: root of the joined treap
+        """
+        # the winner of each round hangs from the `parent`, on the `right_side` or not
+        root = parent = None
+        right_side = False
+        path = []
+        while left and right:
+            if left.priority > right.priority:
+                # keeps its left subtree, its right one is still to be zipped
+                node, left, next_side = left, left.right, True
             else:
-                if node.right:
-                    r(node.right)
-                else:
-                    node.right = Node(value)
-            # repair max_heap invariants...
-            if value > node.value:
-                if node.right.priority > node.priority:
-                    self.rotate_left(node)
+                # keeps its right subtree, its left one is still to be zipped
+                node, right, next_side = right, right.left, False
+            if not parent:
+                root = node
+            elif right_side:
+                parent.right = node
             else:
-                if node.left.priority > node.priority:
-                    self.rotate_right(node)
+                parent.left = node
+            node.parent = parent
+            parent, right_side = node, next_side
+            path.append(node)
+        # whatever remains hangs from the last winner
+        rest = left or right
+        if not parent:
+            return rest
+        if right_side:
+            parent.right = rest
+        else:
+            parent.left = rest
+        if rest:
+            rest.parent = parent
+        # the winners changed their descendants, bottom-up
+        for node in reversed(path):
+            self.update_size(node)
+        root.parent = None
+        return root
 
-        r(self.root)
-        # update length
-        self._length += 1
+    def _hang(self, node: Node, left: Optional[Node], right: Optional[Node]) -> None:
+        """hang the `left` and `right` subtrees from `node`, updating its size"""
+        node.left, node.right, node.parent = left, right, None
+        for child in (left, right):
+            if child:
+                child.parent = node
+        self.update_size(node)
 
-    def delete(self, value: Any) -> None:
-        """search and delete the node with the given `value` in the tree
+    def _adopt(self, root: Optional[Node]) -> None:
+        """take the treap rooted at `root` as the whole content of this one"""
+        self.root = root
+        self._length = self.compute_size(root)
 
-        rotate the node to be deleted with the max child
-        until it becomes a leaf, then deletion is trivial...
+    def split(self, value: Any) -> "Treap":
+        """split the treap in O(log(n)), the values greater or equal than `value` move out
+
+        Args:
+            value (Any): must be comparable
+
+        Returns:
+            Treap: a new treap with the values greater or equal than `value`,
+            this one keeps the smaller ones
         """
-        # standard binary search for the node, and the parent
-        if not self.root:
-            raise KeyError(f"{value} not found")
-
-        def get(node, parent):
-            if not node:
-                raise KeyError(f"{value} not found")
-            if value == node.value:
-                return (node, parent)
-            if value < node.value:
-                return get(node.left, node)
-            else:
-                return get(node.right, node)
-
-        node, parent = get(self.root, None)
-
-        def r(node, parent):
-            """standard bst search but keeps track of the parents"""
-            if not node.left and not node.right:
-                # special case: root
-                if not parent:
-                    self.root = None
-                    return
-                # actual deletion
-                if parent.right == node:
-                    parent.right = None
-                    return
-                else:
-                    parent.left = None
-                    return
-            # rotate with max_child, until no childs remain...
-
-            def priority(node):
-                return node.priority if node else -float("inf")
-
-            max_child = max(node.left, node.right, key=lambda node: priority(node))
-            if max_child == node.right:
-                self.rotate_left(node)
-                return r(node.left, node)
+        left, right, equal = self._split(self.root, value)
+        if equal:
+            right = self._join(equal, right)
+        other = type(self)()
+        # same generator, the halves keep drawing from the same sequence
+        other._random = self._random
+        other._adopt(right)
+        self._adopt(left)
+        return other
+
+    def join(self, other: "Treap") -> None:
+        """join in O(log(n)) all the values of `other`, which must be greater than ours
+
+        `other` is left empty
+
+        Args:
+            other (Treap): treap with greater values
+
+        Raises:
+            ValueError: raised when the values of both treaps overlap
+        """
+        if self.root and other.root:
+            # compare our max against the min of the other
+            high, low = self.root, other.root
+            while high.right:
+                high = high.right
+            while low.left:
+                low = low.left
+            if not high.value < low.value:
+                raise ValueError(f"cannot join, {high.value} is not smaller than {low.value}")
+        self._adopt(self._join(self.root, other.root))
+        other._adopt(None)
+
+    def union(self, other: "Treap") -> None:
+        """add all the values of `other` in O(m*log(n/m)) expected, `other` is left empty
+
+        the values in both keep our node, with its data
+
+        Args:
+            other (Treap): treap to merge into this one
+        """
+        if other is self:
+            return
+
+        def r(ours: Optional[Node], theirs: Optional[Node]) -> Optional[Node]:
+            """the root with the highest priority stays on top, the other treap is split by it"""
+            if not ours or not theirs:
+                return ours or theirs
+            if theirs.priority <= ours.priority:
+                smaller, greater, _ = self._split(theirs, ours.value)
+                left, right = r(ours.left, smaller), r(ours.right, greater)
+                self._hang(ours, left, right)
+                return ours
+            smaller, greater, equal = self._split(ours, theirs.value)
+            left, right = r(smaller, theirs.left), r(greater, theirs.right)
+            top = theirs
+            if equal:
+                # special case: in both, our node takes their place... and their priority
+                equal.priority, top = theirs.priority, equal
+            self._hang(top, left, right)
+            return top
+
+        self._adopt(r(self.root, other.root))
+        other._adopt(None)
+
+    def intersection(self, other: "Treap") -> None:
+        """keep only the values also in `other` in O(m*log(n/m)) expected, `other` is left empty
+
+        the values kept are our nodes, with their data
+
+        Args:
+            other (Treap): treap to intersect with this one
+        """
+        if other is self:
+            return
+
+        def r(ours: Optional[Node], theirs: Optional[Node]) -> Optional[Node]:
+            """the root with the highest priority stays on top, only if in both treaps"""
+            if not ours or not theirs:
+                return None
+            if theirs.priority <= ours.priority:
+                smaller, greater, equal = self._split(theirs, ours.value)
+                left, right = r(ours.left, smaller), r(ours.right, greater)
+                top = ours
             else:
-                self.rotate_right(node)
-                return r(node.right, node)
+                smaller, greater, equal = self._split(ours, theirs.value)
+                left, right = r(smaller, theirs.left), r(greater, theirs.right)
+                if equal:
+                    # our node takes their place... and their priority
+                    equal.priority = theirs.priority
+                top = equal
+            if not equal:
+                return self._join(left, right)
+            self._hang(top, left, right)
+            return top
+
+        self._adopt(r(self.root, other.root))
+        other._adopt(None)
+
+    def difference(self, other: "Treap") -> None:
+        """remove all the values in `other` in O(m*log(n/m)) expected, `other` is left empty
+
+        Args:
+            other (Treap): treap with the values to remove
+        """
+        if other is self:
+            self._adopt(None)
+            return
+
+        def r(a: Optional[Node], b: Optional[Node]) -> Optional[Node]:
+            """split `a` by the root of `b`, dropping the value in both"""
+            if not a or not b:
+                return a
+            smaller, greater, _ = self._split(a, b.value)
+            return self._join(r(smaller, b.left), r(greater, b.right))
 
-        r(node, parent)
-        # update length
-        self._length -= 1
+        self._adopt(r(self.root, other.root))
+        other._adopt(None)
@@ -7,6 +7,8 @@ class Node:
     each node has the same basic structure: u, min, max, summary, clusters
     """
 
+    __slots__ = ("_u", "_low", "min", "max", "clusters", "summary")
+
     def __init__(self, u: int):
         self._u = 2
         self.min = self.max = None
@@ -15,6 +17,9 @@ class Node:
         # find the size of this universe (next power of 2 containing all the keys)
         while self._u < u:
             self._u = self._u << 1
+        # size of the clusters, the lower square root: 2^floor(k/2) for u = 2^k...
+        # the summary keeps the cluster numbers, its universe is u / low
+        self._low = 1 << ((self._u.bit_length() - 1) // 2)
 
     def __repr__(self):
         return f"{(self.min, self.max)}u{self._u}"
@@ -36,6 +41,8 @@ class VEB:
         - max: returns the max element in O(1)
         - delete: delete the given value from the tree in O(lg lg U)
         - successor: return the next in order successor in O(lg lg U)
+        - predecessor, floor, ceiling, lower_bound, upper_bound: the neighbours
+          of any key, in the tree or not, None when missing in O(lg lg U)
 
     usage example:
         # from a list of keys
@@ -98,8 +105,8 @@ class VEB:
             if node.min == x or node.max == x:
                 return True
             # get cluster -> i (high) and offset -> j (low)
-            i = x // int(node._u ** (1 / 2))
-            j = x % int(node._u ** (1 / 2))
+            i = x // node._low
+            j = x % node._low
             # don't give up... keep looking!
             if i in node.clusters:
                 return r(node.clusters[i], j)
@@ -133,37 +140,32 @@ class VEB:
             if partial_key > node.max:
                 node.max = partial_key
             # get cluster -> i (high) and offset -> j (low)
-            i = partial_key // int(node._u ** (1 / 2))
-            j = partial_key % int(node._u ** (1 / 2))
-            u = int(node._u ** (1 / 2))
+            i = partial_key // node._low
+            j = partial_key % node._low
             # update summary if the corresponding cluster was empty
             if node._u > 2 and i not in node.clusters:
                 if not node.summary:
-                    node.summary = Node(u)
+                    node.summary = Node(node._u // node._low)
                 r(node.summary, i)
             # update the corresponding cluster
             if node._u > 2:
-                r(node.clusters.setdefault(i, Node(u)), j)
+                r(node.clusters.setdefault(i, Node(node._low)), j)
 
         r(self.root, key)
 
-    def successor(self, key: int) -> int:
-        """returns the successor of the given key in the tree
+    def upper_bound(self, key: int) -> Optional[int]:
+        """returns the first key strictly greater than the given `key` in O(log log U)
 
-        the classic data structure returns the size of the universe `self._u`
-        if the successor is not found... we will raise an exception
+        the `key` does not need to be in the tree, no exceptions on a miss
 
         Args:
-            key (int): key of the predecessor
-
-        Raises:
-            KeyError: raised when the successor is not in the tree
+            key (int): must be an integer
 
         Returns:
-            int: the key of the sucessor
+            Optional[int]: the next key, None when not found
         """
         if self.root.min is None:
-            raise KeyError(f"successor of {key} not found")
+            return None
 
         def r(node, x):
             # trivial case
@@ -173,8 +175,8 @@ class VEB:
             if x >= node.max:
                 return node._u
             # get cluster -> i (high) and offset -> j (low)
-            i = x // int(node._u ** (1 / 2))
-            j = x % int(node._u ** (1 / 2))
+            i = x // node._low
+            j = x % node._low
             # professor Erik Demaine was missing this next line...
             if not node._u > 2 and x < node.max:
                 return node.max
@@ -185,13 +187,102 @@ class VEB:
                 # take a look in the summary first
                 i = r(node.summary, i)
                 j = node.clusters[i].min
-            return i * int(node._u ** (1 / 2)) + j
+            return i * node._low + j
 
         res = r(self.root, key)
-        if res == self._u:
+        return None if res == self._u else res
+
+    def successor(self, key: int) -> int:
+        """returns the successor of the given key in the tree
+
+        the classic data structure returns the size of the universe `self._u`
+        if the successor is not found... we will raise an exception,
+        see `upper_bound` for the version without exceptions
+
+        Args:
+            key (int): key of the predecessor
+
+        Raises:
+            KeyError: raised when the successor is not in the tree
+
+        Returns:
+            int: the key of the sucessor
+        """
+        res = self.upper_bound(key)
+        if res is None:
             raise KeyError(f"successor of {key} not found")
         return res
 
+    def predecessor(self, key: int) -> Optional[int]:
+        """returns the last key strictly smaller than the given `key` in O(log log U)
+
+        mirror of `upper_bound`... but the min is never stored in the clusters,
+        so when no cluster holds a predecessor, the min itself is the answer
+
+        Args:
+            key (int): must be an integer
+
+        Returns:
+            Optional[int]: the previous key, None when not found
+        """
+
+        def r(node, x):
+            # trivial cases
+            if node.min is None or x <= node.min:
+                return None
+            if x > node.max:
+                return node.max
+            # base case: the universe {0, 1}, x is the max... the min is the answer
+            if not node._u > 2:
+                return node.min
+            # get cluster -> i (high) and offset -> j (low)
+            i = x // node._low
+            j = x % node._low
+            cluster = node.clusters.get(i)
+            if cluster and cluster.min < j:
+                # some key in the cluster is smaller, the predecessor is here
+                return i * node._low + r(cluster, j)
+            # take a look in the summary for the previous cluster
+            i = r(node.summary, i) if node.summary else None
+            if i is None:
+                return node.min
+            return i * node._low + node.clusters[i].max
+
+        return r(self.root, key)
+
+    def lower_bound(self, key: int) -> Optional[int]:
+        """returns the first key greater or equal than the given `key` in O(log log U)
+
+        Args:
+            key (int): must be an integer
+
+        Returns:
+            Optional[int]: the key, None when not found
+        """
+        return self.upper_bound(key - 1)
+
+    def ceiling(self, key: int) -> Optional[int]:
+        """returns the first key greater or equal than the given `key`, see `lower_bound`
+
+        Args:
+            key (int): must be an integer
+
+        Returns:
+            Optional[int]: the key, None when not found
+        """
+        return self.upper_bound(key - 1)
+
+    def floor(self, key: int) -> Optional[int]:
+        """returns the last key smaller or equal than the given `key` in O(log log U)
+
+        Args:
+            key (int): must be an integer
+
+        Returns:
+            Optional[int]: the key, None when not found
+        """
+        return self.predecessor(key + 1)
+
     def delete(self, key: int) -> None:
         """deletes a `key` from the tree in O(log log U)"""
         # special case: empty tree
@@ -214,10 +305,10 @@ class VEB:
                     return False
                 tmp = node.summary.min
                 # new min discovered, update
-                x = node.min = tmp * int(node._u ** (1 / 2)) + node.clusters.get(tmp, Node(2)).min or 0
+                x = node.min = tmp * node._low + node.clusters.get(tmp, Node(2)).min or 0
             # get cluster -> i (high) and offset -> j (low)
-            i = x // int(node._u ** (1 / 2))
-            j = x % int(node._u ** (1 / 2))
+            i = x // node._low
+            j = x % node._low
             # simetrical with respect to insert, we delete first
             if node._u > 2 and i in node.clusters:
                 if r(node.clusters[i], j):
@@ -233,7 +324,7 @@ class VEB:
                     return
                 tmp = node.summary.max
                 if tmp in node.clusters:
-                    node.max = tmp * int(node._u ** (1 / 2)) + node.clusters.get(tmp, Node(2)).max or 0
+                    node.max = tmp * node._low + node.clusters.get(tmp, Node(2)).max or 0
             return False
 
         # base case: we reached a node with a single element
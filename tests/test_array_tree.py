@@ -0,0 +1,117 @@
+import math
+import random
+
+import pytest
+
+from datality.array_tree import ArrayAVL, ArrayBST, ArrayRBTree
+
+
+def check(tree):
+    """returns the values in order, and asserts the links and the invariants of the tree"""
+    res = []
+    left, right, parent, keys = tree.left, tree.right, tree.parent, tree.keys
+
+    def r(node):
+        """returns the height and the black height of the subtree"""
+        if not node:
+            return (0, 1)
+        for child in (left[node], right[node]):
+            assert not child or parent[child] == node
+        left_height, left_black = r(left[node])
+        res.append(keys[node])
+        right_height, right_black = r(right[node])
+        if isinstance(tree, ArrayAVL):
+            assert abs(left_height - right_height) <= 1
+            assert tree.height[node] == max(left_height, right_height) + 1
+        if isinstance(tree, ArrayRBTree):
+            assert left_black == right_black
+            if tree.color[node]:
+                assert not tree.color[left[node]] and not tree.color[right[node]]
+            left_black += not tree.color[node]
+        return (max(left_height, right_height) + 1, left_black)
+
+    height, _ = r(tree.root)
+    assert res == sorted(res)
+    assert len(res) == len(tree)
+    return res, height
+
+
+@pytest.mark.parametrize("tree_class", [ArrayBST, ArrayAVL, ArrayRBTree])
+def test_array_tree_initialize(tree_class):
+    """create a tree from a list of values"""
+    # empty list
+    tree = tree_class()
+    assert not tree
+    assert list(tree) == []
+    # repeated
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16, 7]
+    tree = tree_class(init)
+    assert len(tree) == 20
+    assert list(tree) == list(range(20))
+    assert list(reversed(tree)) == list(range(19, -1, -1))
+    assert list(tree.range(5, 9)) == [5, 6, 7, 8]
+    assert list(tree.range(5, 9, reverse=True)) == [8, 7, 6, 5]
+    check(tree)
+    # list of words
+    tree = tree_class(["erick", "sophia", "marion"])
+    assert list(tree) == ["erick", "marion", "sophia"]
+
+
+@pytest.mark.parametrize("tree_class", [ArrayBST, ArrayAVL, ArrayRBTree])
+def test_array_tree_search_delete(tree_class):
+    """the nodes are slots, the deleted ones are recycled"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    tree = tree_class(init)
+    assert tree.keys[tree.search(3)] == 3
+    with pytest.raises(KeyError):
+        tree.search(20)
+    with pytest.raises(KeyError):
+        tree.delete(20)
+    for e in init[:10]:
+        tree.delete(e)
+    assert list(tree) == sorted(init[10:])
+    check(tree)
+    # the slots of the deleted nodes are reused
+    slots = len(tree.keys)
+    for e in init[:10]:
+        tree.insert(e)
+    assert len(tree.keys) == slots
+    assert list(tree) == list(range(20))
+    check(tree)
+
+
+@pytest.mark.parametrize("tree_class", [ArrayBST, ArrayAVL, ArrayRBTree])
+def test_array_tree_map(tree_class):
+    """the data lives in its own column"""
+    tree = tree_class()
+    for e in range(20):
+        tree[e] = str(e)
+    assert tree[7] == "7"
+    assert 7 in tree and 20 not in tree
+    assert tree.get(20, "default") == "default"
+    assert tree.pop(7) == "7"
+    assert tree.pop(7, None) is None
+    with pytest.raises(KeyError):
+        tree.pop(7)
+    del tree[8]
+    with pytest.raises(KeyError):
+        tree[8]
+    assert len(tree) == 18
+
+
+@pytest.mark.parametrize("tree_class", [ArrayAVL, ArrayRBTree])
+def test_array_tree_churn(tree_class):
+    """the invariants hold through insert/delete churn, and the height stays logarithmic"""
+    rng = random.Random(0)
+    tree, ref = tree_class(), set()
+    for _ in range(3000):
+        e = rng.randrange(200)
+        if rng.random() < 0.5:
+            tree.insert(e)
+            ref.add(e)
+        elif e in ref:
+            tree.delete(e)
+            ref.discard(e)
+        values, height = check(tree)
+        assert values == sorted(ref)
+        assert height <= 2 * math.log2(len(tree) + 1)
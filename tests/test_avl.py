@@ -1,3 +1,6 @@
+import math
+import random
+
 import pytest
 
 from datality.avl import AVL
@@ -98,3 +101,80 @@ def test_avl_successor():
     assert avl.successor(0).value == 1
     assert avl.successor(7).value == 8
     assert avl.successor(17).value == 18
+
+
+def test_avl_node_identity():
+    """the nodes returned by search survive the rebalancing rotations"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    avl = AVL()
+    nodes = {}
+    for e in init:
+        avl.insert(e)
+        nodes[e] = avl.search(e)
+    for e in init:
+        assert avl.search(e) is nodes[e]
+        assert nodes[e].value == e
+    # delete also rotates
+    for e in init[:10]:
+        avl.delete(e)
+    for e in init[10:]:
+        assert avl.search(e) is nodes[e]
+
+
+def test_avl_from_sorted():
+    """bulk-load an avl with the right weights"""
+
+    def check(node):
+        """returns the height, and asserts the weights and the balance"""
+        if not node:
+            return 0
+        left, right = check(node.left), check(node.right)
+        assert abs(left - right) <= 1
+        assert node.weight == max(left, right) + 1
+        return node.weight
+
+    for size in [0, 1, 2, 3, 20, 127, 128, 1000]:
+        avl = AVL.from_sorted(range(size))
+        assert len(avl) == size
+        assert check(avl.root) == size.bit_length()
+    # keeps balanced after insertions
+    avl = AVL.from_sorted(range(0, 100, 2))
+    for e in range(1, 100, 2):
+        avl.insert(e)
+    assert len(avl) == 100
+    check(avl.root)
+
+
+def test_avl_delete_invariants():
+    """the avl invariants and the sizes hold through insert/delete churn"""
+
+    def check(node):
+        """returns the height, and asserts the weights, the balance and the sizes"""
+        if not node:
+            return 0
+        for child in (node.left, node.right):
+            assert not child or child.parent is node
+        assert node.size == avl.compute_size(node.left) + avl.compute_size(node.right) + 1
+        left, right = check(node.left), check(node.right)
+        assert abs(left - right) <= 1
+        assert node.weight == max(left, right) + 1
+        return node.weight
+
+    rng = random.Random(0)
+    avl, ref = AVL(), set()
+    for _ in range(5000):
+        e = rng.randrange(300)
+        if rng.random() < 0.5:
+            avl.insert(e)
+            ref.add(e)
+        elif e in ref:
+            assert avl.delete(e).value == e
+            ref.discard(e)
+        check(avl.root)
+        assert list(avl) == sorted(ref)
+        assert len(avl) == len(ref)
+    # the height stays logarithmic
+    avl = AVL(range(1000))
+    for e in range(0, 1000, 3):
+        avl.delete(e)
+    assert check(avl.root) <= 1.44 * math.log2(len(avl) + 2)
@@ -1,6 +1,10 @@
 import pytest
 
+from datality.avl import AVL
 from datality.bst import BST
+from datality.rb_tree import RBTree
+from datality.splay_tree import SplayTree
+from datality.treap import Treap
 
 
 def test_bst_initialize():
@@ -127,3 +131,204 @@ def test_bst_repr():
 		-->(1)
 			-->(0)"""
     assert repr(bst) == res
+
+
+def test_bst_rotations():
+    """rotations relink the nodes in place, without allocating new ones"""
+    init = [7, 3, 17, 1, 5, 15, 18]
+    bst = BST(init)
+    nodes = {e: bst.search(e) for e in init}
+    # rotate the root right, and back
+    bst.rotate_right(bst.root)
+    assert bst.root is nodes[3]
+    assert bst.root.right is nodes[7]
+    assert nodes[7].parent is nodes[3]
+    assert nodes[7].left is nodes[5]
+    assert nodes[5].parent is nodes[7]
+    bst.rotate_left(bst.root)
+    assert bst.root is nodes[7]
+    assert bst.root.parent is None
+    # inner rotation
+    bst.rotate_left(nodes[17])
+    assert nodes[7].right is nodes[18]
+    assert nodes[18].left is nodes[17]
+    # same nodes, same values
+    for e in init:
+        assert bst.search(e) is nodes[e]
+        assert nodes[e].value == e
+
+
+def test_bst_from_sorted():
+    """bulk-load a balanced bst"""
+    # empty list
+    bst = BST.from_sorted([])
+    assert not bst
+    # sorted input, perfectly balanced
+    bst = BST.from_sorted(range(7))
+    assert len(bst) == 7
+    res = """		-->(6)
+	-->(5)
+		-->(4)
+-->(3)
+		-->(2)
+	-->(1)
+		-->(0)"""
+    assert repr(bst) == res
+    assert bst.search(6).parent.parent is bst.root
+    # unsorted input with repetitions
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16, 7]
+    bst = BST.from_sorted(init)
+    assert len(bst) == 20
+    assert bst.root.value == 10
+    for e in init:
+        assert bst.search(e).value == e
+    # the tree keeps working as usual
+    bst.insert(20)
+    bst.delete(10)
+    assert len(bst) == 20
+
+
+def test_bst_iter():
+    """lazy in-order iteration, both directions"""
+    # empty
+    bst = BST()
+    assert list(bst) == []
+    assert list(reversed(bst)) == []
+    # common
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    bst = BST(init)
+    assert list(bst) == list(range(20))
+    assert list(reversed(bst)) == list(reversed(range(20)))
+    # list of words
+    bst = BST(["erick", "sophia", "marion"])
+    assert list(bst) == ["erick", "marion", "sophia"]
+
+
+def test_bst_range():
+    """lazy scan of the values in [lo, hi)"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    bst = BST(init)
+    assert list(bst.range(5, 10)) == [5, 6, 7, 8, 9]
+    assert list(bst.range(5, 10, reverse=True)) == [9, 8, 7, 6, 5]
+    # bounds not in the tree
+    assert list(bst.range(4.5, 7.5)) == [5, 6, 7]
+    assert list(bst.range(4.5, 7.5, reverse=True)) == [7, 6, 5]
+    # unbounded
+    assert list(bst.range(17)) == [17, 18, 19]
+    assert list(bst.range(hi=3)) == [0, 1, 2]
+    assert list(bst.range(hi=3, reverse=True)) == [2, 1, 0]
+    # empty ranges
+    assert list(bst.range(10, 5)) == []
+    assert list(bst.range(20, 30)) == []
+    assert list(bst.range(-10, 0, reverse=True)) == []
+    # resume a scan, page by page
+    scan = bst.range(3)
+    assert [next(scan) for _ in range(3)] == [3, 4, 5]
+    assert [next(scan) for _ in range(3)] == [6, 7, 8]
+
+
+def test_bst_search_many():
+    """batched lookup, in a single sweep"""
+    # empty
+    bst = BST()
+    assert bst.search_many([1, 2]) == {}
+    assert bst.contains_many([1, 2]) == [False, False]
+    # common
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    bst = BST(init)
+    found = bst.search_many([19, -1, 3, 3.5, 0, 20, 11])
+    assert sorted(found) == [0, 3, 11, 19]
+    for value, node in found.items():
+        assert node is bst.search(value)
+    assert bst.contains_many([19, -1, 3, 3.5, 0, 20, 11, 3]) == [True, False, True, False, True, False, True, True]
+    assert all(bst.contains_many(reversed(init)))
+
+
+@pytest.mark.parametrize("tree_class", [BST, AVL, RBTree, SplayTree, Treap])
+def test_bst_cursor(tree_class):
+    """seek from the last position, and walk in both directions"""
+    # empty tree
+    cursor = tree_class().cursor()
+    assert not cursor
+    assert not cursor.seek(5)
+    assert cursor.next() is None
+    with pytest.raises(IndexError):
+        cursor.value
+    # even values
+    init = [14, 6, 18, 0, 10, 2, 16, 8, 4, 12]
+    tree = tree_class(init)
+    cursor = tree.cursor()
+    assert cursor.value == 0
+    values = [cursor.value]
+    while cursor.next():
+        values.append(cursor.value)
+    assert values == sorted(init)
+    assert not cursor
+    # lower bound of the given value
+    assert tree.cursor(7).value == 8
+    assert tree.cursor(8).value == 8
+    assert not tree.cursor(19)
+    # seek in both directions, hits and misses
+    cursor = tree.cursor(8)
+    assert cursor.seek(12) and cursor.value == 12
+    assert not cursor.seek(3) and cursor.value == 4
+    assert not cursor.seek(-1) and cursor.value == 0
+    assert not cursor.seek(17) and cursor.value == 18
+    assert cursor.seek(0) and cursor.value == 0
+    assert cursor.prev() is None
+    # seek after falling out of the tree
+    assert cursor.seek(10) and cursor.value == 10
+    assert cursor.prev().value == 8
+    # insertions keep the cursor valid
+    for e in range(1, 20, 2):
+        tree.insert(e)
+    assert cursor.value == 8
+    assert cursor.next().value == 9
+    assert cursor.seek(15) and cursor.prev().value == 14
+
+
+@pytest.mark.parametrize("tree_class", [AVL, RBTree])
+def test_bst_cursor_merge(tree_class):
+    """streaming intersection of two trees with a cursor each"""
+    a = tree_class(range(0, 1000, 2))
+    b = tree_class(range(0, 1000, 3))
+    res = []
+    left, right = a.cursor(), b.cursor()
+    while left and right:
+        if left.value == right.value:
+            res.append(left.value)
+            left.next()
+            right.next()
+        elif left.value < right.value:
+            # leap frog, the next value is close
+            left.seek(right.value)
+        else:
+            right.seek(left.value)
+    assert res == list(range(0, 1000, 6))
+
+
+@pytest.mark.parametrize("tree_class", [BST, AVL, RBTree, SplayTree, Treap])
+def test_bst_neighbours(tree_class):
+    """floor, ceiling, lower/upper bounds and predecessor, for values in the tree or not"""
+
+    def value(node):
+        return node.value if node else None
+
+    # empty tree
+    tree = tree_class()
+    for query in (tree.predecessor, tree.floor, tree.ceiling, tree.lower_bound, tree.upper_bound):
+        assert query(3) is None
+    # even values
+    tree = tree_class([14, 6, 18, 0, 10, 2, 16, 8, 4, 12])
+    assert value(tree.predecessor(7)) == 6
+    assert value(tree.predecessor(8)) == 6
+    assert value(tree.predecessor(0)) is None
+    assert value(tree.floor(7)) == 6
+    assert value(tree.floor(8)) == 8
+    assert value(tree.floor(-1)) is None
+    assert value(tree.ceiling(7)) == 8
+    assert value(tree.ceiling(8)) == 8
+    assert value(tree.ceiling(19)) is None
+    assert value(tree.lower_bound(8)) == 8
+    assert value(tree.upper_bound(8)) == 10
+    assert value(tree.upper_bound(18)) is None
@@ -0,0 +1,194 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from datality import RBTree, SkipList, SplayTree
+from datality.concurrent import ConcurrentSkipList, RWLock, Synchronized
+
+
+def test_rw_lock():
+    """readers share the lock, a writer waits for all of them and blocks new readers"""
+    lock = RWLock()
+    lock.acquire_read()
+    # a second reader gets in right away
+    reader = threading.Thread(target=lock.acquire_read)
+    reader.start()
+    reader.join(1)
+    assert not reader.is_alive()
+    # the writer waits for both readers
+    log = []
+    writer = threading.Thread(target=lambda: (lock.acquire_write(), log.append("w"), lock.release_write()))
+    writer.start()
+    writer.join(0.1)
+    assert writer.is_alive() and not log
+    # a new reader waits behind the writer
+    late = threading.Thread(target=lambda: (lock.acquire_read(), log.append("r"), lock.release_read()))
+    late.start()
+    late.join(0.1)
+    assert late.is_alive()
+    lock.release_read()
+    lock.release_read()
+    writer.join(1)
+    late.join(1)
+    assert log == ["w", "r"]
+
+
+@pytest.mark.parametrize("cls", [RBTree, SkipList, SplayTree])
+def test_synchronized(cls):
+    """many threads reading and writing the same structure"""
+    shared = Synchronized(cls())
+    assert ("search" in shared.reads) != (cls is SplayTree)
+
+    def work(seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            key = rng.randrange(300)
+            op = rng.random()
+            if op < 0.3:
+                shared[key] = seed
+            elif op < 0.5:
+                try:
+                    shared.delete(key)
+                except KeyError:
+                    pass
+            else:
+                key in shared
+                values = shared.range(key, key + 10)
+                assert values == sorted(values)
+
+    def run(seed):
+        try:
+            work(seed)
+        except Exception as error:
+            errors.append(error)
+
+    errors = []
+    pool = [threading.Thread(target=run, args=(seed,)) for seed in range(8)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    assert not errors
+    values = list(shared)
+    assert values == sorted(set(values))
+    assert len(shared) == len(values)
+    assert list(reversed(shared)) == values[::-1]
+
+
+def test_synchronized_map():
+    """the map interface goes through the lock, lazy scans come back as lists"""
+    shared = Synchronized(RBTree())
+    for e in range(10):
+        shared[e] = str(e)
+    assert shared[3] == "3" and 3 in shared and 10 not in shared
+    assert shared.get(10, "default") == "default"
+    assert shared.range(2, 5) == [2, 3, 4]
+    del shared[3]
+    with pytest.raises(KeyError):
+        shared[3]
+    assert shared.pop(4) == "4"
+    # the wrappers are cached
+    assert shared.search is shared.search
+    # attributes are not wrapped
+    assert shared.root is shared.structure.root
+
+
+def check_concurrent(skip_list):
+    """every level sorted, no half linked or deleted nodes left behind"""
+    for level in range(skip_list.level):
+        node, previous = skip_list.root.next[level], None
+        while node:
+            assert node.fully_linked and not node.marked
+            assert previous is None or previous < node.value
+            previous, node = node.value, node.next[level]
+
+
+def run(target, args):
+    """run `target` on a thread per args, switching threads as often as possible"""
+    errors, interval = [], sys.getswitchinterval()
+
+    def guarded(*arg):
+        try:
+            target(*arg)
+        except Exception as error:
+            errors.append(error)
+
+    sys.setswitchinterval(1e-6)
+    try:
+        pool = [threading.Thread(target=guarded, args=arg) for arg in args]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert not errors
+
+
+def test_concurrent_skip_list():
+    """the sequential interface, no threads"""
+    skip_list = ConcurrentSkipList([7, 17, 15, 3, 8, 13, 1, 3], seed=0)
+    assert list(skip_list) == [1, 3, 7, 8, 13, 15, 17]
+    assert len(skip_list) == 7
+    assert skip_list.search(7).value == 7 and 7 in skip_list and 9 not in skip_list
+    assert skip_list.insert(7) is skip_list.search(7)
+    assert list(skip_list.range(3, 13)) == [3, 7, 8]
+    assert skip_list.delete(7).value == 7
+    with pytest.raises(KeyError):
+        skip_list.delete(7)
+    with pytest.raises(KeyError):
+        skip_list.search(7)
+    skip_list[20] = "twenty"
+    assert skip_list[20] == "twenty" and skip_list.pop(20) == "twenty"
+    assert f"{skip_list}" == "1 -> 3 -> 8 -> 13 -> 15 -> 17"
+    check_concurrent(skip_list)
+
+
+def test_concurrent_skip_list_stress():
+    """linearizable under contention: racing inserts share a node, racing deletes have one winner,
+    and the readers never miss a value present all along"""
+    evens = list(range(0, 1000, 2))
+    odds = list(range(1, 200, 2))
+    skip_list = ConcurrentSkipList(evens, seed=0)
+
+    def mixed(seed):
+        rng = random.Random(seed)
+        for _ in range(1500):
+            op = rng.random()
+            if op < 0.4:
+                skip_list.insert(rng.choice(odds))
+            elif op < 0.7:
+                try:
+                    skip_list.delete(rng.choice(odds))
+                except KeyError:
+                    pass
+            else:
+                # the evens are never deleted
+                assert rng.choice(evens) in skip_list
+
+    run(mixed, [(seed,) for seed in range(8)])
+    check_concurrent(skip_list)
+    assert len(skip_list) == len(list(skip_list))
+    # racing inserts of the same values: a single node per value
+    nodes = [[] for _ in range(6)]
+    run(lambda i: nodes[i].extend(skip_list.insert(e) for e in odds), [(i,) for i in range(6)])
+    for res in nodes[1:]:
+        assert all(a is b for a, b in zip(nodes[0], res))
+    assert list(skip_list) == sorted(evens + odds)
+    # racing deletes of the same values: a single winner per value
+    winners = []
+
+    def deleter():
+        for e in odds:
+            try:
+                skip_list.delete(e)
+                winners.append(e)
+            except KeyError:
+                pass
+
+    run(deleter, [()] * 6)
+    assert sorted(winners) == odds
+    assert list(skip_list) == evens and len(skip_list) == len(evens)
+    check_concurrent(skip_list)
@@ -1,5 +1,37 @@
+import importlib
+
+import pytest
+
 from datality import __version__
 
 
 def test_version():
     assert __version__ == "0.1.0"
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "avl",
+        "bst",
+        "concurrent",
+        "deque",
+        "double_linked_list",
+        "implicit_treap",
+        "linked_list",
+        "persistent",
+        "radix_trie",
+        "rb_tree",
+        "segment_tree",
+        "skip_list",
+        "splay_tree",
+        "treap",
+        "trie",
+        "van_emde_boas",
+    ],
+)
+def test_compact_nodes(module):
+    """nodes are slotted, no per instance __dict__"""
+    node_class = importlib.import_module(f"datality.{module}").Node
+    node = node_class.__new__(node_class)
+    assert not hasattr(node, "__dict__")
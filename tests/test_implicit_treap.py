@@ -0,0 +1,184 @@
+import math
+import random
+
+import pytest
+
+from datality.implicit_treap import ImplicitTreap
+
+
+def check(treap):
+    """returns the values in order, and asserts the sizes and the heap property"""
+    res = []
+
+    def r(node):
+        """returns the height of the subtree, pushes the pending reversals"""
+        if not node:
+            return 0
+        treap._push(node)
+        for child in (node.left, node.right):
+            assert not child or child.priority <= node.priority
+        left_height = r(node.left)
+        res.append(node.value)
+        right_height = r(node.right)
+        assert node.size == treap.compute_size(node.left) + treap.compute_size(node.right) + 1
+        return max(left_height, right_height) + 1
+
+    height = r(treap.root)
+    assert len(res) == len(treap)
+    return res, height
+
+
+def test_implicit_treap_initialize():
+    """create a list from a list of values, the order is kept"""
+    treap = ImplicitTreap()
+    assert not treap
+    assert list(treap) == []
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 7]
+    treap = ImplicitTreap(init)
+    assert len(treap) == 11
+    assert list(treap) == init
+    assert check(treap)[0] == init
+    # from a generator
+    treap = ImplicitTreap(e for e in "abc")
+    assert list(treap) == ["a", "b", "c"]
+    assert f"{treap}" == "a -> b -> c"
+
+
+def test_implicit_treap_insert():
+    """insert by position, like the linked list"""
+    treap, ref = ImplicitTreap(seed=0), []
+    for i, e in enumerate(range(20)):
+        index = (i * 7) % (i + 1)
+        treap.insert(e, index)
+        ref.insert(index, e)
+    assert list(treap) == ref
+    # negative indexes, and out of range goes to the tail
+    treap.insert("a", -1)
+    ref.insert(-1, "a")
+    treap.insert("b", 100)
+    ref.append("b")
+    treap.insert("c", -100)
+    ref.insert(0, "c")
+    treap.append("d")
+    ref.append("d")
+    assert list(treap) == ref
+    check(treap)
+
+
+def test_implicit_treap_get_set_delete():
+    """indexes behave like the python list"""
+    ref = list(range(20))
+    treap = ImplicitTreap(ref)
+    assert treap[0] == 0 and treap[-1] == 19 and treap[7] == 7
+    with pytest.raises(IndexError):
+        treap[20]
+    with pytest.raises(IndexError):
+        treap[-21]
+    treap[3] = "three"
+    ref[3] = "three"
+    assert treap[3] == "three"
+    assert treap.pop() == ref.pop()
+    assert treap.pop(0) == ref.pop(0)
+    assert treap.pop(-5) == ref.pop(-5)
+    del treap[2]
+    del ref[2]
+    with pytest.raises(IndexError):
+        treap.pop(100)
+    assert list(treap) == ref
+    check(treap)
+
+
+def test_implicit_treap_slices():
+    """slices return new lists, deleting a slice cuts it out"""
+    ref = list(range(20))
+    treap = ImplicitTreap(ref)
+    for s in (slice(5, 9), slice(-3, None), slice(None, 4), slice(8, 2), slice(None, None, 3), slice(None, None, -2)):
+        assert list(treap[s]) == ref[s]
+    assert list(treap.range(5, 9)) == [5, 6, 7, 8]
+    for s in (slice(3, 6), slice(-4, -1), slice(None, None, 4), slice(7, 7)):
+        del treap[s]
+        del ref[s]
+        assert list(treap) == ref
+    check(treap)
+
+
+def test_implicit_treap_split_concat():
+    """split and concat move whole ranges, no copies"""
+    treap = ImplicitTreap(range(10))
+    other = treap.split(4)
+    assert list(treap) == [0, 1, 2, 3]
+    assert list(other) == [4, 5, 6, 7, 8, 9]
+    other.concat(treap)
+    assert list(other) == [4, 5, 6, 7, 8, 9, 0, 1, 2, 3]
+    assert not treap
+    check(other)
+    # extremes
+    assert list(other.split(100)) == []
+    assert len(other.split(0)) == 10
+    assert not other
+
+
+def test_implicit_treap_concat_itself():
+    """concatenating a list with itself doubles it, like the python list"""
+    treap = ImplicitTreap(range(5), seed=0)
+    treap.concat(treap)
+    assert list(treap) == [0, 1, 2, 3, 4] * 2
+    assert len(treap) == 10
+    check(treap)
+
+
+def test_implicit_treap_reverse():
+    """lazy reversals of ranges, nested ones included"""
+    ref = list(range(20))
+    treap = ImplicitTreap(ref)
+    treap.reverse()
+    ref.reverse()
+    assert list(treap) == ref
+    for start, stop in ((2, 10), (5, 15), (0, 1), (-5, None), (3, 8)):
+        treap.reverse(start, stop)
+        ref[start:stop] = ref[start:stop][::-1]
+        assert list(treap) == ref
+    # the flags are pushed by the reads too
+    assert [treap[i] for i in range(20)] == ref
+    check(treap)
+
+
+def test_implicit_treap_random():
+    """random edits against the python list, the height stays logarithmic"""
+    rng = random.Random(0)
+    treap, ref = ImplicitTreap(seed=0), []
+    for i in range(3000):
+        op = rng.random()
+        if op < 0.4 or not ref:
+            index = rng.randrange(len(ref) + 1)
+            treap.insert(i, index)
+            ref.insert(index, i)
+        elif op < 0.6:
+            index = rng.randrange(len(ref))
+            assert treap.pop(index) == ref.pop(index)
+        elif op < 0.8:
+            start = rng.randrange(len(ref))
+            stop = rng.randrange(start, len(ref) + 1)
+            treap.reverse(start, stop)
+            ref[start:stop] = ref[start:stop][::-1]
+        else:
+            index = rng.randrange(len(ref))
+            other = treap.split(index)
+            assert list(other) == ref[index:]
+            other.concat(treap)
+            treap = other
+            ref = ref[index:] + ref[:index]
+    values, height = check(treap)
+    assert values == ref
+    assert height <= 4 * math.log2(len(treap) + 1)
+
+
+@pytest.mark.parametrize("s", [slice(None, None, -2), slice(8, 2, -3), slice(None, None, -1), slice(-2, None, -4)])
+def test_implicit_treap_delete_negative_step(s):
+    """a negative step deletes the same positions as in the python list"""
+    ref = list(range(10))
+    treap = ImplicitTreap(ref, seed=0)
+    del treap[s]
+    del ref[s]
+    assert list(treap) == ref
+    check(treap)
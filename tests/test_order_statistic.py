@@ -0,0 +1,71 @@
+import pytest
+
+from datality.avl import AVL
+from datality.rb_tree import RBTree
+
+
+@pytest.mark.parametrize("tree_class", [AVL, RBTree])
+def test_order_statistic_rank(tree_class):
+    """number of values smaller than the given one"""
+    # empty tree
+    tree = tree_class()
+    assert tree.rank(5) == 0
+    # common list of values
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    tree = tree_class(init)
+    for e in range(20):
+        assert tree.rank(e) == e
+    # values not in the tree
+    assert tree.rank(-1) == 0
+    assert tree.rank(7.5) == 8
+    assert tree.rank(100) == 20
+    # after deletions
+    for e in range(0, 20, 2):
+        tree.delete(e)
+    for e in range(1, 20, 2):
+        assert tree.rank(e) == e // 2
+
+
+@pytest.mark.parametrize("tree_class", [AVL, RBTree])
+def test_order_statistic_select(tree_class):
+    """get the k-th smallest node"""
+    # empty tree
+    tree = tree_class()
+    with pytest.raises(IndexError):
+        tree.select(0)
+    # common list of values
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    tree = tree_class(init)
+    for k in range(20):
+        assert tree.select(k).value == k
+    # negative indexes
+    assert tree.select(-1).value == 19
+    assert tree.select(-20).value == 0
+    # out of range
+    with pytest.raises(IndexError):
+        tree.select(20)
+    with pytest.raises(IndexError):
+        tree.select(-21)
+    # after deletions
+    for e in range(10):
+        tree.delete(e)
+    assert tree.select(0).value == 10
+    # bulk-loaded
+    tree = tree_class.from_sorted(range(100))
+    assert tree.select(42).value == 42
+
+
+@pytest.mark.parametrize("tree_class", [AVL, RBTree])
+def test_order_statistic_count_range(tree_class):
+    """number of values in [lo, hi)"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    tree = tree_class(init)
+    assert tree.count_range(0, 20) == 20
+    assert tree.count_range(5, 10) == 5
+    assert tree.count_range(5.5, 10.5) == 5
+    assert tree.count_range(10, 5) == 0
+    assert tree.count_range(7, 7) == 0
+    assert tree.count_range(-10, 0) == 0
+    # list of words
+    tree = tree_class(["erick", "sophia", "marion"])
+    assert tree.count_range("a", "n") == 2
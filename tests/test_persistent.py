@@ -0,0 +1,88 @@
+import pytest
+
+from datality.persistent import PersistentAVL, PersistentBST, PersistentTreap
+
+
+@pytest.mark.parametrize("tree_class", [PersistentBST, PersistentAVL, PersistentTreap])
+def test_persistent_initialize(tree_class):
+    """create a persistent tree from a list of values"""
+    # empty list
+    tree = tree_class()
+    assert not tree
+    assert list(tree) == []
+    # repeated
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16, 7]
+    tree = tree_class(init)
+    assert len(tree) == 20
+    assert list(tree) == list(range(20))
+    assert list(reversed(tree)) == list(range(19, -1, -1))
+    assert list(tree.range(5, 9)) == [5, 6, 7, 8]
+    assert list(tree.range(5, 9, reverse=True)) == [8, 7, 6, 5]
+    # list of words
+    tree = tree_class(["erick", "sophia", "marion"])
+    assert list(tree) == ["erick", "marion", "sophia"]
+
+
+@pytest.mark.parametrize("tree_class", [PersistentBST, PersistentAVL, PersistentTreap])
+def test_persistent_search_delete(tree_class):
+    """searches and deletes, the map interface included"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    tree = tree_class(init)
+    assert tree.search(3).value == 3
+    with pytest.raises(KeyError):
+        tree.search(20)
+    with pytest.raises(KeyError):
+        tree.delete(20)
+    for e in init[:10]:
+        assert tree.delete(e).value == e
+    assert list(tree) == sorted(init[10:])
+    # map
+    for e in range(20):
+        tree[e] = str(e)
+    assert len(tree) == 20
+    assert tree[7] == "7"
+    assert tree.pop(7) == "7"
+    assert tree.get(7) is None
+
+
+# the plain bst on sorted values is a list, the copied paths are long
+@pytest.mark.parametrize("tree_class", [PersistentAVL, PersistentTreap])
+def test_persistent_snapshot(tree_class):
+    """the snapshots do not see the later updates, and share the unchanged nodes"""
+    tree = tree_class(range(100))
+    for e in range(100):
+        tree[e] = e
+    snapshot = tree.snapshot()
+    # updates on the tree
+    for e in range(0, 100, 2):
+        tree.delete(e)
+    for e in range(100, 150):
+        tree.insert(e)
+    tree[1] = "one"
+    # the snapshot remains the same
+    assert list(snapshot) == list(range(100))
+    assert len(snapshot) == 100
+    assert snapshot[1] == 1
+    assert tree[1] == "one"
+    assert list(tree) == list(range(1, 100, 2)) + list(range(100, 150))
+    # and the other way around
+    snapshot.delete(1)
+    assert tree[1] == "one"
+    # path copying: an update copies only the nodes on one path
+    before = tree.snapshot()
+    tree.insert(1000)
+
+    def nodes(node):
+        return nodes(node.left) | nodes(node.right) | {id(node)} if node else set()
+
+    assert len(nodes(tree.root) - nodes(before.root)) <= 20
+
+
+@pytest.mark.parametrize("tree_class", [PersistentBST, PersistentAVL, PersistentTreap])
+def test_persistent_insert_node(tree_class):
+    """insert returns the node of the new version, even after the rotations copied it"""
+    for init, value in (([3, 1], 2), ([1, 3], 2), ([1, 2], 3), ([3, 2], 1)):
+        tree = tree_class(init)
+        node = tree.insert(value, "data")
+        assert node is tree.search(value)
+        assert node.data == "data"
@@ -1,3 +1,6 @@
+import math
+import random
+
 import pytest
 
 from datality.rb_tree import RBTree
@@ -201,3 +204,101 @@ def test_rb_tree_successor():
     assert rb.successor(0).value == 1
     assert rb.successor(7).value == 8
     assert rb.successor(17).value == 18
+
+
+def test_rb_tree_node_identity():
+    """the nodes returned by search survive the rebalancing rotations"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    rb = RBTree()
+    nodes = {}
+    for e in init:
+        rb.insert(e)
+        nodes[e] = rb.search(e)
+    for e in init:
+        assert rb.search(e) is nodes[e]
+        assert nodes[e].value == e
+    # delete also rotates
+    for e in init[:10]:
+        rb.delete(e)
+    for e in init[10:]:
+        assert rb.search(e) is nodes[e]
+
+
+def test_rb_tree_from_sorted():
+    """bulk-load a rb_tree with a valid coloring"""
+
+    def check(node):
+        """returns the black height, and asserts the red-black invariants"""
+        if not node:
+            return 1
+        if node.color == "r":
+            for child in (node.left, node.right):
+                assert not child or child.color == "b"
+        left, right = check(node.left), check(node.right)
+        assert left == right
+        return left + (node.color == "b")
+
+    for size in [0, 1, 2, 3, 20, 127, 128, 1000]:
+        rb = RBTree.from_sorted(range(size))
+        assert len(rb) == size
+        assert not rb.root or rb.root.color == "b"
+        check(rb.root)
+    # keeps valid after insertions
+    rb = RBTree.from_sorted(range(0, 100, 2))
+    for e in range(1, 100, 2):
+        rb.insert(e)
+    assert len(rb) == 100
+    check(rb.root)
+
+
+def test_rb_tree_delete_invariants():
+    """the red-black invariants and the sizes hold through insert/delete churn"""
+
+    def check(node):
+        """returns the black height, and asserts the red-black invariants and the sizes"""
+        if not node:
+            return 1
+        if node.color == "r":
+            for child in (node.left, node.right):
+                assert not child or child.color == "b"
+        for child in (node.left, node.right):
+            assert not child or child.parent is node
+        assert node.size == rb.compute_size(node.left) + rb.compute_size(node.right) + 1
+        left, right = check(node.left), check(node.right)
+        assert left == right
+        return left + (node.color == "b")
+
+    rng = random.Random(0)
+    rb, ref = RBTree(), set()
+    for _ in range(5000):
+        e = rng.randrange(300)
+        if rng.random() < 0.5:
+            rb.insert(e)
+            ref.add(e)
+        elif e in ref:
+            assert rb.delete(e).value == e
+            ref.discard(e)
+        check(rb.root)
+        assert not rb.root or rb.root.color == "b"
+        assert list(rb) == sorted(ref)
+        assert len(rb) == len(ref)
+    # the height stays logarithmic
+    rb = RBTree(range(1000))
+    for e in range(0, 1000, 3):
+        rb.delete(e)
+
+    def height(node):
+        return 1 + max(height(node.left), height(node.right)) if node else 0
+
+    assert height(rb.root) <= 2 * math.log2(len(rb) + 1)
+
+
+def test_rb_tree_brother():
+    """the missing brothers are null leaves, nothing is allocated"""
+    rb = RBTree([2, 1])
+    one = rb.search(1)
+    assert rb.brother(rb.root, None) is None
+    assert rb.brother(one, rb.root) is None
+    assert rb.is_black(rb.brother(one, rb.root))
+    rb.insert(3)
+    assert rb.brother(one, rb.root).value == 3
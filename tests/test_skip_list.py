@@ -1,6 +1,9 @@
+import bisect
+import random
+
 import pytest
 
-from datality.skip_list import SkipList
+from datality.skip_list import IndexableSkipList, SkipList
 
 
 def test_rb_tree_initialize():
@@ -212,3 +215,309 @@ def test_skip_list_repr():
     skip_list = SkipList(init)
     res = """0: (-inf)->"""
     assert repr(skip_list) == res
+
+
+def test_skip_list_iter():
+    """lazy iteration, both directions"""
+    # empty
+    skip_list = SkipList()
+    assert list(skip_list) == []
+    assert list(reversed(skip_list)) == []
+    # common
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    skip_list = SkipList(init)
+    assert list(skip_list) == list(range(20))
+    assert list(reversed(skip_list)) == list(reversed(range(20)))
+    # list of words
+    skip_list = SkipList(["erick", "sophia", "marion"])
+    assert list(skip_list) == ["erick", "marion", "sophia"]
+    assert list(reversed(skip_list)) == ["sophia", "marion", "erick"]
+
+
+def test_skip_list_range():
+    """lazy scan of the values in [lo, hi)"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    skip_list = SkipList(init)
+    assert list(skip_list.range(5, 10)) == [5, 6, 7, 8, 9]
+    assert list(skip_list.range(5, 10, reverse=True)) == [9, 8, 7, 6, 5]
+    # bounds not in the list
+    assert list(skip_list.range(4.5, 7.5)) == [5, 6, 7]
+    assert list(skip_list.range(4.5, 7.5, reverse=True)) == [7, 6, 5]
+    # unbounded
+    assert list(skip_list.range(17)) == [17, 18, 19]
+    assert list(skip_list.range(hi=3, reverse=True)) == [2, 1, 0]
+    # empty ranges
+    assert list(skip_list.range(10, 5)) == []
+    assert list(skip_list.range(20, 30)) == []
+
+
+def test_skip_list_search_many():
+    """batched lookup, in a single sweep"""
+    # empty
+    skip_list = SkipList()
+    assert skip_list.search_many([1, 2]) == {}
+    assert skip_list.contains_many([1, 2]) == [False, False]
+    # common
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    skip_list = SkipList(init)
+    found = skip_list.search_many([19, -1, 3, 3.5, 0, 20, 11])
+    assert sorted(found) == [0, 3, 11, 19]
+    for value, node in found.items():
+        assert node.value == value
+    assert skip_list.contains_many([19, -1, 3, 3.5, 0, 20, 11, 3]) == [
+        True,
+        False,
+        True,
+        False,
+        True,
+        False,
+        True,
+        True,
+    ]
+    assert all(skip_list.contains_many(reversed(init)))
+    # list of words
+    skip_list = SkipList(["erick", "sophia", "marion"])
+    assert skip_list.contains_many(["sophia", "zeta", "erick"]) == [True, False, True]
+
+
+def test_skip_list_seed():
+    """the same seed builds the same levels"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    for probability in [0.5, 0.25]:
+        a = SkipList(init, probability=probability, seed=42)
+        b = SkipList(init, probability=probability, seed=42)
+        assert repr(a) == repr(b)
+        assert list(a) == sorted(init)
+    # no promotions at all
+    skip_list = SkipList(init, probability=0, seed=42)
+    assert skip_list.level == 1
+    assert list(skip_list) == sorted(init)
+
+
+def test_skip_list_neighbours():
+    """floor, ceiling, lower/upper bounds and predecessor, for values in the list or not"""
+
+    def value(node):
+        return node.value if node else None
+
+    # empty list
+    skip_list = SkipList()
+    for query in (skip_list.predecessor, skip_list.floor, skip_list.ceiling):
+        assert query(3) is None
+    # even values
+    skip_list = SkipList(range(0, 20, 2))
+    assert value(skip_list.predecessor(7)) == 6
+    assert value(skip_list.predecessor(8)) == 6
+    assert value(skip_list.predecessor(0)) is None
+    assert value(skip_list.floor(7)) == 6
+    assert value(skip_list.floor(8)) == 8
+    assert value(skip_list.floor(-1)) is None
+    assert value(skip_list.ceiling(7)) == 8
+    assert value(skip_list.ceiling(8)) == 8
+    assert value(skip_list.ceiling(19)) is None
+    assert value(skip_list.lower_bound(8)) == 8
+    assert value(skip_list.upper_bound(8)) == 10
+    assert value(skip_list.upper_bound(18)) is None
+
+
+def test_skip_list_max_level():
+    """one node per value, never more levels than the cap"""
+    # derived from the expected size, never under the levels of 2^16 values
+    assert SkipList().max_level == 16
+    assert SkipList(probability=0.25).max_level == 8
+    assert SkipList(range(10), max_level=3).max_level == 3
+    # capped
+    skip_list = SkipList(range(1000), max_level=3, seed=0)
+    assert skip_list.level <= 3
+    assert list(skip_list) == list(range(1000))
+    # a single node per value, every level of it linked in order
+    nodes = []
+    node = skip_list.root.next[0]
+    while node:
+        nodes.append(node)
+        assert 1 <= len(node.next) <= 3
+        node = node.next[0]
+    assert len(nodes) == 1000
+    for level in range(skip_list.level):
+        linked, node = [], skip_list.root.next[level]
+        while node:
+            linked.append(node)
+            node = node.next[level]
+        assert linked == [node for node in nodes if len(node.next) > level]
+    # the empty levels go away
+    for e in range(1000):
+        skip_list.delete(e)
+    assert skip_list.level == 1 and not skip_list
+
+
+def check_widths(skip_list):
+    """every link jumps as many positions as its width, the last ones to the end"""
+    position, node = {skip_list.root: 0}, skip_list.root.next[0]
+    while node:
+        position[node] = len(position)
+        node = node.next[0]
+    for level in range(skip_list.level):
+        node = skip_list.root
+        while node:
+            end = position[node.next[level]] if node.next[level] else len(skip_list) + 1
+            assert node.width[level] == end - position[node]
+            node = node.next[level]
+
+
+def test_skip_list_order_statistics():
+    """rank, select and positional deletes against a sorted list"""
+    # empty
+    skip_list = IndexableSkipList()
+    assert skip_list.rank(3) == 0
+    assert list(skip_list.islice()) == []
+    with pytest.raises(IndexError):
+        skip_list.select(0)
+    # common
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    skip_list = IndexableSkipList(init, seed=0)
+    assert [skip_list.select(k).value for k in range(20)] == list(range(20))
+    assert skip_list.select(-1).value == 19
+    assert skip_list.rank(7) == skip_list.index(7) == 7
+    assert skip_list.rank(7.5) == 8
+    assert skip_list.count_range(5, 10) == 5
+    with pytest.raises(KeyError):
+        skip_list.index(7.5)
+    with pytest.raises(KeyError):
+        skip_list.index(20)
+    with pytest.raises(IndexError):
+        skip_list.select(20)
+    assert list(skip_list.islice(5, 9)) == [5, 6, 7, 8]
+    assert list(skip_list.islice(-3)) == [17, 18, 19]
+    assert list(skip_list.islice(9, 5)) == []
+    assert skip_list.delete_at(0).value == 0
+    assert skip_list.delete_at(-1).value == 19
+    assert list(skip_list) == list(range(1, 19))
+    check_widths(skip_list)
+
+
+def test_skip_list_widths():
+    """the widths hold through inserts and deletes, levels coming and going"""
+    rng = random.Random(0)
+    for probability in [0.5, 0.25]:
+        skip_list, ref = IndexableSkipList(probability=probability, seed=0), []
+        for _ in range(2000):
+            e = rng.randrange(300)
+            if rng.random() < 0.55:
+                skip_list.insert(e)
+                if e not in ref:
+                    bisect.insort(ref, e)
+            elif ref and rng.random() < 0.5:
+                k = rng.randrange(len(ref))
+                assert skip_list.delete_at(k).value == ref.pop(k)
+            elif e in ref:
+                skip_list.delete(e)
+                ref.remove(e)
+            if ref:
+                k = rng.randrange(len(ref))
+                assert skip_list.select(k).value == ref[k]
+                assert skip_list.rank(e) == bisect.bisect_left(ref, e)
+        check_widths(skip_list)
+        assert list(skip_list.islice(10, 50)) == ref[10:50]
+
+
+def test_skip_list_contains():
+    """membership without exceptions, misses as cheap as hits"""
+    skip_list = SkipList()
+    assert 3 not in skip_list
+    skip_list = SkipList(range(0, 20, 2))
+    assert all(e in skip_list for e in range(0, 20, 2))
+    assert not any(e in skip_list for e in range(-1, 21, 2))
+    assert 20 not in skip_list and -2 not in skip_list
+    assert skip_list.successor(8).value == 10
+    with pytest.raises(KeyError):
+        skip_list.successor(9)
+    with pytest.raises(KeyError):
+        skip_list.successor(18)
+
+    class Key(int):
+        """counts the comparisons"""
+
+        comparisons = 0
+
+        def __lt__(self, other):
+            Key.comparisons += 1
+            return int(self) < int(other)
+
+        def __eq__(self, other):
+            Key.comparisons += 1
+            return int(self) == int(other)
+
+        __hash__ = int.__hash__
+
+    skip_list = SkipList(range(0, 4096, 2), seed=0)
+    for query in (skip_list.search, skip_list.successor):
+        for e in range(1, 4096, 512):
+            Key.comparisons = 0
+            with pytest.raises(KeyError):
+                query(Key(e))
+            # logarithmic, not a scan of the bottom level
+            assert Key.comparisons < 100
+    for e in range(1, 4096, 512):
+        Key.comparisons = 0
+        assert Key(e) not in skip_list
+        assert Key.comparisons < 100
+
+
+@pytest.mark.parametrize("cls", [SkipList, IndexableSkipList])
+def test_skip_list_update_sorted(cls):
+    """sorted batches merged in a single pass, as if inserted one by one"""
+    rng = random.Random(0)
+    skip_list = cls([rng.randrange(1000) for _ in range(300)], seed=0)
+    ref = set(skip_list)
+    for _ in range(5):
+        batch = sorted(rng.randrange(-100, 1100) for _ in range(rng.randrange(400)))
+        skip_list.update_sorted(batch)
+        ref.update(batch)
+        assert list(skip_list) == sorted(ref)
+        assert len(skip_list) == len(ref)
+        if cls is IndexableSkipList:
+            check_widths(skip_list)
+    # empty batch, and a batch into an empty list
+    skip_list.update_sorted([])
+    empty = cls()
+    empty.update_sorted(["erick", "marion", "marion", "sophia"])
+    assert list(empty) == ["erick", "marion", "sophia"]
+    # not sorted: the values up to the error are in
+    with pytest.raises(ValueError):
+        empty.update_sorted(["adam", "zoe", "bob"])
+    assert list(empty) == ["adam", "erick", "marion", "sophia", "zoe"]
+
+
+def test_skip_list_update_sorted_finger():
+    """consecutive values start from the previous one, not from the top"""
+
+    class Key(int):
+        """counts the comparisons"""
+
+        comparisons = 0
+
+        def __lt__(self, other):
+            Key.comparisons += 1
+            return int(self) < int(other)
+
+        def __gt__(self, other):
+            Key.comparisons += 1
+            return int(self) > int(other)
+
+        def __eq__(self, other):
+            Key.comparisons += 1
+            return int(self) == int(other)
+
+        __hash__ = int.__hash__
+
+    keys = [Key(e) for e in range(0, 8192, 2)]
+    batch = [Key(e) for e in range(1, 8192, 4)]
+    one_by_one, merged = SkipList(keys, seed=0), SkipList(keys, seed=0)
+    Key.comparisons = 0
+    for e in batch:
+        one_by_one.insert(e)
+    single = Key.comparisons
+    Key.comparisons = 0
+    merged.update_sorted(batch)
+    assert list(merged) == list(one_by_one)
+    assert Key.comparisons < single / 2
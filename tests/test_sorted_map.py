@@ -0,0 +1,89 @@
+import pytest
+
+from datality.avl import AVL
+from datality.bst import BST
+from datality.persistent import PersistentAVL, PersistentBST, PersistentTreap
+from datality.rb_tree import RBTree
+from datality.skip_list import IndexableSkipList, SkipList
+from datality.splay_tree import SplayTree
+from datality.treap import Treap
+
+STRUCTURES = [BST, AVL, RBTree, SplayTree, Treap, SkipList, IndexableSkipList]
+
+
+@pytest.mark.parametrize("map_class", STRUCTURES)
+def test_sorted_map_items(map_class):
+    """set, get and overwrite the data of the keys"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    sorted_map = map_class()
+    for e in init:
+        sorted_map[e] = str(e)
+    assert len(sorted_map) == 20
+    assert list(sorted_map) == list(range(20))
+    for e in range(20):
+        assert sorted_map[e] == str(e)
+    # overwrite, the length does not change
+    for e in range(0, 20, 2):
+        sorted_map[e] = -e
+    assert len(sorted_map) == 20
+    for e in range(20):
+        assert sorted_map[e] == (-e if e % 2 == 0 else str(e))
+    # misses
+    with pytest.raises(KeyError):
+        sorted_map[20]
+    assert sorted_map.get(20) is None
+    assert sorted_map.get(20, "default") == "default"
+    assert sorted_map.get(3, "default") == "3"
+    # the data is in the node itself
+    assert sorted_map.search(5).data == "5"
+
+
+@pytest.mark.parametrize("map_class", STRUCTURES)
+def test_sorted_map_pop(map_class):
+    """delete the keys returning their data"""
+    sorted_map = map_class()
+    for e in range(100):
+        sorted_map[e] = e * e
+    for e in range(0, 100, 3):
+        assert sorted_map.pop(e) == e * e
+    assert len(sorted_map) == 66
+    assert list(sorted_map) == [e for e in range(100) if e % 3]
+    # misses
+    with pytest.raises(KeyError):
+        sorted_map.pop(0)
+    assert sorted_map.pop(0, None) is None
+    assert sorted_map.pop(0, "default") == "default"
+    # the remaining keys keep their data
+    for e in range(100):
+        if e % 3:
+            assert sorted_map[e] == e * e
+    del sorted_map[1]
+    assert sorted_map.get(1) is None
+    with pytest.raises(KeyError):
+        del sorted_map[1]
+
+
+@pytest.mark.parametrize("map_class", STRUCTURES)
+def test_sorted_map_insert(map_class):
+    """insert keeps the data of existing keys, plain inserts map to None"""
+    sorted_map = map_class([3, 1, 2])
+    assert sorted_map[1] is None
+    assert sorted_map.insert(4, "four").data == "four"
+    assert sorted_map.insert(4, "other").data == "four"
+    assert sorted_map[4] == "four"
+    assert len(sorted_map) == 4
+
+
+@pytest.mark.parametrize("map_class", STRUCTURES + [PersistentBST, PersistentAVL, PersistentTreap])
+def test_sorted_map_contains(map_class):
+    """membership is a search, not a scan of the whole map"""
+
+    def no_scan(self):
+        raise AssertionError("full scan")
+
+    sorted_map = type(map_class.__name__, (map_class,), {"__iter__": no_scan})()
+    assert 3 not in sorted_map
+    for e in range(0, 20, 2):
+        sorted_map[e] = str(e)
+    assert 4 in sorted_map and 0 in sorted_map and 18 in sorted_map
+    assert 5 not in sorted_map and -1 not in sorted_map and 20 not in sorted_map
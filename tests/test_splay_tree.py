@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from datality.splay_tree import SplayTree
@@ -201,3 +203,150 @@ def test_avl_successor():
     assert splay_tree.successor(0).value == 1
     assert splay_tree.successor(7).value == 8
     assert splay_tree.successor(17).value == 18
+
+
+def test_splay_tree_iter():
+    """iteration does not splay"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    splay_tree = SplayTree(init)
+    root = splay_tree.root
+    assert list(splay_tree) == list(range(20))
+    assert list(reversed(splay_tree)) == list(reversed(range(20)))
+    assert list(splay_tree.range(5, 8)) == [5, 6, 7]
+    assert splay_tree.root is root
+
+
+def test_splay_tree_split_join():
+    """split by a value, and join back"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    splay_tree = SplayTree(init)
+    # split by a value in the tree
+    other = splay_tree.split(10)
+    assert list(splay_tree) == list(range(10))
+    assert list(other) == list(range(10, 20))
+    assert len(splay_tree) == 10
+    assert len(other) == 10
+    # split by a value not in the tree
+    last = other.split(14.5)
+    assert list(other) == list(range(10, 15))
+    assert list(last) == list(range(15, 20))
+    # everything, or nothing
+    assert not splay_tree.split(100)
+    assert len(splay_tree) == 10
+    # join back
+    splay_tree.join(other)
+    splay_tree.join(last)
+    assert list(splay_tree) == list(range(20))
+    assert len(splay_tree) == 20
+    assert not other and not last
+    # join into an empty one
+    empty = SplayTree()
+    empty.join(splay_tree)
+    assert len(empty) == 20
+    # overlapping values
+    with pytest.raises(ValueError):
+        empty.join(SplayTree([5, 50]))
+    assert len(empty) == 20
+
+
+def test_splay_tree_set_operations():
+    """union, intersection and difference, in place"""
+    evens, threes = list(range(0, 30, 2)), list(range(0, 30, 3))
+    # union
+    splay_tree, other = SplayTree(evens), SplayTree(threes)
+    splay_tree.union(other)
+    assert list(splay_tree) == sorted(set(evens) | set(threes))
+    assert len(splay_tree) == len(set(evens) | set(threes))
+    assert not other
+    # intersection
+    splay_tree, other = SplayTree(evens), SplayTree(threes)
+    splay_tree.intersection(other)
+    assert list(splay_tree) == [0, 6, 12, 18, 24]
+    assert len(splay_tree) == 5
+    assert not other
+    # difference
+    splay_tree, other = SplayTree(evens), SplayTree(threes)
+    splay_tree.difference(other)
+    assert list(splay_tree) == [2, 4, 8, 10, 14, 16, 20, 22, 26, 28]
+    assert len(splay_tree) == 10
+    assert not other
+    # with empty trees
+    splay_tree = SplayTree(evens)
+    splay_tree.union(SplayTree())
+    splay_tree.difference(SplayTree())
+    assert list(splay_tree) == evens
+    splay_tree.intersection(SplayTree())
+    assert not splay_tree
+
+
+def test_splay_tree_set_operations_with_itself():
+    """union and intersection with itself change nothing, difference empties it"""
+    for op, expected in (("union", list(range(10))), ("intersection", list(range(10))), ("difference", [])):
+        splay_tree = SplayTree(range(10))
+        getattr(splay_tree, op)(splay_tree)
+        assert list(splay_tree) == expected
+        assert len(splay_tree) == len(expected)
+
+
+@pytest.mark.parametrize("op", ["union", "intersection", "difference"])
+def test_splay_tree_set_operations_random(op):
+    """any sizes on either side, against the python sets, our nodes are kept"""
+    rng = random.Random(0)
+    for _ in range(200):
+        mine = set(rng.sample(range(100), rng.randrange(40)))
+        theirs = set(rng.sample(range(100), rng.randrange(40)))
+        splay_tree, other = SplayTree(), SplayTree()
+        for e in mine:
+            splay_tree[e] = "mine"
+        for e in theirs:
+            other[e] = "theirs"
+        getattr(splay_tree, op)(other)
+        expected = getattr(mine, op)(theirs)
+        assert list(splay_tree) == sorted(expected)
+        assert len(splay_tree) == len(expected) == splay_tree.compute_size(splay_tree.root)
+        assert all(splay_tree[e] == ("mine" if e in mine else "theirs") for e in expected)
+        assert not other
+
+
+def test_splay_tree_splaying():
+    """every operation brings its node to the root"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    splay_tree = SplayTree(init)
+    # insert
+    assert splay_tree.root.value == 16
+    # search
+    node = splay_tree.search(5)
+    assert splay_tree.root is node
+    # a miss splays the last node in the path
+    with pytest.raises(KeyError):
+        splay_tree.search(5.5)
+    assert splay_tree.root.value in (5, 6)
+    # successor
+    assert splay_tree.successor(12).value == 13
+    assert splay_tree.root.value == 13
+    # min and max
+    assert splay_tree.min().value == 0
+    assert splay_tree.root.value == 0
+    assert splay_tree.max().value == 19
+    assert splay_tree.root.value == 19
+    # delete
+    splay_tree.delete(10)
+    assert splay_tree.root.value == 9
+    assert list(splay_tree) == [e for e in range(20) if e != 10]
+    # empty
+    splay_tree = SplayTree()
+    with pytest.raises(IndexError):
+        splay_tree.min()
+    with pytest.raises(IndexError):
+        splay_tree.max()
+
+
+def test_splay_tree_sorted_input():
+    """no recursion, a degenerate tree is not a problem"""
+    splay_tree = SplayTree(range(10000))
+    assert len(splay_tree) == 10000
+    for e in range(10000):
+        assert splay_tree.search(e).value == e
+    for e in range(0, 10000, 2):
+        splay_tree.delete(e)
+    assert list(splay_tree) == list(range(1, 10000, 2))
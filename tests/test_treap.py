@@ -309,3 +309,157 @@ def test_avl_successor():
     assert treap.successor(0).value == 1
     assert treap.successor(7).value == 8
     assert treap.successor(17).value == 18
+
+
+def test_treap_node_identity():
+    """the nodes returned by search survive the rebalancing rotations"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    treap = Treap()
+    nodes = {}
+    for e in init:
+        treap.insert(e)
+        nodes[e] = treap.search(e)
+    for e in init:
+        assert treap.search(e) is nodes[e]
+        assert nodes[e].value == e
+    # delete also rotates
+    for e in init[:10]:
+        treap.delete(e)
+    for e in init[10:]:
+        assert treap.search(e) is nodes[e]
+
+
+def test_treap_from_sorted():
+    """bulk-load a balanced treap, with heap ordered priorities"""
+
+    def check(node):
+        """returns the height, and asserts the heap invariant"""
+        if not node:
+            return 0
+        for child in (node.left, node.right):
+            assert not child or child.priority < node.priority
+        return max(check(node.left), check(node.right)) + 1
+
+    for size in [0, 1, 2, 3, 20, 127, 128, 1000]:
+        treap = Treap.from_sorted(range(size))
+        assert len(treap) == size
+        assert check(treap.root) == size.bit_length()
+    # keeps valid after insertions
+    treap = Treap.from_sorted(range(0, 100, 2))
+    for e in range(1, 100, 2):
+        treap.insert(e)
+    assert len(treap) == 100
+    check(treap.root)
+    # the seed reaches the constructor, same priorities... same shape after the insertions
+    shapes = []
+    for _ in range(2):
+        treap = Treap.from_sorted(range(0, 100, 2), seed=7)
+        for e in range(1, 100, 2):
+            treap.insert(e)
+        shapes.append(repr(treap))
+    assert shapes[0] == shapes[1]
+
+
+def test_treap_split_join():
+    """split by a value, and join back"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    treap = Treap(init)
+    # split by a value in the tree
+    other = treap.split(10)
+    assert list(treap) == list(range(10))
+    assert list(other) == list(range(10, 20))
+    assert len(treap) == 10
+    assert len(other) == 10
+    # split by a value not in the tree
+    last = other.split(14.5)
+    assert list(other) == list(range(10, 15))
+    assert list(last) == list(range(15, 20))
+    # everything, or nothing
+    assert not treap.split(100)
+    assert len(treap) == 10
+    # join back
+    treap.join(other)
+    treap.join(last)
+    assert list(treap) == list(range(20))
+    assert len(treap) == 20
+    assert not other and not last
+    # join into an empty one
+    empty = Treap()
+    empty.join(treap)
+    assert len(empty) == 20
+    # overlapping values
+    with pytest.raises(ValueError):
+        empty.join(Treap([5, 50]))
+    assert len(empty) == 20
+
+
+def test_treap_set_operations():
+    """union, intersection and difference, in place"""
+    evens, threes = list(range(0, 30, 2)), list(range(0, 30, 3))
+    # union
+    treap, other = Treap(evens), Treap(threes)
+    treap.union(other)
+    assert list(treap) == sorted(set(evens) | set(threes))
+    assert len(treap) == len(set(evens) | set(threes))
+    assert not other
+    # intersection
+    treap, other = Treap(evens), Treap(threes)
+    treap.intersection(other)
+    assert list(treap) == [0, 6, 12, 18, 24]
+    assert len(treap) == 5
+    assert not other
+    # difference
+    treap, other = Treap(evens), Treap(threes)
+    treap.difference(other)
+    assert list(treap) == [2, 4, 8, 10, 14, 16, 20, 22, 26, 28]
+    assert len(treap) == 10
+    assert not other
+    # with empty trees
+    treap = Treap(evens)
+    treap.union(Treap())
+    treap.difference(Treap())
+    assert list(treap) == evens
+    treap.intersection(Treap())
+    assert not treap
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_treap_set_operations_keep_our_nodes(seed):
+    """the values in both keep our node and our data, whatever the priorities"""
+    evens, threes = list(range(0, 60, 2)), list(range(0, 60, 3))
+    for op in ("union", "intersection"):
+        treap, other = Treap(seed=seed), Treap(seed=seed + 100)
+        for e in evens:
+            treap[e] = "ours"
+        for e in threes:
+            other[e] = "theirs"
+        nodes = {e: treap.search(e) for e in evens}
+        getattr(treap, op)(other)
+        for e in treap:
+            assert treap[e] == ("ours" if e in nodes else "theirs")
+            if e in nodes:
+                assert treap.search(e) is nodes[e]
+
+
+def test_treap_set_operations_with_itself():
+    """union and intersection with itself change nothing, difference empties it"""
+    for op, expected in (("union", list(range(10))), ("intersection", list(range(10))), ("difference", [])):
+        treap = Treap(range(10), seed=0)
+        getattr(treap, op)(treap)
+        assert list(treap) == expected
+        assert len(treap) == len(expected)
+
+
+def test_treap_seed():
+    """the same seed builds the same treap"""
+    init = [7, 17, 15, 3, 8, 13, 1, 18, 19, 0, 12, 5, 10, 9, 4, 14, 11, 2, 6, 16]
+    a, b = Treap(init, seed=42), Treap(init, seed=42)
+    assert repr(a) == repr(b)
+    assert [a.search(e).priority for e in init] == [b.search(e).priority for e in init]
+    # the halves of a split keep drawing from the same sequence
+    c, d = a.split(10), b.split(10)
+    c.insert(100)
+    d.insert(100)
+    assert c.search(100).priority == d.search(100).priority
+    # different seeds, different priorities
+    assert Treap(init, seed=1).root.priority != Treap(init, seed=2).root.priority
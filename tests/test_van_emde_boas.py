@@ -246,6 +246,33 @@ def test_van_emde_boas_successor():
     assert veb.successor(7) == 8
     assert veb.successor(17) == 18
 
+def test_van_emde_boas_neighbours():
+    """floor, ceiling, lower/upper bounds and predecessor, for keys in the tree or not"""
+    # empty tree
+    veb = VEB([])
+    for query in (veb.predecessor, veb.floor, veb.ceiling, veb.lower_bound, veb.upper_bound):
+        assert query(3) is None
+    # odd powers of 2 as universe
+    for u in [8, 32, 128, 512]:
+        keys = list(range(1, u, 3))
+        veb = VEB(keys, u=u)
+        for e in range(-1, u + 1):
+            assert veb.predecessor(e) == max((k for k in keys if k < e), default=None)
+            assert veb.floor(e) == max((k for k in keys if k <= e), default=None)
+            assert veb.ceiling(e) == min((k for k in keys if k >= e), default=None)
+            assert veb.lower_bound(e) == veb.ceiling(e)
+            assert veb.upper_bound(e) == min((k for k in keys if k > e), default=None)
+    # after deletions
+    veb = VEB([3, 7, 11, 15], u=16)
+    veb.delete(7)
+    assert veb.predecessor(11) == 3
+    assert veb.floor(10) == 3
+    assert veb.ceiling(4) == 11
+    veb.delete(3)
+    assert veb.predecessor(11) is None
+    assert veb.floor(15) == 15
+
+
 def test_van_emde_boas_repr():
     """get repr"""
     # empty list